@@ -8,17 +8,21 @@ import boto3
 from functools import lru_cache
 from typing import Dict, Any
 
+from botocore.exceptions import ClientError
+
+from src.utils.secrets import secret_cache
+
 # AWS clients
 secrets_client = boto3.client("secretsmanager", region_name="us-east-1")
 appconfig_client = boto3.client("appconfig", region_name="us-east-1")
 appconfigdata_client = boto3.client("appconfigdata", region_name="us-east-1")
 
 
-@lru_cache(maxsize=1)
 def get_secret(secret_id: str) -> Dict[str, Any]:
     """
     Retrieve a secret from AWS Secrets Manager.
-    Results are cached to avoid repeated API calls.
+    Results are served from the process-wide secret cache, which refetches a
+    secret only after its TTL expires and its version has rotated.
     
     Args:
         secret_id: The name or ARN of the secret
@@ -27,7 +31,7 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
         Secret value as dict or string
     """
     try:
-        response = secrets_client.get_secret_value(SecretId=secret_id)
+        response = secret_cache.get_secret_value(secret_id, region_name="us-east-1", client=secrets_client)
         
         if "SecretString" in response:
             secret = response["SecretString"]
@@ -38,8 +42,10 @@ def get_secret(secret_id: str) -> Dict[str, Any]:
                 return {"value": secret}
         else:
             return {"value": response["SecretBinary"]}
-    except secrets_client.exceptions.ResourceNotFoundException:
-        raise ValueError(f"Secret '{secret_id}' not found in AWS Secrets Manager")
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise ValueError(f"Secret '{secret_id}' not found in AWS Secrets Manager")
+        raise RuntimeError(f"Failed to retrieve secret '{secret_id}': {str(e)}")
     except Exception as e:
         raise RuntimeError(f"Failed to retrieve secret '{secret_id}': {str(e)}")
 
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Measure orchestrator cold start in fresh interpreters and guard the startup budget
+
+Usage:
+    python scripts/benchmark_import_time.py --runs 10 --budget-ms 250
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src
+from src.agent.orchestrator import AgentOrchestrator
+imported = time.perf_counter()
+AgentOrchestrator()
+built = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (built - start) * 1000,
+    "boto3_loaded": "boto3" in sys.modules,
+}))
+"""
+
+
+def probe(workdir: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=workdir, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if the median startup exceeds this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [probe(workdir) for _ in range(args.runs)]
+    import_ms = statistics.median(result["import_ms"] for result in results)
+    startup_ms = statistics.median(result["startup_ms"] for result in results)
+    boto3_loaded = any(result["boto3_loaded"] for result in results)
+    print(f"median import: {import_ms:.1f} ms  median startup: {startup_ms:.1f} ms  boto3 loaded: {boto3_loaded}")
+
+    if boto3_loaded:
+        sys.exit("local providers imported boto3")
+    if args.budget_ms is not None and startup_ms > args.budget_ms:
+        sys.exit(f"startup {startup_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
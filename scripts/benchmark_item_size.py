@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Compare DynamoDB encounter item size and capacity units of the legacy and compact layouts
+
+Usage:
+    python scripts/benchmark_item_size.py --chunks 30
+"""
+
+import argparse
+import math
+import sys
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.agent.orchestrator import AgentOrchestrator  # noqa: E402
+from src.core.audit import InMemoryAuditLogger  # noqa: E402
+from src.core.clinical import EncounterContext, PatientProfile  # noqa: E402
+from src.core.serialization import EncounterDocument  # noqa: E402
+
+CHUNKS = [
+    "Patient reports fever since Tuesday, worse at night, with chills and sweating.",
+    "History of asthma since childhood, uses an inhaler two or three times a week.",
+    "Dry cough for five days, no blood, occasionally keeps the patient awake.",
+    "Mild headache in the mornings that improves after breakfast and fluids.",
+    "History of seasonal allergies, currently not taking antihistamines.",
+    "Some fatigue and reduced appetite, no nausea or vomiting reported.",
+]
+
+
+def legacy_item(encounter: EncounterContext) -> Dict[str, Any]:
+    """The item ``store_encounter`` wrote before the compact encoding (resolved text, Decimal numbers)."""
+    return _decimals(
+        {
+            "patient_id": encounter.patient_profile.patient_id,
+            "encounter_id": encounter.encounter_id,
+            "created_at": encounter.created_at,
+            "clinician_id": encounter.clinician_id,
+            "soap_note": encounter.soap_note.to_dict() if encounter.soap_note else {},
+            "recommendations": [rec.to_dict() for rec in encounter.recommendations],
+            "observations": [obs.to_dict() for obs in encounter.resolved_observations()],
+        }
+    )
+
+
+def compact_item(encounter: EncounterContext) -> Dict[str, Any]:
+    document = EncounterDocument(encounter)
+    return {
+        "patient_id": encounter.patient_profile.patient_id,
+        "encounter_id": encounter.encounter_id,
+        "created_at": encounter.created_at,
+        "clinician_id": encounter.clinician_id,
+        "encoding_version": 1,
+        "soap_note": document.compressed_part("soap_note"),
+        "recommendations": document.compressed_part("recommendations"),
+        "observations": document.compressed_part("observations"),
+    }
+
+
+def item_size(item: Dict[str, Any]) -> int:
+    """Item size in bytes under DynamoDB's sizing rules: attribute names plus values."""
+    return sum(len(name.encode("utf-8")) + value_size(value) for name, value in item.items())
+
+
+def value_size(value: Any) -> int:
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (int, Decimal)):
+        digits = Decimal(value).normalize().as_tuple().digits
+        return math.ceil(len(digits) / 2) + 1
+    if isinstance(value, dict):
+        return 3 + sum(1 + len(key.encode("utf-8")) + value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return 3 + sum(1 + value_size(item) for item in value)
+    raise TypeError(f"Unsupported attribute value {type(value).__name__}")
+
+
+def _decimals(value: Any) -> Any:
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {key: _decimals(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decimals(item) for item in value]
+    return value
+
+
+def build_encounter(chunks: int) -> EncounterContext:
+    orchestrator = AgentOrchestrator(audit_logger=InMemoryAuditLogger())
+    profile = PatientProfile(
+        patient_id="patient-bench",
+        name="Benchmark Patient",
+        medications=["albuterol", "cetirizine"],
+        allergies=["penicillin"],
+    )
+    encounter = orchestrator.start_encounter(profile, "clin-bench", consent_granted=True)
+    for index in range(chunks):
+        orchestrator.ingest_transcript_chunk(encounter, CHUNKS[index % len(CHUNKS)])
+    orchestrator.finalize_encounter(encounter)
+    return encounter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=30)
+    args = parser.parse_args()
+
+    encounter = build_encounter(args.chunks)
+    print(f"{args.chunks} transcript chunks, {len(encounter.observations)} observations")
+    print(f"{'layout':<10}{'item bytes':>12}{'WCU':>6}{'RCU':>6}{'items/1MB query page':>22}")
+    for name, item in (("legacy", legacy_item(encounter)), ("compact", compact_item(encounter))):
+        size = item_size(item)
+        # Strongly consistent reads; eventually consistent reads cost half
+        print(f"{name:<10}{size:>12}{math.ceil(size / 1024):>6}{math.ceil(size / 4096):>6}{2 ** 20 // size:>22}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compare per-object memory of the regular and compact record representations
+
+Usage:
+    python scripts/benchmark_record_memory.py --count 100000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.core.audit import AuditEvent, CompactAuditEvent  # noqa: E402
+from src.core.clinical import ClinicalObservation, CompactObservation  # noqa: E402
+from src.core.consent import CompactConsentRecord, ConsentRecord, ConsentType  # noqa: E402
+from src.core.state import AgentAction, CompactAction  # noqa: E402
+
+
+def _timestamp(index: int) -> str:
+    return (datetime(2024, 1, 1) + timedelta(microseconds=index * 1234567)).isoformat()
+
+
+def _observation(index: int) -> ClinicalObservation:
+    # Text decoded per record, as it is when parsed from a transcript or JSON payload
+    return ClinicalObservation(
+        category="symptom".encode().decode(),
+        value=f"symptom-{index % 50}",
+        source="nlp".encode().decode(),
+        timestamp=_timestamp(index),
+    )
+
+
+def _audit_event(index: int) -> AuditEvent:
+    return AuditEvent(
+        actor_id=f"clinician-{index % 20}",
+        action="encounter_finalized".encode().decode(),
+        resource_id=f"enc-{index}",
+        timestamp=_timestamp(index),
+    )
+
+
+def _consent(index: int) -> ConsentRecord:
+    return ConsentRecord(
+        patient_id=f"patient-{index}",
+        encounter_id=f"enc-{index}",
+        consent_type=ConsentType.AI_ASSIST,
+        granted=True,
+        actor=f"clinician-{index % 20}",
+        timestamp=_timestamp(index),
+    )
+
+
+def _action(index: int) -> AgentAction:
+    action = AgentAction(
+        action_type="clinical_support".encode().decode(),
+        description="Generate clinical note and recommendations".encode().decode(),
+        parameters={"encounter_id": f"enc-{index}"},
+        status="completed".encode().decode(),
+        created_at=_timestamp(index),
+    )
+    action.completed_at = _timestamp(index + 1)
+    return action
+
+
+def measure(build: Callable[[int], object], count: int) -> float:
+    """Bytes allocated per object while holding ``count`` of them."""
+    gc.collect()
+    tracemalloc.start()
+    held: List[object] = [build(index) for index in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("ClinicalObservation", _observation, CompactObservation),
+        ("AuditEvent", _audit_event, CompactAuditEvent),
+        ("ConsentRecord", _consent, CompactConsentRecord),
+        ("AgentAction", _action, CompactAction),
+    ]
+    print(f"{'record':<22}{'regular B/obj':>15}{'compact B/obj':>15}{'saved':>8}")
+    for name, build, compact in cases:
+        regular = measure(build, args.count)
+        compacted = measure(lambda index: compact.from_record(build(index)), args.count)
+        print(f"{name:<22}{regular:>15.0f}{compacted:>15.0f}{1 - compacted / regular:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
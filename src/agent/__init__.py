@@ -1,5 +1,24 @@
 """Agent orchestrator and autonomous operations"""
 
+import importlib
+
+from src.agent.container import ServiceContainer
 from src.agent.orchestrator import AgentOrchestrator
 
-__all__ = ["AgentOrchestrator"]
+# Serving entry points pull in asyncio/multiprocessing; import them on first access
+_LAZY_EXPORTS = {
+    "EncounterWorkerPool": "src.agent.worker_pool",
+    "OrchestratorService": "src.agent.http_service",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ["AgentOrchestrator", "EncounterWorkerPool", "OrchestratorService", "ServiceContainer"]
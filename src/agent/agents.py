@@ -76,3 +76,14 @@ class DocumentationAgent(BaseClinicalAgent):
             "soap_note_ready": encounter.soap_note is not None,
             "note_sections": encounter.soap_note.to_dict() if encounter.soap_note else {},
         }
+
+
+def build_agents(nlp_service: ClinicalNLPService, guideline_service: GuidelineService) -> Dict[str, BaseClinicalAgent]:
+    """The orchestrator's sub-agents, in workflow order."""
+    return {
+        "triage": TriageAgent(nlp_service),
+        "diagnosis": DiagnosisAgent(guideline_service),
+        "monitoring": MonitoringAgent(guideline_service),
+        "follow_up": FollowUpAgent(guideline_service),
+        "documentation": DocumentationAgent(nlp_service),
+    }
@@ -0,0 +1,219 @@
+"""Shared service container for running many orchestrators in one process."""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from src.core.audit import AuditLogger
+from src.core.feature_flags import FeatureFlags
+from src.core.privacy import PrivacyPolicy
+from src.clients.clinical_services import ClinicalNLPService, GuidelineService
+from src.clients.record_store import ClinicalRecordStore
+from src.clients.view_cache import PatientViewCache
+from src.clients.encounter_wal import EncounterWAL
+from src.clients.providers import load_provider, selected_provider
+from src.agent.agents import BaseClinicalAgent, build_agents
+
+if TYPE_CHECKING:
+    from src.agent.orchestrator import AgentOrchestrator
+    from src.clients.aws_transcribe import AWSTranscribeService
+
+
+class ServiceContainer:
+    """Components shared by every orchestrator built on this container.
+
+    The stateless parts - NLP and guideline services, sub-agents, privacy policy,
+    audio transcriber and feature flags - are built from the ``AI_MED_AGENT_*``
+    settings on first use and then reused by every tenant.
+
+    Patient data is never shared: ``create_orchestrator`` gives each tenant its own
+    record store, patient view cache and audit logger, kept per ``tenant_id`` so
+    later orchestrators for the same tenant reuse them. Backends that persist are
+    suffixed with the tenant id (SQLite file, DynamoDB tables, audit log file), the
+    same way as the encounter WAL. The unkeyed ``record_store``, ``view_cache`` and
+    ``audit_logger`` serve an orchestrator that builds its own container.
+    """
+
+    TENANT_COMPONENTS = ("record_store", "view_cache", "audit_logger")
+
+    def __init__(self, privacy_policy: Optional[PrivacyPolicy] = None) -> None:
+        self._lock = threading.RLock()
+        self._components: Dict[str, Any] = {}
+        self._tenants: Dict[str, Dict[str, Any]] = {}
+        if privacy_policy is not None:
+            self._components["privacy_policy"] = privacy_policy
+
+    def create_orchestrator(self, tenant_id: str, **overrides: Any) -> "AgentOrchestrator":
+        """Build the orchestrator for ``tenant_id``; keyword arguments replace its components."""
+        from src.agent.orchestrator import AgentOrchestrator
+
+        for name in self.TENANT_COMPONENTS:
+            if overrides.get(name) is None:
+                overrides[name] = self.tenant_component(tenant_id, name)
+        wal_path = os.getenv("AI_MED_AGENT_ENCOUNTER_WAL")
+        if wal_path and "encounter_wal" not in overrides:
+            sync = os.getenv("AI_MED_AGENT_ENCOUNTER_WAL_SYNC", "false").lower() == "true"
+            overrides["encounter_wal"] = EncounterWAL(f"{wal_path}.{tenant_id}", sync=sync)
+        return AgentOrchestrator(agent_id=tenant_id, services=self, **overrides)
+
+    def tenant_component(self, tenant_id: str, name: str) -> Any:
+        """Return ``tenant_id``'s own record store, view cache or audit logger."""
+        if name not in self.TENANT_COMPONENTS:
+            raise ValueError(f"{name} is shared by every tenant")
+        build = getattr(self, f"_build_{name}")
+        with self._lock:
+            components = self._tenants.setdefault(tenant_id, {})
+            if name not in components:
+                components[name] = build(tenant_id)
+            return components[name]
+
+    @property
+    def privacy_policy(self) -> PrivacyPolicy:
+        return self._get("privacy_policy", PrivacyPolicy)
+
+    @property
+    def audit_logger(self) -> AuditLogger:
+        return self._get("audit_logger", self._build_audit_logger)
+
+    @property
+    def record_store(self) -> ClinicalRecordStore:
+        return self._get("record_store", self._build_record_store)
+
+    @property
+    def view_cache(self) -> PatientViewCache:
+        return self._get("view_cache", self._build_view_cache)
+
+    @property
+    def nlp_service(self) -> ClinicalNLPService:
+        return self._get("nlp_service", self._build_nlp_service)
+
+    @property
+    def guideline_service(self) -> GuidelineService:
+        return self._get("guideline_service", self._build_guideline_service)
+
+    @property
+    def agents(self) -> Dict[str, BaseClinicalAgent]:
+        return self._get("agents", lambda: build_agents(self.nlp_service, self.guideline_service))
+
+    @property
+    def audio_transcriber(self) -> Optional["AWSTranscribeService"]:
+        return self._get("audio_transcriber", self._build_audio_transcriber)
+
+    @property
+    def feature_flags(self) -> FeatureFlags:
+        return self._get("feature_flags", self._build_feature_flags)
+
+    def _get(self, name: str, build: Callable[[], Any]) -> Any:
+        try:
+            return self._components[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._components:
+                self._components[name] = build()
+            return self._components[name]
+
+    def _build_nlp_service(self) -> ClinicalNLPService:
+        provider = selected_provider("AI_MED_AGENT_NLP_PROVIDER", "local")
+        service_class = load_provider("AI_MED_AGENT_NLP_PROVIDER", provider)
+        if provider == "bedrock":
+            model_id = os.getenv("AI_MED_AGENT_BEDROCK_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
+            region = os.getenv("AWS_REGION", "us-east-1")
+            return service_class(model_id=model_id, region=region)
+        return service_class()
+
+    def _build_guideline_service(self) -> GuidelineService:
+        provider = selected_provider("AI_MED_AGENT_GUIDELINE_PROVIDER", "local")
+        service_class = load_provider("AI_MED_AGENT_GUIDELINE_PROVIDER", provider)
+        if provider == "bedrock":
+            model_id = os.getenv("AI_MED_AGENT_BEDROCK_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
+            region = os.getenv("AWS_REGION", "us-east-1")
+            return service_class(model_id=model_id, region=region)
+        return service_class()
+
+    def _build_record_store(self, tenant_id: Optional[str] = None) -> ClinicalRecordStore:
+        store = selected_provider("AI_MED_AGENT_RECORD_STORE", "local")
+        store_class = load_provider("AI_MED_AGENT_RECORD_STORE", store)
+        if store == "dynamodb":
+            table_name = _tenant_table(
+                os.getenv("AI_MED_AGENT_DDB_ENCOUNTERS_TABLE", "ai-med-agent-encounters"), tenant_id
+            )
+            region = os.getenv("AWS_REGION", "us-east-1")
+            return store_class(
+                table_name=table_name,
+                region=region,
+                privacy_policy=self.privacy_policy,
+            )
+        if store == "sqlite":
+            db_path = _tenant_path(
+                os.getenv("AI_MED_AGENT_SQLITE_PATH", "data/ai-med-agent.db"), tenant_id
+            )
+            return store_class(db_path=db_path, privacy_policy=self.privacy_policy)
+        return store_class(self.privacy_policy)
+
+    def _build_view_cache(self, tenant_id: Optional[str] = None) -> PatientViewCache:
+        view_cache = PatientViewCache(
+            ttl_seconds=float(os.getenv("AI_MED_AGENT_VIEW_CACHE_TTL", "30")),
+            negative_ttl_seconds=float(os.getenv("AI_MED_AGENT_VIEW_CACHE_NEGATIVE_TTL", "5")),
+            max_entries=int(os.getenv("AI_MED_AGENT_VIEW_CACHE_SIZE", "1024")),
+        )
+        view_cache.watch(self.privacy_policy)
+        return view_cache
+
+    def _build_audit_logger(self, tenant_id: Optional[str] = None) -> AuditLogger:
+        backend = selected_provider("AI_MED_AGENT_AUDIT_LOGGER", "file")
+        logger_class = load_provider("AI_MED_AGENT_AUDIT_LOGGER", backend)
+        if backend == "dynamodb":
+            table_name = _tenant_table(
+                os.getenv("AI_MED_AGENT_DDB_AUDIT_TABLE", "ai-med-agent-audit"), tenant_id
+            )
+            region = os.getenv("AWS_REGION", "us-east-1")
+            batch_writes = os.getenv("AI_MED_AGENT_AUDIT_BATCH_WRITES", "false").lower() == "true"
+            return logger_class(
+                table_name=table_name,
+                region=region,
+                batch_writes=batch_writes,
+            )
+        if backend == "file" and tenant_id is not None:
+            return logger_class(log_file=_tenant_path("logs/audit.log", tenant_id))
+        return logger_class()
+
+    def _build_audio_transcriber(self) -> Optional["AWSTranscribeService"]:
+        provider = selected_provider("AI_MED_AGENT_TRANSCRIBE_PROVIDER", "local")
+        if provider == "aws":
+            region = os.getenv("AWS_REGION", "us-east-1")
+            output_bucket = os.getenv("AI_MED_AGENT_TRANSCRIBE_OUTPUT_BUCKET")
+            language_code = os.getenv("AI_MED_AGENT_TRANSCRIBE_LANGUAGE", "en-US")
+            return load_provider("AI_MED_AGENT_TRANSCRIBE_PROVIDER", provider)(
+                region=region,
+                output_bucket=output_bucket,
+                language_code=language_code,
+            )
+        return None
+
+    def _build_feature_flags(self) -> FeatureFlags:
+        appconfig_profile = os.getenv("AI_MED_AGENT_FEATURE_FLAGS_APPCONFIG")
+        if not appconfig_profile:
+            return FeatureFlags.from_file(
+                os.getenv("AI_MED_AGENT_FEATURE_FLAGS", "configs/ai-med-agent/feature-flags.json")
+            )
+        # "application/environment/profile", kept current by the AppConfig poller
+        from src.clients.config_manager import ConfigManager
+
+        application_id, environment, profile = appconfig_profile.split("/")
+        config_manager = ConfigManager(region=os.getenv("AWS_REGION", "us-east-1"))
+        feature_flags = FeatureFlags(config_manager.get_appconfig_configuration(application_id, environment, profile))
+        config_manager.subscribe(application_id, environment, profile, feature_flags.load)
+        return feature_flags
+
+
+def _tenant_path(path: str, tenant_id: Optional[str]) -> str:
+    """``data/store.db`` becomes ``data/store.<tenant_id>.db``."""
+    if tenant_id is None:
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}.{tenant_id}{extension}"
+
+
+def _tenant_table(table_name: str, tenant_id: Optional[str]) -> str:
+    return table_name if tenant_id is None else f"{table_name}-{tenant_id}"
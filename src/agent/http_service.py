@@ -0,0 +1,375 @@
+"""ASGI HTTP service for the orchestrator with admission control.
+
+Run with ``python -m src.agent.http_service`` (requires the optional ``uvicorn``
+dependency) or mount ``create_app()`` in any ASGI server.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.core.clinical import EncounterContext, PatientProfile
+from src.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[..., Tuple[int, Any]]
+Authorizer = Callable[[Dict[str, Any]], bool]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, retry_after: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+
+
+class OrchestratorService:
+    """Expose an ``AgentOrchestrator`` over HTTP as an ASGI application.
+
+    Orchestrator calls run on ``workers`` threads. Admission control sheds load
+    instead of queueing without bound: when ``max_concurrent_encounters`` encounters
+    are open, starting another returns 429, and when ``workers`` calls are running and
+    ``max_queue`` more are waiting, further requests return 503. Both carry a
+    ``Retry-After`` header. Both checks run before the request body is read, and
+    bodies over ``max_body_bytes`` are refused with 413.
+
+    Every route except ``/health`` passes the ASGI scope to ``authorize`` and
+    returns 401 unless it answers true. Without an ``authorize`` callable every
+    such request is denied; ``bearer_token_authorizer`` checks a shared token.
+
+    Encounters hold their admission slot until they are finalized or deleted.
+    Encounters not touched for ``idle_timeout_seconds`` are abandoned when a new one
+    is admitted, so clients that disappear do not hold slots forever. Encounters the
+    orchestrator recovered from its write-ahead log are open on startup.
+
+    Routes:
+        POST /encounters                                  start (201)
+        DELETE /encounters/{id}                           abandon without finalizing
+        POST /encounters/{id}/chunks                      ingest a transcript chunk (202)
+        POST /encounters/{id}/finalize                    finalize
+        POST /encounters/{id}/emergency/recommendation    recommend an emergency action
+        POST /encounters/{id}/emergency/call              trigger an emergency call
+        GET  /patients/{id}/view                          privacy-filtered patient view
+        GET  /health                                      load and admission counters
+    """
+
+    def __init__(
+        self,
+        orchestrator: Any,
+        max_concurrent_encounters: int = 100,
+        workers: int = 8,
+        max_queue: int = 64,
+        retry_after_seconds: int = 1,
+        idle_timeout_seconds: Optional[float] = 900.0,
+        authorize: Optional[Authorizer] = None,
+        max_body_bytes: int = 1024 * 1024,
+    ) -> None:
+        self.orchestrator = orchestrator
+        self.authorize = authorize
+        self.max_body_bytes = max_body_bytes
+        self.max_concurrent_encounters = max_concurrent_encounters
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="orchestrator-http")
+        self._lock = threading.Lock()
+        self._encounters: Dict[str, EncounterContext] = {}
+        # encounter_id -> monotonic time of last use, least recently used first
+        self._last_seen: "OrderedDict[str, float]" = OrderedDict()
+        self._reserved = 0
+        self._admitted = 0
+        self._stats = {"requests": 0, "rejected_encounters": 0, "rejected_overload": 0, "expired_encounters": 0}
+        for encounter in getattr(orchestrator, "recovered_encounters", []):
+            self._encounters[encounter.encounter_id] = encounter
+            self._last_seen[encounter.encounter_id] = time.monotonic()
+        self._routes: List[Tuple[str, "re.Pattern[str]", Handler]] = [
+            ("POST", re.compile(r"^/encounters$"), self._start),
+            ("DELETE", re.compile(r"^/encounters/(?P<encounter_id>[^/]+)$"), self._abandon),
+            ("POST", re.compile(r"^/encounters/(?P<encounter_id>[^/]+)/chunks$"), self._ingest),
+            ("POST", re.compile(r"^/encounters/(?P<encounter_id>[^/]+)/finalize$"), self._finalize),
+            (
+                "POST",
+                re.compile(r"^/encounters/(?P<encounter_id>[^/]+)/emergency/recommendation$"),
+                self._recommend_emergency,
+            ),
+            ("POST", re.compile(r"^/encounters/(?P<encounter_id>[^/]+)/emergency/call$"), self._emergency_call),
+            ("GET", re.compile(r"^/patients/(?P<patient_id>[^/]+)/view$"), self._patient_view),
+        ]
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Awaitable[dict]], send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            if scope["method"] == "GET" and scope["path"] == "/health":
+                status, payload = 200, self.health()
+            else:
+                handler, params = self._route(scope["method"], scope["path"])
+                if self.authorize is None or not self.authorize(scope):
+                    raise HTTPError(401, "Unauthorized")
+                status, payload = await self._run(handler, params, receive)
+        except HTTPError as exc:
+            headers = [(b"retry-after", str(exc.retry_after).encode())] if exc.retry_after is not None else []
+            await _respond(send, exc.status, dumps({"error": exc.message}), headers)
+            return
+        await _respond(send, status, payload if isinstance(payload, bytes) else dumps(payload))
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_encounters": len(self._encounters) + self._reserved,
+                "max_concurrent_encounters": self.max_concurrent_encounters,
+                "admitted_calls": self._admitted,
+                "max_calls": self.workers + self.max_queue,
+                **self._stats,
+            }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _run(
+        self, handler: Handler, params: Dict[str, str], receive: Callable[[], Awaitable[dict]]
+    ) -> Tuple[int, Any]:
+        with self._lock:
+            self._stats["requests"] += 1
+            if self._admitted >= self.workers + self.max_queue:
+                self._stats["rejected_overload"] += 1
+                raise HTTPError(503, "Service overloaded", retry_after=self.retry_after_seconds)
+            self._admitted += 1
+        reserved = False
+        try:
+            loop = asyncio.get_running_loop()
+            if handler == self._start:
+                await loop.run_in_executor(self._executor, self._reserve_encounter)
+                reserved = True
+            payload = _parse_body(await _read_body(receive, self.max_body_bytes))
+            return await loop.run_in_executor(self._executor, lambda: handler(payload, **params))
+        finally:
+            with self._lock:
+                self._admitted -= 1
+                if reserved:
+                    self._reserved -= 1
+
+    async def _lifespan(self, receive: Callable[[], Awaitable[dict]], send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _route(self, method: str, path: str) -> Tuple[Handler, Dict[str, str]]:
+        allowed = False
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict()
+                allowed = True
+        raise HTTPError(405 if allowed else 404, "Method not allowed" if allowed else "Not found")
+
+    def _encounter(self, encounter_id: str) -> EncounterContext:
+        with self._lock:
+            encounter = self._encounters.get(encounter_id)
+            if encounter is not None:
+                self._last_seen[encounter_id] = time.monotonic()
+                self._last_seen.move_to_end(encounter_id)
+        if encounter is None:
+            raise HTTPError(404, f"Unknown encounter {encounter_id}")
+        return encounter
+
+    def _remove(self, encounter_id: str) -> Optional[EncounterContext]:
+        with self._lock:
+            self._last_seen.pop(encounter_id, None)
+            return self._encounters.pop(encounter_id, None)
+
+    def _expire_idle(self) -> None:
+        if self.idle_timeout_seconds is None:
+            return
+        cutoff = time.monotonic() - self.idle_timeout_seconds
+        expired = []
+        with self._lock:
+            while self._last_seen:
+                encounter_id, last_seen = next(iter(self._last_seen.items()))
+                if last_seen > cutoff:
+                    break
+                del self._last_seen[encounter_id]
+                expired.append(self._encounters.pop(encounter_id))
+            self._stats["expired_encounters"] += len(expired)
+        for encounter in expired:
+            logger.info("Abandoning encounter %s after %ss idle", encounter.encounter_id, self.idle_timeout_seconds)
+            self.orchestrator.abandon_encounter(encounter, reason="idle_timeout")
+
+    def _reserve_encounter(self) -> None:
+        """Hold an encounter slot for a start request; ``_run`` releases it."""
+        self._expire_idle()
+        with self._lock:
+            if len(self._encounters) + self._reserved >= self.max_concurrent_encounters:
+                self._stats["rejected_encounters"] += 1
+                raise HTTPError(429, "Too many concurrent encounters", retry_after=self.retry_after_seconds)
+            self._reserved += 1
+
+    def _start(self, payload: Dict[str, Any]) -> Tuple[int, Any]:
+        try:
+            profile = PatientProfile(**payload["patient_profile"])
+            clinician_id = payload["clinician_id"]
+            consent_granted = bool(payload["consent_granted"])
+        except (KeyError, TypeError) as exc:
+            raise HTTPError(400, f"Invalid encounter request: {exc}")
+        try:
+            encounter = self.orchestrator.start_encounter(profile, clinician_id, consent_granted)
+        except PermissionError as exc:
+            raise HTTPError(403, str(exc))
+        with self._lock:
+            self._encounters[encounter.encounter_id] = encounter
+            self._last_seen[encounter.encounter_id] = time.monotonic()
+        return 201, {"encounter_id": encounter.encounter_id}
+
+    def _abandon(self, payload: Dict[str, Any], encounter_id: str) -> Tuple[int, Any]:
+        encounter = self._remove(encounter_id)
+        if encounter is None:
+            raise HTTPError(404, f"Unknown encounter {encounter_id}")
+        self.orchestrator.abandon_encounter(encounter, reason=str(payload.get("reason", "abandoned")))
+        return 200, {"encounter_id": encounter_id, "status": "abandoned"}
+
+    def _ingest(self, payload: Dict[str, Any], encounter_id: str) -> Tuple[int, Any]:
+        if not isinstance(payload.get("text"), str):
+            raise HTTPError(400, "Chunk requests need a 'text' string")
+        self.orchestrator.ingest_transcript_chunk(self._encounter(encounter_id), payload["text"])
+        return 202, {"encounter_id": encounter_id}
+
+    def _finalize(self, payload: Dict[str, Any], encounter_id: str) -> Tuple[int, Any]:
+        encounter = self._encounter(encounter_id)
+        body = self.orchestrator.finalize_encounter_bytes(encounter)
+        self._remove(encounter_id)
+        return 200, body
+
+    def _recommend_emergency(self, payload: Dict[str, Any], encounter_id: str) -> Tuple[int, Any]:
+        recommendation = self.orchestrator.recommend_emergency_action(
+            self._encounter(encounter_id),
+            severity=payload.get("severity", "high"),
+            reason=payload.get("reason", ""),
+            confidence=float(payload.get("confidence", 0.6)),
+        )
+        return 200, recommendation
+
+    def _emergency_call(self, payload: Dict[str, Any], encounter_id: str) -> Tuple[int, Any]:
+        try:
+            event = self.orchestrator.trigger_emergency_call(
+                encounter=self._encounter(encounter_id),
+                initiated_by=payload["initiated_by"],
+                reason=payload["reason"],
+                confirmed=bool(payload.get("confirmed", False)),
+            )
+        except KeyError as exc:
+            raise HTTPError(400, f"Missing field {exc}")
+        except PermissionError as exc:
+            raise HTTPError(403, str(exc))
+        return 200, event
+
+    def _patient_view(self, payload: Dict[str, Any], patient_id: str) -> Tuple[int, Any]:
+        return 200, self.orchestrator.get_patient_view(patient_id)
+
+
+def bearer_token_authorizer(token: str) -> Authorizer:
+    """Accept requests whose ``Authorization`` header is ``Bearer <token>``."""
+    expected = f"Bearer {token}".encode()
+
+    def authorize(scope: Dict[str, Any]) -> bool:
+        for name, value in scope.get("headers", []):
+            if name.lower() == b"authorization":
+                return hmac.compare_digest(value, expected)
+        return False
+
+    return authorize
+
+
+async def _read_body(receive: Callable[[], Awaitable[dict]], max_bytes: int) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPError(413, f"Request body exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _parse_body(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        raise HTTPError(400, "Request body must be JSON")
+    if not isinstance(payload, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return payload
+
+
+async def _respond(send: Callable, status: int, body: bytes, headers: Optional[List[Tuple[bytes, bytes]]] = None) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *(headers or [])],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(orchestrator: Optional[Any] = None) -> OrchestratorService:
+    """Build the service from ``AI_MED_AGENT_HTTP_*`` environment settings.
+
+    Requests must carry ``AI_MED_AGENT_HTTP_API_TOKEN`` as a bearer token; when it
+    is unset every route except ``/health`` is denied.
+    """
+    if orchestrator is None:
+        from src.agent.orchestrator import AgentOrchestrator
+
+        orchestrator = AgentOrchestrator()
+    token = os.getenv("AI_MED_AGENT_HTTP_API_TOKEN")
+    if not token:
+        logger.warning("AI_MED_AGENT_HTTP_API_TOKEN is not set; all API requests will be denied")
+    return OrchestratorService(
+        orchestrator,
+        max_concurrent_encounters=int(os.getenv("AI_MED_AGENT_HTTP_MAX_ENCOUNTERS", "100")),
+        workers=int(os.getenv("AI_MED_AGENT_HTTP_WORKERS", "8")),
+        max_queue=int(os.getenv("AI_MED_AGENT_HTTP_MAX_QUEUE", "64")),
+        retry_after_seconds=int(os.getenv("AI_MED_AGENT_HTTP_RETRY_AFTER", "1")),
+        idle_timeout_seconds=float(os.getenv("AI_MED_AGENT_HTTP_IDLE_TIMEOUT", "900")) or None,
+        authorize=bearer_token_authorizer(token) if token else None,
+        max_body_bytes=int(os.getenv("AI_MED_AGENT_HTTP_MAX_BODY_BYTES", str(1024 * 1024))),
+    )
+
+
+def main() -> None:
+    try:
+        import uvicorn
+    except ImportError as exc:
+        raise SystemExit("uvicorn is required to serve the API: pip install 'ai-med-agent[server]'") from exc
+    uvicorn.run(
+        create_app(),
+        host=os.getenv("AI_MED_AGENT_HTTP_HOST", "127.0.0.1"),
+        port=int(os.getenv("AI_MED_AGENT_HTTP_PORT", "8080")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,24 @@
 
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, TextIO, Tuple
 from uuid import uuid4
 
 from src.core.state import StateManager, AgentStatus, DecisionOutcome, AgentAction
-from src.core.clinical import EncounterContext, PatientProfile
+from src.core.clinical import ClinicalObservation, EncounterContext, PatientProfile
 from src.core.consent import ConsentManager, ConsentType
 from src.core.audit import AuditLogger, AuditEvent
 from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel
+from src.core.serialization import EncounterDocument
 from src.core.emergency import EmergencyManager, EmergencyEvent, EmergencyRecommendation
+from src.core.feature_flags import FeatureFlags
 from src.clients.clinical_services import RealTimeTranscriber, ClinicalNLPService, GuidelineService
 from src.clients.record_store import ClinicalRecordStore
-from src.clients.aws_bedrock import BedrockClinicalNLPService, BedrockGuidelineService
-from src.clients.aws_transcribe import AWSTranscribeService
-from src.clients.dynamodb_store import DynamoDBClinicalRecordStore, DynamoDBAuditLogger
-from src.agent.agents import (
-    TriageAgent,
-    DiagnosisAgent,
-    MonitoringAgent,
-    FollowUpAgent,
-    DocumentationAgent,
-)
+from src.clients.view_cache import PatientViewCache
+from src.clients.encounter_wal import EncounterWAL
+from src.clients.providers import load_provider, selected_provider
+from src.agent.agents import build_agents
+from src.agent.container import ServiceContainer
 
 logger = logging.getLogger(__name__)
 
@@ -40,74 +37,63 @@ class AgentOrchestrator:
         transcriber: Optional[RealTimeTranscriber] = None,
         nlp_service: Optional[ClinicalNLPService] = None,
         guideline_service: Optional[GuidelineService] = None,
+        view_cache: Optional[PatientViewCache] = None,
+        encounter_wal: Optional[EncounterWAL] = None,
         require_approval: bool = True,
+        services: Optional[ServiceContainer] = None,
+        feature_flags: Optional[FeatureFlags] = None,
     ):
         self.agent_id = agent_id
-        self.state = StateManager(agent_id)
+        self.services = services or ServiceContainer(privacy_policy=privacy_policy)
+        self.state = StateManager(
+            agent_id,
+            max_history=int(os.getenv("AI_MED_AGENT_STATE_HISTORY_SIZE", "1000")),
+            spill_dir=os.getenv("AI_MED_AGENT_STATE_SPILL_DIR") or None,
+        )
         self.require_approval = require_approval
-        self.consent_manager = consent_manager or ConsentManager()
-        self.audit_logger = audit_logger or self._build_audit_logger()
-        self.privacy_policy = privacy_policy or PrivacyPolicy()
-        self.record_store = record_store or self._build_record_store()
+        self.consent_manager = consent_manager or self._build_consent_manager()
+        self.audit_logger = audit_logger or self.services.audit_logger
+        self.privacy_policy = privacy_policy or self.services.privacy_policy
+        self.record_store = record_store or self.services.record_store
+        self.view_cache = view_cache or self.services.view_cache
+        self.view_cache.watch(self.privacy_policy)
         self.transcriber = transcriber or RealTimeTranscriber()
-        self.audio_transcriber = self._build_audio_transcriber()
-        self.nlp_service = nlp_service or self._build_nlp_service()
-        self.guideline_service = guideline_service or self._build_guideline_service()
+        self.audio_transcriber = self.services.audio_transcriber
+        self.nlp_service = nlp_service or self.services.nlp_service
+        self.guideline_service = guideline_service or self.services.guideline_service
         self.emergency_manager = EmergencyManager(self.audit_logger)
-
-        self.agents = {
-            "triage": TriageAgent(self.nlp_service),
-            "diagnosis": DiagnosisAgent(self.guideline_service),
-            "monitoring": MonitoringAgent(self.guideline_service),
-            "follow_up": FollowUpAgent(self.guideline_service),
-            "documentation": DocumentationAgent(self.nlp_service),
-        }
+        self.encounter_wal = encounter_wal or self._build_encounter_wal()
+        self.feature_flags = feature_flags or self.services.feature_flags
+
+        if nlp_service is None and guideline_service is None:
+            self.agents = self.services.agents
+        else:
+            self.agents = build_agents(self.nlp_service, self.guideline_service)
+        self.recovered_encounters = self.resume_encounters()
         logger.info("AgentOrchestrator initialized: %s", agent_id)
 
-    def _build_nlp_service(self) -> ClinicalNLPService:
-        provider = os.getenv("AI_MED_AGENT_NLP_PROVIDER", "local").lower()
-        if provider == "bedrock":
-            model_id = os.getenv("AI_MED_AGENT_BEDROCK_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
-            region = os.getenv("AWS_REGION", "us-east-1")
-            return BedrockClinicalNLPService(model_id=model_id, region=region)
-        return ClinicalNLPService()
-
-    def _build_guideline_service(self) -> GuidelineService:
-        provider = os.getenv("AI_MED_AGENT_GUIDELINE_PROVIDER", "local").lower()
-        if provider == "bedrock":
-            model_id = os.getenv("AI_MED_AGENT_BEDROCK_MODEL", "anthropic.claude-3-sonnet-20240229-v1:0")
-            region = os.getenv("AWS_REGION", "us-east-1")
-            return BedrockGuidelineService(model_id=model_id, region=region)
-        return GuidelineService()
-
-    def _build_record_store(self) -> ClinicalRecordStore:
-        store = os.getenv("AI_MED_AGENT_RECORD_STORE", "local").lower()
+    def _build_consent_manager(self) -> ConsentManager:
+        store = selected_provider("AI_MED_AGENT_CONSENT_STORE", "memory")
+        store_class = load_provider("AI_MED_AGENT_CONSENT_STORE", store)
         if store == "dynamodb":
-            table_name = os.getenv("AI_MED_AGENT_DDB_ENCOUNTERS_TABLE", "ai-med-agent-encounters")
+            table_name = os.getenv("AI_MED_AGENT_DDB_CONSENT_TABLE", "ai-med-agent-consents")
             region = os.getenv("AWS_REGION", "us-east-1")
-            return DynamoDBClinicalRecordStore(table_name=table_name, region=region)
-        return ClinicalRecordStore(self.privacy_policy)
-
-    def _build_audit_logger(self) -> AuditLogger:
-        backend = os.getenv("AI_MED_AGENT_AUDIT_LOGGER", "file").lower()
-        if backend == "dynamodb":
-            table_name = os.getenv("AI_MED_AGENT_DDB_AUDIT_TABLE", "ai-med-agent-audit")
-            region = os.getenv("AWS_REGION", "us-east-1")
-            return DynamoDBAuditLogger(table_name=table_name, region=region)
-        return AuditLogger()
-
-    def _build_audio_transcriber(self) -> Optional[AWSTranscribeService]:
-        provider = os.getenv("AI_MED_AGENT_TRANSCRIBE_PROVIDER", "local").lower()
-        if provider == "aws":
-            region = os.getenv("AWS_REGION", "us-east-1")
-            output_bucket = os.getenv("AI_MED_AGENT_TRANSCRIBE_OUTPUT_BUCKET")
-            language_code = os.getenv("AI_MED_AGENT_TRANSCRIBE_LANGUAGE", "en-US")
-            return AWSTranscribeService(
-                region=region,
-                output_bucket=output_bucket,
-                language_code=language_code,
-            )
-        return None
+            index_ttl = float(os.getenv("AI_MED_AGENT_CONSENT_INDEX_TTL", "5"))
+            return ConsentManager(store_class(table_name=table_name, region=region, index_ttl=index_ttl))
+        if store == "file":
+            return ConsentManager(store_class(os.getenv("AI_MED_AGENT_CONSENT_FILE", "data/consents.jsonl")))
+        return ConsentManager(store_class())
+
+    def _flag_enabled(self, name: str, encounter: EncounterContext) -> bool:
+        """Evaluate a feature flag for this tenant, bucketing rollouts by encounter."""
+        return self.feature_flags.is_enabled(name, tenant_id=self.agent_id, key=encounter.encounter_id)
+
+    def _build_encounter_wal(self) -> Optional[EncounterWAL]:
+        path = os.getenv("AI_MED_AGENT_ENCOUNTER_WAL")
+        if not path:
+            return None
+        sync = os.getenv("AI_MED_AGENT_ENCOUNTER_WAL_SYNC", "false").lower() == "true"
+        return EncounterWAL(path, sync=sync)
 
     # =========================================================================
     # Consent, Transcription, and Encounter Lifecycle
@@ -118,40 +104,29 @@ class AgentOrchestrator:
         patient_profile: PatientProfile,
         clinician_id: str,
         consent_granted: bool,
+        encounter_id: Optional[str] = None,
     ) -> EncounterContext:
         """Start an encounter with explicit consent checks and audit logging."""
-        encounter_id = str(uuid4())
-        self.state.set_status(AgentStatus.RUNNING)
+        encounter_id = encounter_id or str(uuid4())
+        encounter_state = self.state.partition(encounter_id)
+        encounter_state.set_status(AgentStatus.RUNNING)
 
-        self.consent_manager.record_consent(
-            patient_id=patient_profile.patient_id,
-            encounter_id=encounter_id,
-            consent_type=ConsentType.AUDIO_RECORDING,
-            granted=consent_granted,
-            actor=clinician_id,
-        )
-        self.consent_manager.record_consent(
-            patient_id=patient_profile.patient_id,
-            encounter_id=encounter_id,
-            consent_type=ConsentType.TRANSCRIPTION,
-            granted=consent_granted,
-            actor=clinician_id,
-        )
-        self.consent_manager.record_consent(
+        self.consent_manager.record_consents(
             patient_id=patient_profile.patient_id,
             encounter_id=encounter_id,
-            consent_type=ConsentType.AI_ASSIST,
+            consent_types=[ConsentType.AUDIO_RECORDING, ConsentType.TRANSCRIPTION, ConsentType.AI_ASSIST],
             granted=consent_granted,
             actor=clinician_id,
         )
 
         if not consent_granted:
-            self.state.log_decision(
+            encounter_state.log_decision(
                 "consent_check",
                 DecisionOutcome.ABORT,
                 "Consent not granted; aborting encounter",
                 {"patient_id": patient_profile.patient_id}
             )
+            self.state.release(encounter_id)
             raise PermissionError("Consent required for transcription and AI assistance.")
 
         self.audit_logger.log_event(
@@ -164,11 +139,28 @@ class AgentOrchestrator:
         )
 
         self.transcriber.start_session(encounter_id)
-        return EncounterContext(
+        encounter = EncounterContext(
             encounter_id=encounter_id,
             patient_profile=patient_profile,
             clinician_id=clinician_id,
         )
+        if self.encounter_wal:
+            self.encounter_wal.open(encounter)
+        return encounter
+
+    def resume_encounters(self) -> List[EncounterContext]:
+        """Restore encounters left open in the write-ahead log by a previous process."""
+        if not self.encounter_wal:
+            return []
+        encounters = self.encounter_wal.recover()
+        for encounter in encounters:
+            self.transcriber.start_session(encounter.encounter_id)
+            for chunk in encounter.transcript:
+                self.transcriber.ingest_text_chunk(encounter.encounter_id, chunk)
+            self.state.partition(encounter.encounter_id).set_status(AgentStatus.RUNNING)
+        if encounters:
+            logger.info("Resumed %d open encounters from the write-ahead log", len(encounters))
+        return encounters
 
     def ingest_transcript_chunk(self, encounter: EncounterContext, chunk: str) -> None:
         """Ingest real-time transcript and extract clinical details."""
@@ -178,8 +170,15 @@ class AgentOrchestrator:
         self.transcriber.ingest_text_chunk(encounter.encounter_id, chunk)
         encounter.transcript.append(chunk)
 
-        extracted = self.nlp_service.extract_key_details(chunk)
-        encounter.observations.extend(extracted)
+        chunk_index = len(encounter.transcript) - 1
+        extracted: Optional[List[ClinicalObservation]] = None
+        if self._flag_enabled("realtime_transcription", encounter):
+            extracted = self.nlp_service.extract_key_details(chunk, chunk_index=chunk_index)
+            encounter.observations.extend(extracted)
+        else:
+            encounter.deferred_chunks.append(chunk_index)
+        if self.encounter_wal:
+            self.encounter_wal.append_chunk(encounter.encounter_id, chunk, extracted)
 
         self.audit_logger.log_event(
             AuditEvent(
@@ -210,26 +209,59 @@ class AgentOrchestrator:
 
     def finalize_encounter(self, encounter: EncounterContext) -> Dict[str, Any]:
         """Finalize encounter: generate SOAP note, recommendations, and audit logs."""
-        self.state.set_status(AgentStatus.EVALUATING)
+        return self._finalize(encounter)[0]
+
+    def finalize_encounter_bytes(self, encounter: EncounterContext) -> bytes:
+        """Finalize an encounter and return the response as JSON bytes, reusing the
+        encoding already produced for the record store."""
+        result, document = self._finalize(encounter)
+        return document.encode_response(result)
+
+    def abandon_encounter(self, encounter: EncounterContext, reason: str = "abandoned") -> None:
+        """Discard an open encounter without finalizing it; it is not resumed after a restart."""
+        self.state.release(encounter.encounter_id)
+        self.transcriber.end_session(encounter.encounter_id)
+        if self.encounter_wal:
+            self.encounter_wal.close(encounter.encounter_id)
+        self.audit_logger.log_event(
+            AuditEvent(
+                actor_id=self.agent_id,
+                action="encounter_abandoned",
+                resource_id=encounter.encounter_id,
+                metadata={"patient_id": encounter.patient_profile.patient_id, "reason": reason},
+            )
+        )
+
+    def _finalize(self, encounter: EncounterContext) -> Tuple[Dict[str, Any], EncounterDocument]:
+        encounter_state = self.state.partition(encounter.encounter_id)
+        encounter_state.set_status(AgentStatus.EVALUATING)
         transcript = self.transcriber.get_transcript(encounter.encounter_id)
+        for chunk_index in encounter.deferred_chunks:
+            encounter.observations.extend(
+                self.nlp_service.extract_key_details(encounter.transcript[chunk_index], chunk_index=chunk_index)
+            )
+        encounter.deferred_chunks.clear()
+        observations = encounter.resolved_observations()
 
         soap_note = self.nlp_service.build_soap_note(
             transcript=transcript,
-            observations=encounter.observations,
+            observations=observations,
             patient_profile=encounter.patient_profile,
         )
         encounter.soap_note = soap_note
 
-        recommendations = self.guideline_service.generate_recommendations(
-            soap_note=soap_note,
-            observations=encounter.observations,
-            patient_profile=encounter.patient_profile,
-        )
+        recommendations = []
+        if self._flag_enabled("autonomous_clinical_support", encounter):
+            recommendations = self.guideline_service.generate_recommendations(
+                soap_note=soap_note,
+                observations=observations,
+                patient_profile=encounter.patient_profile,
+            )
         encounter.recommendations = recommendations
 
         agent_tasks = self._run_multi_agent_workflow(encounter)
 
-        self.state.log_decision(
+        encounter_state.log_decision(
             "clinical_support",
             DecisionOutcome.REQUIRE_APPROVAL if self.require_approval else DecisionOutcome.PROCEED,
             "Clinical recommendations generated and require clinician approval.",
@@ -245,38 +277,52 @@ class AgentOrchestrator:
             parameters={"encounter_id": encounter.encounter_id},
             requires_approval=self.require_approval,
         )
-        self.state.queue_action(action)
-        self.state.complete_action(result={"recommendations": len(recommendations)})
-        self.state.set_status(AgentStatus.COMPLETED)
+        encounter_state.queue_action(action)
+        encounter_state.complete_action(result={"recommendations": len(recommendations)})
+        encounter_state.set_status(AgentStatus.COMPLETED)
+        self.state.release(encounter.encounter_id)
 
-        self.record_store.store_encounter(encounter)
+        document = EncounterDocument(encounter)
+        self.record_store.store_encounter(encounter, document=document)
+        if self.encounter_wal:
+            self.encounter_wal.close(encounter.encounter_id)
+        self.view_cache.invalidate(encounter.patient_profile.patient_id)
 
         self.audit_logger.log_event(
             AuditEvent(
                 actor_id=self.agent_id,
                 action="encounter_finalized",
                 resource_id=encounter.encounter_id,
-                metadata={"patient_id": encounter.patient_profile.patient_id},
+                metadata={
+                    "patient_id": encounter.patient_profile.patient_id,
+                    "payload_sha256": document.digest,
+                },
             )
         )
 
-        return {
+        result = {
             "status": "pending_approval" if self.require_approval else "completed",
             "encounter_id": encounter.encounter_id,
-            "soap_note": soap_note.to_dict(),
-            "recommendations": [rec.to_dict() for rec in recommendations],
+            "soap_note": document.fields["soap_note"],
+            "recommendations": document.fields["recommendations"],
             "agent_tasks": agent_tasks,
             "state": self.state.get_state_summary(),
         }
+        return result, document
 
     # =========================================================================
     # Multi-Agent Orchestration
     # =========================================================================
 
     def _run_multi_agent_workflow(self, encounter: EncounterContext) -> Dict[str, Any]:
+        """Run each sub-agent whose ``<name>_agent`` flag is on; all are skipped when
+        ``multi_agent_orchestration`` is off."""
         results = {}
+        if not self._flag_enabled("multi_agent_orchestration", encounter):
+            return results
         for name, agent in self.agents.items():
-            results[name] = agent.run(encounter)
+            if self._flag_enabled(f"{name}_agent", encounter):
+                results[name] = agent.run(encounter)
         return results
 
     # =========================================================================
@@ -284,13 +330,22 @@ class AgentOrchestrator:
     # =========================================================================
 
     def get_patient_view(self, patient_id: str) -> Dict[str, Any]:
-        """Return read-only patient view with privacy enforcement."""
-        return self.record_store.get_patient_view(
-            patient_id=patient_id,
-            role=AccessRole.PATIENT,
-            access_level=AccessLevel.READ,
+        """Return read-only patient view with privacy enforcement (served via the view cache)."""
+        return self.view_cache.get_or_load(
+            patient_id,
+            AccessRole.PATIENT,
+            AccessLevel.READ,
+            lambda: self.record_store.get_patient_view(
+                patient_id=patient_id,
+                role=AccessRole.PATIENT,
+                access_level=AccessLevel.READ,
+            ),
         )
 
+    def get_view_cache_metrics(self) -> Dict[str, Any]:
+        """Hit ratio, invalidation and staleness metrics for the patient view cache."""
+        return self.view_cache.metrics()
+
     # =========================================================================
     # Emergency Escalation
     # =========================================================================
@@ -301,8 +356,11 @@ class AgentOrchestrator:
         severity: str,
         reason: str,
         confidence: float = 0.6,
-    ) -> EmergencyRecommendation:
-        """Provide an emergency recommendation without auto-calling."""
+    ) -> Optional[EmergencyRecommendation]:
+        """Provide an emergency recommendation without auto-calling; returns None while
+        the ``emergency_risk_detection`` flag is off."""
+        if not self._flag_enabled("emergency_risk_detection", encounter):
+            return None
         recommendation = EmergencyRecommendation(
             severity=severity,
             reason=reason,
@@ -317,6 +375,7 @@ class AgentOrchestrator:
                 "reason": reason,
                 "confidence": confidence,
             },
+            encounter_id=encounter.encounter_id,
         )
         return recommendation
 
@@ -343,6 +402,7 @@ class AgentOrchestrator:
 
         if hasattr(self.record_store, "record_emergency_event"):
             self.record_store.record_emergency_event(event)
+            self.view_cache.invalidate(event.patient_id)
 
         self.emergency_manager.log_emergency_event(event)
         self.audit_logger.log_event(
@@ -366,3 +426,7 @@ class AgentOrchestrator:
     def export_operation_history(self) -> Dict[str, Any]:
         """Export complete operation history."""
         return self.state.export_history()
+
+    def stream_operation_history(self, stream: TextIO, **filters: Any) -> int:
+        """Write operation history to ``stream`` as NDJSON; see ``StateManager.iter_history``."""
+        return self.state.write_history(stream, **filters)
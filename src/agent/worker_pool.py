@@ -0,0 +1,350 @@
+"""Multi-process encounter worker pool sharded by encounter id."""
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import zlib
+from concurrent.futures import Future
+from itertools import count
+from multiprocessing import connection
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from src.core.clinical import EncounterContext, PatientProfile
+
+logger = logging.getLogger(__name__)
+
+OrchestratorFactory = Callable[[int], Any]
+
+# Orchestrator methods whose first argument is the encounter, resolved inside the worker
+ENCOUNTER_METHODS = frozenset(
+    {
+        "ingest_transcript_chunk",
+        "ingest_audio_from_s3",
+        "finalize_encounter",
+        "finalize_encounter_bytes",
+        "abandon_encounter",
+        "recommend_emergency_action",
+        "trigger_emergency_call",
+    }
+)
+FINALIZE_METHODS = frozenset({"finalize_encounter", "finalize_encounter_bytes"})
+# Methods after which the worker no longer holds the encounter
+CLOSING_METHODS = FINALIZE_METHODS | {"abandon_encounter"}
+
+
+class WorkerPoolException(Exception):
+    """Base exception for the encounter worker pool."""
+
+
+class WorkerPoolDraining(WorkerPoolException):
+    """Raised when a new encounter is started on a draining pool."""
+
+
+def default_orchestrator_factory(worker_index: int) -> Any:
+    """Build a worker's orchestrator from the environment, with a per-worker WAL."""
+    from src.agent.orchestrator import AgentOrchestrator
+    from src.clients.encounter_wal import EncounterWAL
+    from src.clients.providers import selected_provider
+
+    if selected_provider("AI_MED_AGENT_RECORD_STORE", "local") == "local":
+        logger.warning(
+            "Encounter worker %d uses an in-process record store; patient views only cover "
+            "encounters finalized on this worker. Set AI_MED_AGENT_RECORD_STORE to sqlite or dynamodb.",
+            worker_index,
+        )
+
+    wal_path = os.getenv("AI_MED_AGENT_ENCOUNTER_WAL")
+    return AgentOrchestrator(
+        agent_id=f"ai-med-agent-worker-{worker_index}",
+        encounter_wal=EncounterWAL(f"{wal_path}.{worker_index}") if wal_path else None,
+    )
+
+
+class EncounterWorkerPool:
+    """Run one ``AgentOrchestrator`` per process and shard encounters across them.
+
+    Each encounter is pinned to worker ``crc32(encounter_id) % workers``, which owns
+    its ``EncounterContext``; callers address encounters by id. Encounters recovered
+    from a worker's write-ahead log stay on that worker, so keep ``workers`` stable
+    across restarts when the WAL is enabled.
+
+    Calls return ``Future``s (``submit``) or block (the orchestrator-style wrappers).
+    ``drain`` stops new encounters and waits for open ones to be finalized or
+    abandoned; ``load`` reports per-worker open encounters and queued calls.
+
+    A patient's encounters land on different workers, so patient views need a record
+    store the workers share (SQLite file or DynamoDB); with the default in-process
+    store each worker only sees its own encounters. ``get_patient_view`` is served by
+    the worker the patient id hashes to, through that worker's view cache, so it can
+    trail writes made on other workers by up to the cache TTL.
+
+    Each worker answers over its own pipe, and results travel pickled and are
+    unpickled for their own future, so a result that cannot cross the process
+    boundary fails only that call. The reader also waits on each process sentinel:
+    when a worker exits unexpectedly, its pending calls fail with
+    ``WorkerPoolException``, its open encounters are dropped and further calls
+    routed to it are rejected.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        orchestrator_factory: OrchestratorFactory = default_orchestrator_factory,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        context = multiprocessing.get_context()
+        self._requests = [context.Queue() for _ in range(self.workers)]
+        # One pipe per worker: a shared queue's write lock is lost if a worker dies holding it
+        pipes = [context.Pipe(duplex=False) for _ in range(self.workers)]
+        self._responses = [receiver for receiver, _ in pipes]
+        self._processes = [
+            context.Process(
+                target=_worker_main,
+                args=(index, orchestrator_factory, self._requests[index], pipes[index][1]),
+                name=f"encounter-worker-{index}",
+                daemon=True,
+            )
+            for index in range(self.workers)
+        ]
+        self._lock = threading.Condition()
+        # request id -> (worker, future)
+        self._pending: Dict[int, Tuple[int, Future]] = {}
+        self._pending_by_worker = [0] * self.workers
+        self._completed = [0] * self.workers
+        self._open: List[set] = [set() for _ in range(self.workers)]
+        self._request_ids = count()
+        self._dead: Dict[int, Optional[int]] = {}
+        self._draining = False
+        self._closed = False
+        for process in self._processes:
+            process.start()
+        for _, sender in pipes:
+            sender.close()  # only workers write; exits are detected through the sentinels
+        self._reader = threading.Thread(target=self._read_responses, name="encounter-pool-reader", daemon=True)
+        self._reader.start()
+
+    def worker_for(self, encounter_id: str) -> int:
+        return zlib.crc32(encounter_id.encode("utf-8")) % self.workers
+
+    def submit(self, encounter_id: str, method: str, *args: Any, **kwargs: Any) -> Future:
+        """Call ``method`` on the orchestrator owning ``encounter_id``."""
+        worker = self.worker_for(encounter_id)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise WorkerPoolException("worker pool is closed")
+            if worker in self._dead:
+                raise WorkerPoolException(f"worker {worker} exited with code {self._dead[worker]}")
+            request_id = next(self._request_ids)
+            self._pending[request_id] = (worker, future)
+            self._pending_by_worker[worker] += 1
+        self._requests[worker].put((request_id, method, encounter_id, args, kwargs))
+        return future
+
+    def start_encounter(self, patient_profile: PatientProfile, clinician_id: str, consent_granted: bool) -> str:
+        with self._lock:
+            if self._draining:
+                raise WorkerPoolDraining("worker pool is draining; not accepting new encounters")
+            encounter_id = str(uuid4())
+            self._open[self.worker_for(encounter_id)].add(encounter_id)
+        future = self.submit(
+            encounter_id,
+            "start_encounter",
+            patient_profile,
+            clinician_id,
+            consent_granted,
+            encounter_id,
+        )
+        try:
+            future.result()
+        except BaseException:
+            self._finish_encounter(encounter_id)
+            raise
+        return encounter_id
+
+    def ingest_transcript_chunk(self, encounter_id: str, chunk: str) -> None:
+        self.submit(encounter_id, "ingest_transcript_chunk", chunk).result()
+
+    def finalize_encounter(self, encounter_id: str) -> Dict[str, Any]:
+        return self.submit(encounter_id, "finalize_encounter").result()
+
+    def abandon_encounter(self, encounter_id: str, reason: str = "abandoned") -> None:
+        self.submit(encounter_id, "abandon_encounter", reason).result()
+
+    def get_patient_view(self, patient_id: str) -> Dict[str, Any]:
+        return self.submit(patient_id, "get_patient_view", patient_id).result()
+
+    def recommend_emergency_action(self, encounter_id: str, severity: str, reason: str, confidence: float = 0.6) -> Any:
+        return self.submit(encounter_id, "recommend_emergency_action", severity, reason, confidence).result()
+
+    def trigger_emergency_call(self, encounter_id: str, initiated_by: str, reason: str, confirmed: bool) -> Any:
+        return self.submit(
+            encounter_id, "trigger_emergency_call", initiated_by=initiated_by, reason=reason, confirmed=confirmed
+        ).result()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Per-worker process id, liveness, open encounters, queued and completed calls."""
+        with self._lock:
+            return [
+                {
+                    "worker": index,
+                    "pid": process.pid,
+                    "alive": process.is_alive(),
+                    "open_encounters": len(self._open[index]),
+                    "pending_calls": self._pending_by_worker[index],
+                    "completed_calls": self._completed[index],
+                }
+                for index, process in enumerate(self._processes)
+            ]
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting encounters and wait until open encounters and calls finish."""
+        with self._lock:
+            self._draining = True
+            return self._lock.wait_for(lambda: not self._pending and not any(self._open), timeout=timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their queued calls; pair with ``drain`` for a graceful stop."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for requests in self._requests:
+            requests.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._reader.join(timeout)
+        with self._lock:
+            abandoned, self._pending = self._pending, {}
+        for _, future in abandoned.values():
+            future.set_exception(WorkerPoolException("worker pool closed before the call completed"))
+
+    def __enter__(self) -> "EncounterWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _finish_encounter(self, encounter_id: str) -> None:
+        with self._lock:
+            self._open[self.worker_for(encounter_id)].discard(encounter_id)
+            self._lock.notify_all()
+
+    def _read_responses(self) -> None:
+        """Dispatch worker responses until every worker has exited."""
+        pipes = {pipe: index for index, pipe in enumerate(self._responses)}
+        sentinels = {process.sentinel: index for index, process in enumerate(self._processes)}
+        while sentinels:
+            for ready in connection.wait([*pipes, *sentinels]):
+                if ready in pipes:
+                    self._receive(ready, pipes)
+                    continue
+                index = sentinels.pop(ready)
+                pipe = self._responses[index]
+                while pipe in pipes and pipe.poll():  # answers sent before the exit
+                    self._receive(pipe, pipes)
+                pipes.pop(pipe, None)
+                with self._lock:
+                    closing = self._closed
+                if not closing:
+                    self._processes[index].join()  # reap it so exitcode is set
+                    self._fail_worker(index, self._processes[index].exitcode)
+
+    def _receive(self, pipe: Any, pipes: Dict[Any, int]) -> None:
+        worker = pipes[pipe]
+        try:
+            kind, _, payload = pipe.recv()
+        except EOFError:
+            pipes.pop(pipe)
+            return
+        except Exception:  # keep reading; a lost answer is failed when its worker exits
+            logger.exception("Unreadable response from encounter worker %d", worker)
+            return
+        if kind == "recovered":
+            with self._lock:
+                self._open[worker].update(payload)
+            return
+        request_id, method, encounter_id, ok, data = payload
+        try:
+            value = pickle.loads(data)
+        except Exception as exc:
+            ok, value = False, WorkerPoolException(f"cannot unpickle the {method} result: {exc!r}")
+        with self._lock:
+            entry = self._pending.pop(request_id, None)
+            if entry is not None:
+                self._pending_by_worker[worker] -= 1
+                self._completed[worker] += 1
+            if ok and method in CLOSING_METHODS:
+                self._open[worker].discard(encounter_id)
+            self._lock.notify_all()
+        if entry is None:
+            return
+        if ok:
+            entry[1].set_result(value)
+        else:
+            entry[1].set_exception(value)
+
+    def _fail_worker(self, worker: int, exitcode: Optional[int]) -> None:
+        with self._lock:
+            self._dead[worker] = exitcode
+            failed = [request_id for request_id, (owner, _) in self._pending.items() if owner == worker]
+            futures = [self._pending.pop(request_id)[1] for request_id in failed]
+            self._pending_by_worker[worker] = 0
+            lost, self._open[worker] = self._open[worker], set()
+            self._lock.notify_all()
+        self._requests[worker].cancel_join_thread()  # nobody reads it any more
+        logger.error(
+            "Encounter worker %d exited with code %s; failing %d calls and dropping %d open encounters",
+            worker,
+            exitcode,
+            len(futures),
+            len(lost),
+        )
+        for future in futures:
+            future.set_exception(WorkerPoolException(f"worker {worker} exited with code {exitcode}"))
+
+
+def _worker_main(index: int, factory: OrchestratorFactory, requests: Any, responses: Any) -> None:
+    orchestrator = factory(index)
+    encounters: Dict[str, EncounterContext] = {
+        encounter.encounter_id: encounter for encounter in getattr(orchestrator, "recovered_encounters", [])
+    }
+    if encounters:
+        responses.send(("recovered", index, list(encounters)))
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        request_id, method, encounter_id, args, kwargs = request
+        try:
+            if method in ENCOUNTER_METHODS:
+                if encounter_id not in encounters:
+                    raise WorkerPoolException(f"unknown encounter {encounter_id}")
+                value = getattr(orchestrator, method)(encounters[encounter_id], *args, **kwargs)
+                if method in CLOSING_METHODS:
+                    encounters.pop(encounter_id, None)
+            else:
+                value = getattr(orchestrator, method)(*args, **kwargs)
+                if method == "start_encounter":
+                    encounters[encounter_id] = value
+                    value = encounter_id
+            ok = True
+        except Exception as exc:  # returned to the caller's future
+            ok, value = False, exc
+        ok, data = _pickle_outcome(ok, value)
+        responses.send(("result", index, (request_id, method, encounter_id, ok, data)))
+
+
+def _pickle_outcome(ok: bool, value: Any) -> Tuple[bool, bytes]:
+    """Pickle a call's result or exception here, so pickling failures reach the caller."""
+    try:
+        return ok, pickle.dumps(value)
+    except Exception as exc:
+        if not ok:
+            return False, pickle.dumps(WorkerPoolException(f"{type(value).__name__}: {value}"))
+        return False, pickle.dumps(WorkerPoolException(f"cannot pickle {type(value).__name__} result: {exc!r}"))
@@ -1,11 +1,35 @@
 """Client services for AI-Med-Agent."""
 
-from src.clients.config_manager import ConfigManager
+import importlib
+
 from src.clients.clinical_services import RealTimeTranscriber, ClinicalNLPService, GuidelineService
 from src.clients.record_store import ClinicalRecordStore
-from src.clients.aws_transcribe import AWSTranscribeService
-from src.clients.aws_bedrock import BedrockClinicalNLPService, BedrockGuidelineService
-from src.clients.dynamodb_store import DynamoDBClinicalRecordStore, DynamoDBAuditLogger
+from src.clients.sqlite_store import SQLiteClinicalRecordStore
+from src.clients.view_cache import PatientViewCache
+from src.clients.export import PatientExporter
+from src.clients.encounter_wal import EncounterWAL
+from src.clients.providers import register_provider
+
+# boto3-backed clients are imported on first access so local deployments skip boto3
+_LAZY_EXPORTS = {
+	"ConfigManager": "src.clients.config_manager",
+	"AWSTranscribeService": "src.clients.aws_transcribe",
+	"BedrockClinicalNLPService": "src.clients.aws_bedrock",
+	"BedrockGuidelineService": "src.clients.aws_bedrock",
+	"DynamoDBClinicalRecordStore": "src.clients.dynamodb_store",
+	"DynamoDBAuditLogger": "src.clients.dynamodb_store",
+	"DynamoDBConsentStore": "src.clients.dynamodb_store",
+}
+
+
+def __getattr__(name):
+	module = _LAZY_EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(module), name)
+	globals()[name] = value
+	return value
+
 
 __all__ = [
 	"ConfigManager",
@@ -13,9 +37,15 @@ __all__ = [
 	"ClinicalNLPService",
 	"GuidelineService",
 	"ClinicalRecordStore",
+	"SQLiteClinicalRecordStore",
+	"PatientViewCache",
+	"PatientExporter",
+	"EncounterWAL",
+	"register_provider",
 	"AWSTranscribeService",
 	"BedrockClinicalNLPService",
 	"BedrockGuidelineService",
 	"DynamoDBClinicalRecordStore",
 	"DynamoDBAuditLogger",
+	"DynamoDBConsentStore",
 ]
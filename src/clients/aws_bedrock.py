@@ -2,7 +2,7 @@
 
 import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 import boto3
 from botocore.exceptions import ClientError
@@ -25,7 +25,7 @@ class BedrockClinicalNLPService(ClinicalNLPService):
         self.model_id = model_id
         self.client = boto3.client("bedrock-runtime", region_name=region)
 
-    def extract_key_details(self, text: str) -> List[ClinicalObservation]:
+    def extract_key_details(self, text: str, chunk_index: Optional[int] = None) -> List[ClinicalObservation]:
         prompt = (
             "Extract clinical observations from the transcript. "
             "Return JSON with items: category, value, confidence. "
@@ -42,7 +42,7 @@ class BedrockClinicalNLPService(ClinicalNLPService):
                     confidence=float(item.get("confidence", 0.5)),
                 )
             )
-        return observations or super().extract_key_details(text)
+        return observations or super().extract_key_details(text, chunk_index)
 
     def build_soap_note(
         self,
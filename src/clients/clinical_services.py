@@ -1,9 +1,9 @@
 """Clinical AI service stubs for transcription, NLP, and guidelines."""
 
-from typing import List
+from typing import List, Optional
 from collections import defaultdict
 
-from src.core.clinical import ClinicalObservation, SOAPNote, PatientProfile, ClinicalRecommendation
+from src.core.clinical import ClinicalObservation, TranscriptSpan, SOAPNote, PatientProfile, ClinicalRecommendation
 
 
 class RealTimeTranscriber:
@@ -21,13 +21,18 @@ class RealTimeTranscriber:
     def get_transcript(self, encounter_id: str) -> str:
         return " ".join(self._sessions.get(encounter_id, []))
 
+    def end_session(self, encounter_id: str) -> None:
+        self._sessions.pop(encounter_id, None)
+
 
 class ClinicalNLPService:
     """Lightweight NLP extraction and SOAP note builder."""
 
     SYMPTOM_KEYWORDS = ["fever", "cough", "pain", "fatigue", "nausea", "headache", "dizzy"]
 
-    def extract_key_details(self, text: str) -> List[ClinicalObservation]:
+    def extract_key_details(self, text: str, chunk_index: Optional[int] = None) -> List[ClinicalObservation]:
+        """Extract observations from ``text``; when it is transcript chunk ``chunk_index``,
+        history observations reference the chunk and share its string instead of copying it."""
         observations: List[ClinicalObservation] = []
         lowered = text.lower()
         for symptom in self.SYMPTOM_KEYWORDS:
@@ -47,6 +52,7 @@ class ClinicalNLPService:
                     value=text,
                     source="transcript",
                     confidence=0.5,
+                    span=TranscriptSpan(chunk_index, 0, len(text)) if chunk_index is not None else None,
                 )
             )
         return observations
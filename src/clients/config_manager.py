@@ -6,10 +6,13 @@ Retrieves secrets from Secrets Manager and configurations from AppConfig
 import json
 import boto3
 import logging
-from functools import lru_cache
-from typing import Dict, Any
+import threading
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from botocore.exceptions import ClientError
 
+from src.utils.secrets import secret_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,20 +21,135 @@ class ConfigurationException(Exception):
     pass
 
 
+ConfigListener = Callable[[Dict[str, Any]], None]
+
+
+class AppConfigSession:
+    """
+    Long-lived AppConfig data session for one configuration profile.
+
+    Each ``poll`` exchanges the current token for ``NextPollConfigurationToken``.
+    AppConfig only returns content when the deployed configuration changed, so an
+    empty body keeps the current snapshot. ``snapshot`` is shared between readers
+    and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        application_id: str,
+        environment: str,
+        configuration_profile: str,
+        min_poll_interval: int = 15,
+    ):
+        self.client = client
+        self.application_id = application_id
+        self.environment = environment
+        self.configuration_profile = configuration_profile
+        self.min_poll_interval = min_poll_interval
+        self.poll_interval = min_poll_interval
+        self.next_poll_at = 0.0
+        self.snapshot: Dict[str, Any] = {}
+        self.version: Optional[str] = None
+        self.loaded = False
+        self._token: Optional[str] = None
+        self._listeners: List[ConfigListener] = []
+        self._lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        """Return the snapshot, fetching it first if this session has never polled"""
+        if not self.loaded:
+            with self._lock:
+                changed = False if self.loaded else self._poll()
+            if changed:
+                self._notify()
+        return self.snapshot
+
+    def poll(self) -> bool:
+        """Fetch the next configuration; returns True when the snapshot changed"""
+        with self._lock:
+            changed = self._poll()
+        if changed:
+            self._notify()
+        return changed
+
+    def add_listener(self, callback: ConfigListener) -> None:
+        """Call ``callback(snapshot)`` whenever a poll brings a new configuration"""
+        self._listeners.append(callback)
+
+    def _poll(self) -> bool:
+        if self._token is None:
+            self._token = self._start_session()
+        try:
+            response = self.client.get_latest_configuration(ConfigurationToken=self._token)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "BadRequestException":
+                raise
+            # Tokens expire after 24 hours without a poll; open a fresh session
+            self._token = self._start_session()
+            response = self.client.get_latest_configuration(ConfigurationToken=self._token)
+
+        self._token = response["NextPollConfigurationToken"]
+        self.poll_interval = max(int(response.get("NextPollIntervalInSeconds", self.poll_interval)), 1)
+        self.next_poll_at = time.monotonic() + self.poll_interval
+        body = response.get("Configuration")
+        content = body.read() if body is not None else b""
+        first_load = not self.loaded
+        self.loaded = True
+        if not content:
+            return first_load
+        self.snapshot = json.loads(content)
+        self.version = response.get("VersionLabel")
+        logger.info(
+            f"Loaded AppConfig configuration {self.configuration_profile} from {self.environment} "
+            f"(version={self.version})"
+        )
+        return True
+
+    def _start_session(self) -> str:
+        response = self.client.start_configuration_session(
+            ApplicationIdentifier=self.application_id,
+            EnvironmentIdentifier=self.environment,
+            ConfigurationProfileIdentifier=self.configuration_profile,
+            RequiredMinimumPollIntervalInSeconds=self.min_poll_interval,
+        )
+        return response["InitialConfigurationToken"]
+
+    def _notify(self) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(self.snapshot)
+            except Exception:
+                logger.exception(f"AppConfig listener failed for {self.configuration_profile}")
+
+
 class ConfigManager:
-    """Manage AWS Secrets Manager and AppConfig with production-grade error handling"""
+    """Manage AWS Secrets Manager and AppConfig with production-grade error handling
 
-    def __init__(self, region: str = 'us-east-1'):
+    AppConfig reads are served from per-profile ``AppConfigSession`` snapshots. The
+    first read of a profile fetches it; afterwards a background poller refreshes each
+    session at the interval AppConfig advises, so reads never wait on the network.
+    """
+
+    def __init__(self, region: str = 'us-east-1', background_polling: bool = True, min_poll_interval: int = 15):
         self.region = region
+        self.background_polling = background_polling
+        self.min_poll_interval = min_poll_interval
         self.secrets_client = boto3.client("secretsmanager", region_name=region)
         self.appconfig_client = boto3.client("appconfig", region_name=region)
         self.appconfigdata_client = boto3.client("appconfigdata", region_name=region)
+        self._sessions: Dict[Tuple[str, str, str], AppConfigSession] = {}
+        self._sessions_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._poller: Optional[threading.Thread] = None
         logger.info(f"ConfigManager initialized (region={region})")
 
     def get_secret(self, secret_id: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Retrieve a secret from AWS Secrets Manager.
-        Results are cached by default to avoid repeated API calls.
+        Results come from the process-wide secret cache, which refetches a secret
+        only after its TTL expires and its version has rotated.
         
         Args:
             secret_id: The name or ARN of the secret
@@ -41,26 +159,20 @@ class ConfigManager:
             Secret value as dict or string
         """
         try:
-            if use_cache:
-                return self._get_secret_cached(secret_id)
-            
-            response = self.secrets_client.get_secret_value(SecretId=secret_id)
-            secret = self._parse_secret_response(response)
-            logger.info(f"Retrieved secret {secret_id}")
-            return secret
-        except self.secrets_client.exceptions.ResourceNotFoundException:
-            logger.error(f"Secret '{secret_id}' not found in AWS Secrets Manager")
-            raise ConfigurationException(f"Secret '{secret_id}' not found")
+            response = secret_cache.get_secret_value(
+                secret_id,
+                region_name=self.region,
+                client=self.secrets_client,
+                force_refresh=not use_cache,
+            )
+            return self._parse_secret_response(response)
         except ClientError as e:
+            if e.response['Error']['Code'] == 'ResourceNotFoundException':
+                logger.error(f"Secret '{secret_id}' not found in AWS Secrets Manager")
+                raise ConfigurationException(f"Secret '{secret_id}' not found")
             logger.error(f"Failed to retrieve secret '{secret_id}': {e.response['Error']['Code']}")
             raise ConfigurationException(f"Failed to retrieve secret: {str(e)}")
 
-    @lru_cache(maxsize=32)
-    def _get_secret_cached(self, secret_id: str) -> Dict[str, Any]:
-        """Internal cached secret retrieval"""
-        response = self.secrets_client.get_secret_value(SecretId=secret_id)
-        return self._parse_secret_response(response)
-
     @staticmethod
     def _parse_secret_response(response: Dict) -> Dict[str, Any]:
         """Parse secret response from Secrets Manager"""
@@ -81,40 +193,85 @@ class ConfigManager:
     ) -> Dict[str, Any]:
         """
         Retrieve configuration from AWS AppConfig.
-        
+
+        Only the first read of a profile calls AppConfig; later reads return the
+        in-memory snapshot kept current by the background poller.
+
         Args:
             application_id: AppConfig application ID
             environment: Environment identifier
             configuration_profile: Configuration profile identifier
-            
+
         Returns:
-            Configuration as dict
+            Configuration as dict (shared snapshot; do not mutate)
         """
+        session = self.appconfig_session(application_id, environment, configuration_profile)
         try:
-            # Start a configuration session
-            session_response = self.appconfigdata_client.start_configuration_session(
-                ApplicationIdentifier=application_id,
-                EnvironmentIdentifier=environment,
-                ConfigurationProfileIdentifier=configuration_profile,
-            )
-
-            token = session_response["InitialConfigurationToken"]
-            
-            # Get the latest configuration
-            config_response = self.appconfigdata_client.get_latest_configuration(
-                ConfigurationToken=token
-            )
-
-            config_data = {}
-            if config_response.get("Configuration"):
-                config_data = json.loads(config_response["Configuration"].read())
-            
-            logger.info(f"Retrieved AppConfig configuration {configuration_profile} from {environment}")
-            return config_data
+            return session.load()
         except ClientError as e:
             logger.error(f"Failed to retrieve AppConfig configuration: {e.response['Error']['Code']}")
             raise ConfigurationException(f"Failed to retrieve AppConfig configuration: {str(e)}")
 
+    def appconfig_session(self, application_id: str, environment: str, configuration_profile: str) -> AppConfigSession:
+        """Return the persistent session for a profile, creating it on first use"""
+        key = (application_id, environment, configuration_profile)
+        session = self._sessions.get(key)
+        if session is None:
+            with self._sessions_lock:
+                session = self._sessions.get(key)
+                if session is None:
+                    session = self._sessions[key] = AppConfigSession(
+                        self.appconfigdata_client,
+                        application_id,
+                        environment,
+                        configuration_profile,
+                        min_poll_interval=self.min_poll_interval,
+                    )
+                    self._start_poller()
+        return session
+
+    def subscribe(
+        self,
+        application_id: str,
+        environment: str,
+        configuration_profile: str,
+        callback: ConfigListener,
+    ) -> None:
+        """Call ``callback(configuration)`` each time the profile's configuration changes"""
+        self.appconfig_session(application_id, environment, configuration_profile).add_listener(callback)
+
+    def close(self) -> None:
+        """Stop the background poller"""
+        self._closed = True
+        self._wake.set()
+        if self._poller is not None:
+            self._poller.join()
+
+    def _start_poller(self) -> None:
+        if not self.background_polling or self._closed:
+            return
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll_sessions, name="appconfig-poller", daemon=True)
+            self._poller.start()
+        self._wake.set()
+
+    def _poll_sessions(self) -> None:
+        while not self._closed:
+            self._wake.clear()
+            with self._sessions_lock:
+                sessions = list(self._sessions.values())
+            for session in sessions:
+                if session.next_poll_at <= time.monotonic():
+                    try:
+                        session.poll()
+                    except Exception as e:
+                        logger.warning(
+                            f"AppConfig poll failed for {session.configuration_profile}; keeping last snapshot: {e}"
+                        )
+                        session.next_poll_at = time.monotonic() + session.poll_interval
+            wake_at = min((session.next_poll_at for session in sessions), default=float("inf"))
+            self._wake.wait(None if wake_at == float("inf") else max(wake_at - time.monotonic(), 0.0))
+
     def get_database_config(self, secret_name: str = "ai-med-agent/db/password") -> Dict[str, Any]:
         """Retrieve database configuration from Secrets Manager"""
         db_secret = self.get_secret(secret_name)
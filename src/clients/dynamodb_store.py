@@ -1,69 +1,330 @@
 """DynamoDB persistence for encounters and audit logs."""
 
+import atexit
+import base64
+import json
 import logging
-from typing import Dict, Any, List
+import queue
+import threading
+import time
+import zlib
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from src.core.clinical import EncounterContext
-from src.core.audit import AuditEvent
-from src.core.privacy import AccessRole, AccessLevel
+from src.core.audit import AuditEvent, AuditLogger, AuditQuery
+from src.core.consent import ConsentRecord, ConsentStore, ConsentType
+from src.clients.record_store import EncounterSummary, freeze
+from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel
+from src.core.serialization import EncounterDocument
 
 logger = logging.getLogger(__name__)
 
+MAX_BATCH_WRITE_ITEMS = 25
+
 
 class DynamoDBStoreException(Exception):
     """Base exception for DynamoDB store."""
 
 
 class DynamoDBClinicalRecordStore:
-    """Persist encounters in DynamoDB."""
+    """Persist encounters in DynamoDB.
+
+    Encounters are keyed on ``patient_id`` with ``created_at`` as the sort key (or as
+    the sort key of ``created_at_index`` for tables ranged on ``encounter_id``), so
+    time ranges and newest-first limits are key conditions. Reads only project the
+    attributes the requesting role may see.
+
+    Items are written in a versioned compact encoding: key and query attributes stay
+    top-level strings, while the SOAP note, recommendations and observations are each
+    stored as a zlib-compressed JSON binary attribute (one per privacy resource, so
+    projections stay per-role). ``iter_encounters`` yields ``EncodedEncounter`` views
+    that inflate a blob only when it is accessed; ``get_patient_view`` returns the
+    same read-only ``FrozenDict`` view type as the other stores. Consumed capacity
+    is accumulated in ``consumed_capacity`` for comparison against the legacy layout.
+    """
 
-    def __init__(self, table_name: str, region: str = "us-east-1") -> None:
+    ENCODING_VERSION = 1
+    BASE_ATTRIBUTES = ("patient_id", "encounter_id", "created_at", "clinician_id", "encoding_version")
+    SUMMARY_ATTRIBUTES = ("encounter_id", "patient_id", "clinician_id", "created_at")
+    RESOURCE_ATTRIBUTES = {
+        DataResource.CLINICAL_NOTES: "soap_note",
+        DataResource.RECOMMENDATIONS: "recommendations",
+        DataResource.TRANSCRIPTS: "observations",
+    }
+    EXPORT_KEYS = BASE_ATTRIBUTES
+    EXPORT_FIELDS = RESOURCE_ATTRIBUTES
+
+    def __init__(
+        self,
+        table_name: str,
+        region: str = "us-east-1",
+        privacy_policy: Optional[PrivacyPolicy] = None,
+        created_at_index: Optional[str] = None,
+        page_size: int = 100,
+    ) -> None:
         self.table_name = table_name
+        self.privacy_policy = privacy_policy or PrivacyPolicy()
+        self.created_at_index = created_at_index
+        self.page_size = page_size
+        self.consumed_capacity = {"read": 0.0, "write": 0.0}
         self.client = boto3.resource("dynamodb", region_name=region)
         self.table = self.client.Table(table_name)
 
-    def store_encounter(self, encounter: EncounterContext) -> None:
+    def store_encounter(self, encounter: EncounterContext, document: Optional[EncounterDocument] = None) -> None:
+        document = document or EncounterDocument(encounter)
         item = {
             "patient_id": encounter.patient_profile.patient_id,
             "encounter_id": encounter.encounter_id,
             "created_at": encounter.created_at,
             "clinician_id": encounter.clinician_id,
-            "soap_note": encounter.soap_note.to_dict() if encounter.soap_note else {},
-            "recommendations": [rec.to_dict() for rec in encounter.recommendations],
-            "observations": [obs.__dict__ for obs in encounter.observations],
+            "encoding_version": self.ENCODING_VERSION,
+            "soap_note": document.compressed_part("soap_note"),
+            "recommendations": document.compressed_part("recommendations"),
+            "observations": document.compressed_part("observations"),
         }
         try:
-            self.table.put_item(Item=item)
+            response = self.table.put_item(Item=item, ReturnConsumedCapacity="TOTAL")
         except ClientError as exc:
             logger.error("Failed to persist encounter: %s", exc)
             raise DynamoDBStoreException(str(exc)) from exc
+        self._record_capacity("write", response)
 
-    def get_patient_view(self, patient_id: str, role: AccessRole, access_level: AccessLevel) -> Dict[str, Any]:
-        try:
-            response = self.table.query(
-                KeyConditionExpression=boto3.dynamodb.conditions.Key("patient_id").eq(patient_id)
+    def get_patient_view(
+        self,
+        patient_id: str,
+        role: AccessRole,
+        access_level: AccessLevel,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Read-only ``FrozenDict`` view, like the other stores' views.
+
+        ``encounters`` are listed oldest first; with ``limit`` they are the ``limit``
+        most recent ones, still in ascending ``created_at`` order. Compressed
+        attributes are inflated.
+        """
+        encounters = list(
+            self.iter_encounters(
+                patient_id,
+                role,
+                access_level,
+                start=start,
+                end=end,
+                limit=limit,
+                newest_first=limit is not None,
             )
-        except ClientError as exc:
-            logger.error("Failed to fetch encounters: %s", exc)
-            raise DynamoDBStoreException(str(exc)) from exc
+        )
+        if limit is not None:
+            encounters.reverse()
+        return freeze({"patient_id": patient_id, "encounters": encounters})
+
+    def encounters_between(
+        self,
+        patient_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[EncounterSummary]:
+        """Encounters with ``start <= created_at <= end`` via a range key condition, oldest first."""
+        items = self._query(patient_id, self.SUMMARY_ATTRIBUTES, start=start, end=end, newest_first=False)
+        return [_summary(item) for item in items]
 
-        items = response.get("Items", [])
-        return {
-            "patient_id": patient_id,
-            "encounters": items,
+    def latest_encounters(self, patient_id: str, limit: int) -> List[EncounterSummary]:
+        """The ``limit`` most recent encounters, newest first."""
+        if limit <= 0:
+            return []
+        return [_summary(item) for item in self._query(patient_id, self.SUMMARY_ATTRIBUTES, limit=limit)]
+
+    def iter_encounters(
+        self,
+        patient_id: str,
+        role: AccessRole,
+        access_level: AccessLevel,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a patient's encounters page by page, projected to what ``role`` may see."""
+        attributes = self._attributes(role, access_level)
+        for item in self._query(patient_id, attributes, start=start, end=end, limit=limit, newest_first=newest_first):
+            yield EncodedEncounter(item) if "encoding_version" in item else item
+
+    def _query(
+        self,
+        patient_id: str,
+        attributes: Tuple[str, ...],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        key = Key("patient_id").eq(patient_id)
+        time_range = _time_range(Key("created_at"), start, end)
+        request: Dict[str, Any] = {
+            "KeyConditionExpression": key & time_range if time_range is not None else key,
+            "ScanIndexForward": not newest_first,
+            "ReturnConsumedCapacity": "TOTAL",
         }
+        request.update(_projection_expression(attributes))
+        if self.created_at_index:
+            request["IndexName"] = self.created_at_index
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            request["Limit"] = self.page_size if remaining is None else min(remaining, self.page_size)
+            try:
+                response = self.table.query(**request)
+            except ClientError as exc:
+                logger.error("Failed to fetch encounters: %s", exc)
+                raise DynamoDBStoreException(str(exc)) from exc
+            self._record_capacity("read", response)
+            items = response.get("Items", [])
+            if remaining is not None:
+                items = items[:remaining]
+                remaining -= len(items)
+            yield from items
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            request["ExclusiveStartKey"] = last_key
+
+    def iter_export_pages(
+        self,
+        role: AccessRole,
+        access_level: AccessLevel,
+        cursor: Optional[str] = None,
+        page_size: int = 500,
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Scan encounter items page by page, projected server-side for ``role``.
+
+        Yields ``(items, cursor)``; the cursor resumes after the page and is None on the last one.
+        """
+        request: Dict[str, Any] = {"Limit": page_size, "ReturnConsumedCapacity": "TOTAL"}
+        request.update(_projection_expression(self._attributes(role, access_level)))
+        if cursor:
+            request["ExclusiveStartKey"] = _decode_key(cursor)
+        while True:
+            try:
+                response = self.table.scan(**request)
+            except ClientError as exc:
+                logger.error("Failed to scan encounters: %s", exc)
+                raise DynamoDBStoreException(str(exc)) from exc
+            self._record_capacity("read", response)
+            items = [
+                dict(EncodedEncounter(item)) if "encoding_version" in item else item
+                for item in response.get("Items", [])
+            ]
+            last_key = response.get("LastEvaluatedKey")
+            yield items, _encode_key(last_key) if last_key else None
+            if not last_key:
+                return
+            request["ExclusiveStartKey"] = last_key
+
+    def _attributes(self, role: AccessRole, access_level: AccessLevel) -> Tuple[str, ...]:
+        plan = self.privacy_policy.plan(role, access_level)
+        return self.BASE_ATTRIBUTES + plan.select(self.RESOURCE_ATTRIBUTES)
+
+    def _record_capacity(self, kind: str, response: Dict[str, Any]) -> None:
+        units = response.get("ConsumedCapacity", {}).get("CapacityUnits")
+        if units is not None:
+            self.consumed_capacity[kind] += float(units)
+
+
+class EncodedEncounter(Mapping):
+    """Read-only view of a compact encounter item; binary attributes inflate on first access."""
 
+    COMPRESSED_ATTRIBUTES = frozenset({"soap_note", "recommendations", "observations"})
 
-class DynamoDBAuditLogger:
-    """Persist audit logs in DynamoDB."""
+    def __init__(self, item: Dict[str, Any]) -> None:
+        if int(item["encoding_version"]) != DynamoDBClinicalRecordStore.ENCODING_VERSION:
+            raise DynamoDBStoreException(f"Unsupported encounter encoding: {item['encoding_version']}")
+        self._item = item
+        self._decoded: Dict[str, Any] = {}
 
-    def __init__(self, table_name: str, region: str = "us-east-1") -> None:
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.COMPRESSED_ATTRIBUTES:
+            return self._item[key]
+        if key not in self._decoded:
+            self._decoded[key] = _decode_blob(self._item[key])
+        return self._decoded[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._item)
+
+    def __len__(self) -> int:
+        return len(self._item)
+
+
+def _decode_blob(value: Any) -> Any:
+    raw = value.value if hasattr(value, "value") else value  # boto3 returns Binary wrappers
+    return json.loads(zlib.decompress(raw))
+
+
+class DynamoDBAuditLogger(AuditLogger):
+    """Persist audit logs in DynamoDB.
+
+    The table is keyed on ``resource_id`` (hash) and ``timestamp`` (range). Actor and
+    action lookups go through the ``actor_id``/``action`` GSIs, both ranged on
+    ``timestamp``, so reads are key-condition queries; a scan is only used when a
+    query carries no resource, actor or action filter.
+
+    With ``batch_writes`` enabled, ``log_event`` only enqueues the item. A background
+    writer drains the queue into ``BatchWriteItem`` calls of up to ``batch_size`` items,
+    waiting at most ``linger_seconds`` for a batch to fill, and retries unprocessed
+    items and throttled calls with exponential backoff. Call ``flush`` to wait for
+    queued events; reads wait at most ``read_flush_timeout`` seconds for the events
+    logged before them and then query what has been written so far.
+    """
+
+    ACTOR_INDEX = "actor_id-timestamp-index"
+    ACTION_INDEX = "action-timestamp-index"
+    MAX_BATCH_SIZE = MAX_BATCH_WRITE_ITEMS
+
+    def __init__(
+        self,
+        table_name: str,
+        region: str = "us-east-1",
+        actor_index: str = ACTOR_INDEX,
+        action_index: str = ACTION_INDEX,
+        batch_writes: bool = False,
+        batch_size: int = MAX_BATCH_SIZE,
+        linger_seconds: float = 0.05,
+        max_retries: int = 5,
+        base_backoff_seconds: float = 0.05,
+        read_flush_timeout: float = 1.0,
+    ) -> None:
         self.table_name = table_name
+        self.actor_index = actor_index
+        self.action_index = action_index
         self.client = boto3.resource("dynamodb", region_name=region)
         self.table = self.client.Table(table_name)
+        self.batch_size = min(batch_size, self.MAX_BATCH_SIZE)
+        self.linger_seconds = linger_seconds
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.read_flush_timeout = read_flush_timeout
+        self.dropped_events = 0
+        # Events enqueued and events written or dropped; the writer completes them in order
+        self._progress = threading.Condition()
+        self._enqueued = 0
+        self._completed = 0
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        if batch_writes:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                name=f"audit-writer-{table_name}",
+                daemon=True,
+            )
+            self._writer.start()
+            atexit.register(self.close)
 
     def log_event(self, event: AuditEvent) -> None:
         item = {
@@ -74,8 +335,316 @@ class DynamoDBAuditLogger:
             "metadata": event.metadata,
             "correlation_id": event.correlation_id or "",
         }
+        if self._queue is not None:
+            with self._progress:
+                self._enqueued += 1
+                self._queue.put(item)
+            return
         try:
             self.table.put_item(Item=item)
         except ClientError as exc:
             logger.error("Failed to write audit event: %s", exc)
             raise DynamoDBStoreException(str(exc)) from exc
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the events logged before this call have been written (or dropped).
+
+        Returns False if ``timeout`` seconds pass first.
+        """
+        if self._queue is None:
+            return True
+        with self._progress:
+            target = self._enqueued
+            return self._progress.wait_for(lambda: self._completed >= target, timeout)
+
+    def close(self) -> None:
+        """Flush queued events and stop the background writer."""
+        if self._queue is None or self._writer is None or not self._writer.is_alive():
+            return
+        self._queue.put(_STOP_WRITER)
+        self._writer.join()
+
+    def _run_writer(self) -> None:
+        pending = None
+        while True:
+            item = pending if pending is not None else self._queue.get()
+            pending = None
+            if item is _STOP_WRITER:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            keys = {(item["resource_id"], item["timestamp"])}
+            deadline = time.monotonic() + self.linger_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    candidate = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                # A batch may not contain the same key twice; carry it into the next batch.
+                if candidate is _STOP_WRITER or (candidate["resource_id"], candidate["timestamp"]) in keys:
+                    pending = candidate
+                    break
+                batch.append(candidate)
+                keys.add((candidate["resource_id"], candidate["timestamp"]))
+
+            try:
+                self._write_batch(batch)
+            except Exception:  # keep the writer alive; the batch is counted as dropped
+                logger.exception("Audit batch writer failed")
+                self.dropped_events += len(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                with self._progress:
+                    self._completed += len(batch)
+                    self._progress.notify_all()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        unprocessed = _batch_write(
+            self.client,
+            self.table_name,
+            [{"PutRequest": {"Item": item}} for item in batch],
+            self.max_retries,
+            self.base_backoff_seconds,
+        )
+        if unprocessed:
+            logger.error("Dropping %d audit events after %d retries", len(unprocessed), self.max_retries)
+            self.dropped_events += len(unprocessed)
+
+    def count_by_action(self, query: Optional[AuditQuery] = None) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        params = {
+            "ProjectionExpression": "#action",
+            "ExpressionAttributeNames": {"#action": "action"},
+        }
+        for item in self._iter_items(query or AuditQuery(), None, params):
+            counts[item["action"]] = counts.get(item["action"], 0) + 1
+        return counts
+
+    def _iter_matches(
+        self,
+        query: AuditQuery,
+        cursor: Optional[str],
+    ) -> Iterator[Tuple[str, AuditEvent]]:
+        # ExclusiveStartKey must hold exactly the table key plus the key of the GSI in use.
+        key_names = {"resource_id", "timestamp", self._plan(query)[0]}
+        for item in self._iter_items(query, cursor, {}):
+            key = {name: item[name] for name in key_names if name}
+            yield _encode_key(key), self._item_to_event(item)
+
+    def _iter_items(
+        self,
+        query: AuditQuery,
+        cursor: Optional[str],
+        params: Dict[str, Any],
+    ) -> Iterator[Dict[str, Any]]:
+        if not self.flush(timeout=self.read_flush_timeout):
+            logger.warning("Reading %s before all queued audit events were written", self.table_name)
+        key_attribute, request = self._plan(query)
+        operation = self.table.query if key_attribute else self.table.scan
+        request.update(params)
+        if cursor:
+            request["ExclusiveStartKey"] = _decode_key(cursor)
+        while True:
+            try:
+                response = operation(**request)
+            except ClientError as exc:
+                logger.error("Failed to query audit events: %s", exc)
+                raise DynamoDBStoreException(str(exc)) from exc
+            yield from response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            request["ExclusiveStartKey"] = last_key
+
+    def _plan(self, query: AuditQuery) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Pick the narrowest key condition for ``query``; leftover filters become a FilterExpression.
+
+        Returns the partition attribute used for the key condition (None means scan)
+        together with the request parameters.
+        """
+        request: Dict[str, Any] = {}
+        key_attribute: Optional[str] = None
+        for attribute, value, index_name in (
+            ("resource_id", query.resource_id, None),
+            ("actor_id", query.actor_id, self.actor_index),
+            ("action", query.action, self.action_index),
+        ):
+            if value is not None:
+                key_attribute = attribute
+                if index_name:
+                    request["IndexName"] = index_name
+                break
+
+        filters = [
+            Attr(attribute).eq(value)
+            for attribute, value in (("actor_id", query.actor_id), ("action", query.action))
+            if value is not None and attribute != key_attribute
+        ]
+        if key_attribute is None:
+            time_filter = _time_range(Attr("timestamp"), query.start, query.end)
+            if time_filter is not None:
+                filters.append(time_filter)
+        else:
+            key = Key(key_attribute).eq(getattr(query, key_attribute))
+            time_range = _time_range(Key("timestamp"), query.start, query.end)
+            request["KeyConditionExpression"] = key & time_range if time_range is not None else key
+        if filters:
+            combined = filters[0]
+            for condition in filters[1:]:
+                combined = combined & condition
+            request["FilterExpression"] = combined
+        return key_attribute, request
+
+    @staticmethod
+    def _item_to_event(item: Dict[str, Any]) -> AuditEvent:
+        return AuditEvent(
+            actor_id=item["actor_id"],
+            action=item["action"],
+            resource_id=item["resource_id"],
+            metadata=item.get("metadata", {}),
+            timestamp=item["timestamp"],
+            correlation_id=item.get("correlation_id") or None,
+        )
+
+
+class DynamoDBConsentStore(ConsentStore):
+    """Persist consent decisions in DynamoDB.
+
+    The table is keyed on ``scope`` (hash: encounter id or ``patient:<id>``) and
+    ``consent_type`` (range), so each item holds the latest decision and a lookup is a
+    single ``GetItem``. The manager's index is not seeded from the table; records from
+    other workers are fetched on first use, and cached entries are re-read after
+    ``index_ttl`` seconds so revocations written by other workers take effect.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        region: str = "us-east-1",
+        index_ttl: float = 5.0,
+        max_retries: int = 5,
+        base_backoff_seconds: float = 0.05,
+    ) -> None:
+        self.table_name = table_name
+        self.index_ttl = index_ttl
+        self.max_retries = max_retries
+        self.base_backoff_seconds = base_backoff_seconds
+        self.client = boto3.resource("dynamodb", region_name=region)
+        self.table = self.client.Table(table_name)
+
+    def save_many(self, records: List[ConsentRecord]) -> None:
+        requests = [
+            {"PutRequest": {"Item": {"scope": record.scope, **self._record_to_item(record)}}}
+            for record in records
+        ]
+        unprocessed = _batch_write(
+            self.client, self.table_name, requests, self.max_retries, self.base_backoff_seconds
+        )
+        if unprocessed:
+            logger.error("Failed to store %d consent records after %d retries", len(unprocessed), self.max_retries)
+            raise DynamoDBStoreException(f"{len(unprocessed)} consent records were not written")
+
+    def lookup(self, scope: str, consent_type: ConsentType) -> Optional[ConsentRecord]:
+        try:
+            response = self.table.get_item(Key={"scope": scope, "consent_type": consent_type.value})
+        except ClientError as exc:
+            logger.error("Failed to read consent for %s: %s", scope, exc)
+            raise DynamoDBStoreException(str(exc)) from exc
+        item = response.get("Item")
+        return ConsentRecord.from_dict(item) if item else None
+
+    @staticmethod
+    def _record_to_item(record: ConsentRecord) -> Dict[str, Any]:
+        item = record.to_dict()
+        if item["encounter_id"] is None:
+            del item["encounter_id"]
+        return item
+
+
+_STOP_WRITER = object()
+
+_RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "ProvisionedThroughputExceededException",
+        "ThrottlingException",
+        "RequestLimitExceeded",
+        "InternalServerError",
+        "ServiceUnavailable",
+    }
+)
+
+
+def _is_retryable(exc: ClientError) -> bool:
+    """Throttling and server-side errors; anything else fails the same way on retry."""
+    code = exc.response.get("Error", {}).get("Code")
+    status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    return code in _RETRYABLE_ERROR_CODES or status >= 500
+
+
+def _batch_write(
+    client: Any,
+    table_name: str,
+    requests: List[Dict[str, Any]],
+    max_retries: int,
+    base_backoff_seconds: float,
+) -> List[Dict[str, Any]]:
+    """Send ``requests`` as ``BatchWriteItem`` calls of at most 25 items.
+
+    Unprocessed items and throttled or server-failed calls are retried up to
+    ``max_retries`` times with exponential backoff; a chunk that fails with any other
+    error is not retried. Returns the requests that were not written.
+    """
+    remaining: List[Dict[str, Any]] = []
+    for start in range(0, len(requests), MAX_BATCH_WRITE_ITEMS):
+        chunk = requests[start:start + MAX_BATCH_WRITE_ITEMS]
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(base_backoff_seconds * (2 ** (attempt - 1)))
+            try:
+                response = client.batch_write_item(RequestItems={table_name: chunk})
+            except ClientError as exc:
+                if not _is_retryable(exc):
+                    logger.error("Batch write to %s failed: %s", table_name, exc)
+                    break
+                logger.warning("Batch write to %s failed (attempt %d): %s", table_name, attempt + 1, exc)
+                continue
+            chunk = response.get("UnprocessedItems", {}).get(table_name, [])
+            if not chunk:
+                break
+        remaining.extend(chunk)
+    return remaining
+
+
+def _encode_key(key: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode("utf-8")).decode("ascii")
+
+
+def _decode_key(cursor: str) -> Dict[str, Any]:
+    return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+
+
+def _projection_expression(attributes: Tuple[str, ...]) -> Dict[str, Any]:
+    names = {f"#p{index}": attribute for index, attribute in enumerate(attributes)}
+    return {
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+
+
+def _summary(item: Dict[str, Any]) -> EncounterSummary:
+    return EncounterSummary(**{attribute: item[attribute] for attribute in DynamoDBClinicalRecordStore.SUMMARY_ATTRIBUTES})
+
+
+def _time_range(attribute: Any, start: Optional[str], end: Optional[str]) -> Any:
+    if start is not None and end is not None:
+        return attribute.between(start, end)
+    if start is not None:
+        return attribute.gte(start)
+    if end is not None:
+        return attribute.lte(end)
+    return None
@@ -0,0 +1,173 @@
+"""Write-ahead log of in-flight encounters for crash recovery."""
+
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.core.clinical import ClinicalObservation, EncounterContext, PatientProfile
+from src.core.serialization import dumps, to_primitive
+
+logger = logging.getLogger(__name__)
+
+# Frame: record type, payload length, CRC-32 of the payload
+_FRAME = struct.Struct(">BII")
+_ID_LENGTH = struct.Struct(">H")
+_TEXT_LENGTH = struct.Struct(">I")
+
+OPEN, CHUNK, CLOSE = 1, 2, 3
+
+
+class EncounterWALException(Exception):
+    """Base exception for the encounter write-ahead log."""
+
+
+class EncounterWAL:
+    """Append-only binary log of open encounters.
+
+    ``open`` records the encounter header, ``append_chunk`` each transcript chunk with
+    the observations extracted from it (``None`` when extraction was deferred), and
+    ``close`` marks the encounter finished.
+    Every record is a CRC-checked frame written with a single ``write`` and flushed to
+    the OS, so a worker crash loses at most the frame being written; set ``sync`` to
+    also fsync each frame against host failures.
+
+    ``recover`` replays the log into the encounters that were never closed and drops
+    a torn tail. Once the log exceeds ``compact_bytes`` it is rewritten on close to
+    hold only the frames of still-open encounters.
+    """
+
+    def __init__(self, path: str = "data/encounters.wal", sync: bool = False, compact_bytes: int = 16 * 1024 * 1024) -> None:
+        self.path = path
+        self.sync = sync
+        self.compact_bytes = compact_bytes
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # encounter_id -> byte ranges of its frames, for compaction
+        self._frames: Dict[str, List[Tuple[int, int]]] = {}
+        self._handle = open(path, "ab")
+
+    def open(self, encounter: EncounterContext) -> None:
+        header = {
+            "patient_profile": to_primitive(encounter.patient_profile),
+            "clinician_id": encounter.clinician_id,
+            "created_at": encounter.created_at,
+        }
+        self._append(OPEN, encounter.encounter_id, _encode_id(encounter.encounter_id) + dumps(header))
+
+    def append_chunk(
+        self, encounter_id: str, chunk: str, observations: Optional[List[ClinicalObservation]]
+    ) -> None:
+        text = chunk.encode("utf-8")
+        if observations is not None:
+            # The frame carries the chunk, so spanned observations need not repeat its text
+            observations = [replace(obs, value="") if obs.span is not None else obs for obs in observations]
+        payload = _encode_id(encounter_id) + _TEXT_LENGTH.pack(len(text)) + text + dumps(to_primitive(observations))
+        self._append(CHUNK, encounter_id, payload)
+
+    def close(self, encounter_id: str) -> None:
+        self._append(CLOSE, encounter_id, _encode_id(encounter_id))
+        with self._lock:
+            self._frames.pop(encounter_id, None)
+            if self._handle.tell() >= self.compact_bytes:
+                self._compact()
+
+    def recover(self) -> List[EncounterContext]:
+        """Rebuild every encounter that was opened but not closed, in opening order."""
+        with self._lock:
+            encounters: Dict[str, EncounterContext] = {}
+            frames: Dict[str, List[Tuple[int, int]]] = {}
+            with open(self.path, "rb") as handle:
+                data = handle.read()
+            offset = 0
+            while offset + _FRAME.size <= len(data):
+                kind, length, checksum = _FRAME.unpack_from(data, offset)
+                start, end = offset + _FRAME.size, offset + _FRAME.size + length
+                payload = data[start:end]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                encounter_id, body = _decode_id(payload)
+                if kind == OPEN:
+                    encounters[encounter_id] = _open_encounter(encounter_id, json.loads(body))
+                    frames[encounter_id] = [(offset, end)]
+                elif kind == CHUNK and encounter_id in encounters:
+                    (text_length,) = _TEXT_LENGTH.unpack_from(body)
+                    text_end = _TEXT_LENGTH.size + text_length
+                    encounter = encounters[encounter_id]
+                    encounter.transcript.append(body[_TEXT_LENGTH.size:text_end].decode("utf-8"))
+                    observations = json.loads(body[text_end:])
+                    if observations is None:
+                        encounter.deferred_chunks.append(len(encounter.transcript) - 1)
+                    else:
+                        for item in observations:
+                            observation = ClinicalObservation.from_dict(item)
+                            if observation.span is not None and not observation.value:
+                                observation.value = observation.resolve(encounter.transcript)
+                            encounter.observations.append(observation)
+                    frames[encounter_id].append((offset, end))
+                elif kind == CLOSE:
+                    encounters.pop(encounter_id, None)
+                    frames.pop(encounter_id, None)
+                offset = end
+            if offset < len(data):
+                logger.warning("Truncating %d bytes of torn or corrupt WAL tail in %s", len(data) - offset, self.path)
+                self._handle.truncate(offset)
+                self._handle.seek(offset)
+            self._frames = frames
+            return list(encounters.values())
+
+    def _append(self, kind: int, encounter_id: str, payload: bytes) -> None:
+        frame = _FRAME.pack(kind, len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            start = self._handle.tell()
+            self._handle.write(frame)
+            self._handle.flush()
+            if self.sync:
+                os.fsync(self._handle.fileno())
+            if kind != CLOSE:
+                self._frames.setdefault(encounter_id, []).append((start, start + len(frame)))
+
+    def _compact(self) -> None:
+        temp_path = self.path + ".compact"
+        frames: Dict[str, List[Tuple[int, int]]] = {}
+        with open(self.path, "rb") as source, open(temp_path, "wb") as target:
+            for encounter_id, ranges in self._frames.items():
+                for start, end in ranges:
+                    source.seek(start)
+                    position = target.tell()
+                    target.write(source.read(end - start))
+                    frames.setdefault(encounter_id, []).append((position, target.tell()))
+            target.flush()
+            os.fsync(target.fileno())
+        self._handle.close()
+        os.replace(temp_path, self.path)
+        self._handle = open(self.path, "ab")
+        self._frames = frames
+        logger.info("Compacted encounter WAL %s to %d open encounters", self.path, len(frames))
+
+
+def _encode_id(encounter_id: str) -> bytes:
+    raw = encounter_id.encode("utf-8")
+    if len(raw) > 0xFFFF:
+        raise EncounterWALException("encounter_id too long for the WAL")
+    return _ID_LENGTH.pack(len(raw)) + raw
+
+
+def _decode_id(payload: bytes) -> Tuple[str, bytes]:
+    (length,) = _ID_LENGTH.unpack_from(payload)
+    end = _ID_LENGTH.size + length
+    return payload[_ID_LENGTH.size:end].decode("utf-8"), payload[end:]
+
+
+def _open_encounter(encounter_id: str, header: dict) -> EncounterContext:
+    return EncounterContext(
+        encounter_id=encounter_id,
+        patient_profile=PatientProfile(**header["patient_profile"]),
+        clinician_id=header["clinician_id"],
+        created_at=header["created_at"],
+    )
@@ -0,0 +1,136 @@
+"""Streaming, resumable bulk export of privacy-filtered patient records."""
+
+import gzip
+import json
+import logging
+import os
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Optional
+
+from src.core.privacy import AccessRole, AccessLevel
+
+logger = logging.getLogger(__name__)
+
+
+class ExportException(Exception):
+    """Base exception for bulk exports."""
+
+
+@dataclass
+class ExportResult:
+    output_path: str
+    records: int
+
+
+class PatientExporter:
+    """Export every patient in a record store as NDJSON, one page at a time.
+
+    The store's ``iter_export_pages`` supplies pages of records, which are projected
+    through the store policy's compiled plan for the export role. The exporter then
+    appends them to the output (a gzip member per page when compressing), so memory
+    stays bounded by ``page_size``. After each page the output is fsynced and a
+    checkpoint is written with the store cursor and output offset. Re-running with the
+    same paths truncates any partial page and resumes after the last committed page.
+    """
+
+    def __init__(self, record_store: Any, page_size: int = 500) -> None:
+        self.record_store = record_store
+        self.page_size = page_size
+
+    def export(
+        self,
+        output_path: str,
+        role: AccessRole,
+        access_level: AccessLevel = AccessLevel.READ,
+        checkpoint_path: Optional[str] = None,
+        compress: Optional[bool] = None,
+    ) -> ExportResult:
+        checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+        compress = output_path.endswith(".gz") if compress is None else compress
+        plan = self.record_store.privacy_policy.plan(role, access_level)
+        keys = tuple(self.record_store.EXPORT_KEYS)
+        fields = self.record_store.EXPORT_FIELDS
+
+        checkpoint = self._load_checkpoint(checkpoint_path, output_path, role, access_level)
+        cursor = checkpoint["cursor"] if checkpoint else None
+        records = checkpoint["records"] if checkpoint else 0
+        offset = checkpoint["offset"] if checkpoint else 0
+        if checkpoint and checkpoint["completed"]:
+            os.remove(checkpoint_path)
+            return ExportResult(output_path=output_path, records=records)
+        if checkpoint:
+            logger.info("Resuming export to %s after %d records", output_path, records)
+
+        with open(output_path, "r+b" if checkpoint else "wb") as handle:
+            handle.truncate(offset)
+            handle.seek(offset)
+            for page, next_cursor in self.record_store.iter_export_pages(
+                role, access_level, cursor=cursor, page_size=self.page_size
+            ):
+                lines = "".join(
+                    json.dumps(record, default=_json_default, separators=(",", ":")) + "\n"
+                    for record in plan.project_many(page, fields, keep=keys)
+                ).encode("utf-8")
+                handle.write(gzip.compress(lines) if compress else lines)
+                handle.flush()
+                os.fsync(handle.fileno())
+                records += len(page)
+                cursor = next_cursor
+                self._save_checkpoint(
+                    checkpoint_path,
+                    {
+                        "output_path": output_path,
+                        "role": role.value,
+                        "access_level": access_level.value,
+                        "cursor": cursor,
+                        "records": records,
+                        "offset": handle.tell(),
+                        "completed": cursor is None,
+                    },
+                )
+                if cursor is None:
+                    break
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        logger.info("Exported %d records to %s", records, output_path)
+        return ExportResult(output_path=output_path, records=records)
+
+    @staticmethod
+    def _load_checkpoint(
+        checkpoint_path: str,
+        output_path: str,
+        role: AccessRole,
+        access_level: AccessLevel,
+    ) -> Optional[dict]:
+        if not os.path.exists(checkpoint_path):
+            return None
+        with open(checkpoint_path, "r", encoding="utf-8") as handle:
+            checkpoint = json.load(handle)
+        if (
+            checkpoint.get("output_path") != output_path
+            or checkpoint.get("role") != role.value
+            or checkpoint.get("access_level") != access_level.value
+        ):
+            raise ExportException(f"Checkpoint {checkpoint_path} belongs to a different export")
+        if not os.path.exists(output_path):
+            raise ExportException(f"Checkpoint {checkpoint_path} found but {output_path} is missing")
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+        temp_path = checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(checkpoint, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, checkpoint_path)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,75 @@
+"""Provider registry resolved lazily from ``AI_MED_AGENT_*`` settings.
+
+Each selector environment variable maps provider names to ``"module:Class"``
+paths. A provider's module is only imported when that provider is selected, so a
+deployment running every provider locally never imports boto3 or the AWS clients.
+"""
+
+import importlib
+import logging
+import os
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS: Dict[str, Dict[str, str]] = {
+    "AI_MED_AGENT_NLP_PROVIDER": {
+        "local": "src.clients.clinical_services:ClinicalNLPService",
+        "bedrock": "src.clients.aws_bedrock:BedrockClinicalNLPService",
+    },
+    "AI_MED_AGENT_GUIDELINE_PROVIDER": {
+        "local": "src.clients.clinical_services:GuidelineService",
+        "bedrock": "src.clients.aws_bedrock:BedrockGuidelineService",
+    },
+    "AI_MED_AGENT_RECORD_STORE": {
+        "local": "src.clients.record_store:ClinicalRecordStore",
+        "sqlite": "src.clients.sqlite_store:SQLiteClinicalRecordStore",
+        "dynamodb": "src.clients.dynamodb_store:DynamoDBClinicalRecordStore",
+    },
+    "AI_MED_AGENT_CONSENT_STORE": {
+        "memory": "src.core.consent:ConsentStore",
+        "file": "src.core.consent:FileConsentStore",
+        "dynamodb": "src.clients.dynamodb_store:DynamoDBConsentStore",
+    },
+    "AI_MED_AGENT_AUDIT_LOGGER": {
+        "file": "src.core.audit:AuditLogger",
+        "dynamodb": "src.clients.dynamodb_store:DynamoDBAuditLogger",
+    },
+    "AI_MED_AGENT_TRANSCRIBE_PROVIDER": {
+        "aws": "src.clients.aws_transcribe:AWSTranscribeService",
+    },
+}
+
+_loaded: Dict[str, type] = {}
+
+
+class ProviderException(Exception):
+    """Raised when a provider cannot be resolved."""
+
+
+def register_provider(variable: str, name: str, target: str) -> None:
+    """Make ``name`` selectable through ``variable``; ``target`` is ``"module:Class"``."""
+    PROVIDERS.setdefault(variable, {})[name.lower()] = target
+    _loaded.pop(target, None)
+
+
+def selected_provider(variable: str, default: str) -> str:
+    """The provider name configured in ``variable``, or ``default`` if it is unset or unknown."""
+    name = os.getenv(variable, default).lower()
+    if name != default and name not in PROVIDERS.get(variable, {}):
+        logger.warning("Unknown provider %r for %s; using %r", name, variable, default)
+        return default
+    return name
+
+
+def load_provider(variable: str, name: str) -> type:
+    """Import and return the class registered as ``name`` for ``variable``."""
+    try:
+        target = PROVIDERS[variable][name]
+    except KeyError:
+        raise ProviderException(f"No provider {name!r} registered for {variable}") from None
+    provider = _loaded.get(target)
+    if provider is None:
+        module_name, _, attribute = target.partition(":")
+        provider = _loaded[target] = getattr(importlib.import_module(module_name), attribute)
+    return provider
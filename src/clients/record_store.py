@@ -1,25 +1,167 @@
 """Clinical record storage with privacy enforcement."""
 
-from typing import Dict, Any, List
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
 from src.core.clinical import EncounterContext
 from src.core.emergency import EmergencyEvent
-from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel
+from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel, ProjectionPlan
+from src.core.serialization import EncounterDocument
+
+
+class FrozenList(list):
+    """List that rejects mutation; still compares and JSON-serializes like a list."""
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("patient views are read-only")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __reduce__(self) -> Tuple[type, Tuple[list]]:
+        # The default list-subclass reduce restores items with append
+        return FrozenList, (list(self),)
+
+
+class FrozenDict(dict):
+    """Dict that rejects mutation; still compares and JSON-serializes like a dict."""
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("patient views are read-only")
+
+    __setitem__ = __delitem__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+    __ior__ = _immutable
+
+    def __reduce__(self) -> Tuple[type, Tuple[dict]]:
+        # The default dict-subclass reduce restores items with __setitem__
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Return a deep, read-only copy of a JSON-like value; frozen values are shared as-is."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class EncounterSummary:
+    """Key attributes of a stored encounter, returned by every store's timeline queries."""
+
+    encounter_id: str
+    patient_id: str
+    clinician_id: str
+    created_at: str
+
+    @classmethod
+    def of(cls, encounter: EncounterContext) -> "EncounterSummary":
+        return cls(
+            encounter_id=encounter.encounter_id,
+            patient_id=encounter.patient_profile.patient_id,
+            clinician_id=encounter.clinician_id,
+            created_at=encounter.created_at,
+        )
 
 
 class ClinicalRecordStore:
-    """In-memory clinical record store with read-only views."""
+    """In-memory clinical record store with read-only views.
+
+    Patient views are materialized per (role, access level) on write: ``store_encounter``
+    and ``record_emergency_event`` update the patient's profile snapshot and emergency
+    summaries incrementally and re-project the views, so ``get_patient_view`` is a single
+    dict lookup returning a shared, immutable ``FrozenDict``.
+
+    Each patient's encounters are kept ordered by ``created_at`` alongside a parallel
+    list of timestamps, so range and most-recent queries are binary searches. Like
+    every store, they return ``EncounterSummary`` records.
+
+    Views are projected through the policy's compiled ``ProjectionPlan``s and tagged
+    with the policy version; a policy change re-materializes each patient on next read.
+
+    Encounters are finalized in parallel, so every read and write of the timeline,
+    profiles and views holds ``_records_lock``; ``_materialize`` expects it held.
+    """
+
+    EXPORT_KEYS = ("patient_id",)
+    EXPORT_FIELDS = {
+        DataResource.LAB_REPORTS: "lab_reports",
+        DataResource.MEDICATIONS: "medications",
+        DataResource.APPOINTMENTS: "appointments",
+        DataResource.INSURANCE: "insurance",
+        DataResource.EMERGENCY_EVENTS: "emergency_events",
+    }
 
     def __init__(self, privacy_policy: PrivacyPolicy) -> None:
         self.privacy_policy = privacy_policy
+        self._records_lock = threading.Lock()
         self._encounters: Dict[str, List[EncounterContext]] = {}
+        self._timeline: Dict[str, List[str]] = {}
         self._emergency_events: Dict[str, List[EmergencyEvent]] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._emergency_views: Dict[str, FrozenList] = {}
+        self._views: Dict[Tuple[str, AccessRole, AccessLevel], FrozenDict] = {}
+        self._views_version = privacy_policy.version
 
-    def store_encounter(self, encounter: EncounterContext) -> None:
-        self._encounters.setdefault(encounter.patient_profile.patient_id, []).append(encounter)
+    def store_encounter(self, encounter: EncounterContext, document: Optional[EncounterDocument] = None) -> None:
+        """Store ``encounter``; persistent stores write ``document``'s encoding when given."""
+        patient_id = encounter.patient_profile.patient_id
+        profile = {
+            "medications": freeze(encounter.patient_profile.medications),
+            "insurance": freeze(encounter.patient_profile.insurance),
+        }
+        with self._records_lock:
+            timeline = self._timeline.setdefault(patient_id, [])
+            position = bisect_right(timeline, encounter.created_at)
+            timeline.insert(position, encounter.created_at)
+            self._encounters.setdefault(patient_id, []).insert(position, encounter)
+            if position == len(timeline) - 1:  # views show the profile of the newest encounter
+                self._profiles[patient_id] = profile
+            self._materialize(patient_id)
 
     def record_emergency_event(self, event: EmergencyEvent) -> None:
-        self._emergency_events.setdefault(event.patient_id, []).append(event)
+        summary = freeze(
+            {
+                "encounter_id": event.encounter_id,
+                "reason": event.reason,
+                "confirmed": event.confirmed,
+                "created_at": event.created_at,
+            }
+        )
+        with self._records_lock:
+            self._emergency_events.setdefault(event.patient_id, []).append(event)
+            previous = self._emergency_views.get(event.patient_id, ())
+            self._emergency_views[event.patient_id] = FrozenList((*previous, summary))
+            self._materialize(event.patient_id)
+
+    def encounters_between(
+        self,
+        patient_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[EncounterSummary]:
+        """Encounters with ``start <= created_at <= end`` (bounds inclusive), oldest first."""
+        with self._records_lock:
+            timeline = self._timeline.get(patient_id, [])
+            low = bisect_left(timeline, start) if start is not None else 0
+            high = bisect_right(timeline, end) if end is not None else len(timeline)
+            encounters = self._encounters.get(patient_id, [])[low:high]
+        return [EncounterSummary.of(encounter) for encounter in encounters]
+
+    def latest_encounters(self, patient_id: str, limit: int) -> List[EncounterSummary]:
+        """The ``limit`` most recent encounters, newest first."""
+        if limit <= 0:
+            return []
+        with self._records_lock:
+            encounters = self._encounters.get(patient_id, [])[-limit:]
+        return [EncounterSummary.of(encounter) for encounter in reversed(encounters)]
 
     def get_patient_view(
         self,
@@ -27,8 +169,66 @@ class ClinicalRecordStore:
         role: AccessRole,
         access_level: AccessLevel,
     ) -> Dict[str, Any]:
-        encounters = self._encounters.get(patient_id, [])
-        view: Dict[str, Any] = {
+        with self._records_lock:
+            self._drop_stale_views()
+            view = self._views.get((patient_id, role, access_level))
+            if view is not None:
+                return view
+            if self._materialize(patient_id):
+                return self._views[(patient_id, role, access_level)]
+        return freeze(self._empty_view(patient_id))
+
+    def iter_export_pages(
+        self,
+        role: AccessRole,
+        access_level: AccessLevel,
+        cursor: Optional[str] = None,
+        page_size: int = 500,
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Walk patients in id order, yielding ``(records, cursor)`` pages of unprojected
+        export records; the cursor is the last patient id of the page."""
+        with self._records_lock:
+            patient_ids = sorted(self._profiles)
+        position = bisect_right(patient_ids, cursor) if cursor is not None else 0
+        while position < len(patient_ids):
+            page_ids = patient_ids[position:position + page_size]
+            position += len(page_ids)
+            with self._records_lock:
+                records = [
+                    {
+                        "patient_id": patient_id,
+                        "lab_reports": [],
+                        "appointments": [],
+                        **self._profiles[patient_id],
+                        "emergency_events": self._emergency_summaries(patient_id),
+                    }
+                    for patient_id in page_ids
+                ]
+            yield records, page_ids[-1]
+
+    def _drop_stale_views(self) -> None:
+        if self._views_version != self.privacy_policy.version:
+            self._views = {}
+            self._views_version = self.privacy_policy.version
+
+    def _materialize(self, patient_id: str) -> bool:
+        """Re-project every view of ``patient_id``; False if the patient has no records."""
+        self._drop_stale_views()
+        profile = self._latest_profile(patient_id)
+        if profile is None:
+            return False
+        emergency_events = self._emergency_summaries(patient_id)
+        for role in AccessRole:
+            for access_level in AccessLevel:
+                plan = self.privacy_policy.plan(role, access_level)
+                self._views[(patient_id, role, access_level)] = freeze(
+                    self._build_view(patient_id, plan, profile, emergency_events)
+                )
+        return True
+
+    @staticmethod
+    def _empty_view(patient_id: str) -> Dict[str, Any]:
+        return {
             "patient_id": patient_id,
             "lab_reports": [],
             "medications": [],
@@ -37,32 +237,35 @@ class ClinicalRecordStore:
             "emergency_events": [],
         }
 
-        if not encounters:
-            return view
-
-        profile = encounters[-1].patient_profile
+    def _build_view(
+        self,
+        patient_id: str,
+        plan: ProjectionPlan,
+        profile: Dict[str, Any],
+        emergency_events: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        view = self._empty_view(patient_id)
 
-        if self.privacy_policy.can_access(role, DataResource.MEDICATIONS, access_level):
-            view["medications"] = profile.medications
+        if plan.allows(DataResource.MEDICATIONS):
+            view["medications"] = profile["medications"]
 
-        if self.privacy_policy.can_access(role, DataResource.INSURANCE, access_level):
-            view["insurance"] = profile.insurance
+        if plan.allows(DataResource.INSURANCE):
+            view["insurance"] = profile["insurance"]
 
-        if self.privacy_policy.can_access(role, DataResource.LAB_REPORTS, access_level):
+        if plan.allows(DataResource.LAB_REPORTS):
             view["lab_reports"] = []
 
-        if self.privacy_policy.can_access(role, DataResource.APPOINTMENTS, access_level):
+        if plan.allows(DataResource.APPOINTMENTS):
             view["appointments"] = []
 
-        if self.privacy_policy.can_access(role, DataResource.EMERGENCY_EVENTS, access_level):
-            view["emergency_events"] = [
-                {
-                    "encounter_id": event.encounter_id,
-                    "reason": event.reason,
-                    "confirmed": event.confirmed,
-                    "created_at": event.created_at,
-                }
-                for event in self._emergency_events.get(patient_id, [])
-            ]
+        if plan.allows(DataResource.EMERGENCY_EVENTS):
+            view["emergency_events"] = emergency_events
 
         return view
+
+    def _latest_profile(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        """Profile fields exposed by patient views, taken from the latest encounter."""
+        return self._profiles.get(patient_id)
+
+    def _emergency_summaries(self, patient_id: str) -> List[Dict[str, Any]]:
+        return self._emergency_views.get(patient_id, FrozenList())
@@ -0,0 +1,291 @@
+"""Embedded SQLite persistence for encounters and emergency events."""
+
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.clinical import EncounterContext
+from src.core.emergency import EmergencyEvent
+from src.core.privacy import PrivacyPolicy, AccessRole, AccessLevel
+from src.core.serialization import EncounterDocument
+from src.clients.record_store import ClinicalRecordStore, EncounterSummary
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS encounters (
+    encounter_id TEXT PRIMARY KEY,
+    patient_id TEXT NOT NULL,
+    clinician_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    medications TEXT NOT NULL,
+    insurance TEXT,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_encounters_patient_created ON encounters (patient_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_encounters_clinician_created ON encounters (clinician_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_encounters_created ON encounters (created_at);
+CREATE TABLE IF NOT EXISTS emergency_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    encounter_id TEXT NOT NULL,
+    patient_id TEXT NOT NULL,
+    initiated_by TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    confirmed INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_emergency_patient_created ON emergency_events (patient_id, created_at);
+"""
+
+
+class SQLiteStoreException(Exception):
+    """Base exception for the SQLite record store."""
+
+
+class SQLiteClinicalRecordStore(ClinicalRecordStore):
+    """Durable single-file record store for deployments without DynamoDB.
+
+    Encounters are indexed on patient, clinician and ``created_at``. The profile
+    fields that patient views expose live in their own columns, so views are answered
+    from the ``(patient_id, created_at)`` index without inflating the compressed
+    encounter payload (SOAP note, recommendations, observations, transcript).
+
+    Like the in-memory store, writes re-materialize the patient's read-only views,
+    so repeat reads are a dict lookup. Views read before another connection commits
+    are dropped on the next read (``PRAGMA data_version``).
+    """
+
+    def __init__(self, db_path: str = "data/ai-med-agent.db", privacy_policy: Optional[PrivacyPolicy] = None) -> None:
+        super().__init__(privacy_policy or PrivacyPolicy())
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._data_version = self._read("PRAGMA data_version", [])[0][0]
+
+    def store_encounter(self, encounter: EncounterContext, document: Optional[EncounterDocument] = None) -> None:
+        self._write_encounters([self._encounter_row(encounter, document or EncounterDocument(encounter))])
+        self._rematerialize([encounter.patient_profile.patient_id])
+
+    def store_encounters(self, encounters: Iterable[EncounterContext]) -> None:
+        """Write a batch of encounters in a single transaction."""
+        encounters = list(encounters)
+        self._write_encounters([self._encounter_row(encounter, EncounterDocument(encounter)) for encounter in encounters])
+        self._rematerialize({encounter.patient_profile.patient_id for encounter in encounters})
+
+    def _write_encounters(self, rows: List[tuple]) -> None:
+        self._write_many(
+            "INSERT OR REPLACE INTO encounters "
+            "(encounter_id, patient_id, clinician_id, created_at, medications, insurance, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def record_emergency_event(self, event: EmergencyEvent) -> None:
+        self._write_many(
+            "INSERT INTO emergency_events "
+            "(encounter_id, patient_id, initiated_by, reason, confirmed, created_at, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    event.encounter_id,
+                    event.patient_id,
+                    event.initiated_by,
+                    event.reason,
+                    int(event.confirmed),
+                    event.created_at,
+                    json.dumps(event.metadata),
+                )
+            ],
+        )
+        self._rematerialize([event.patient_id])
+
+    def iter_encounter_summaries(
+        self,
+        patient_id: Optional[str] = None,
+        clinician_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True,
+    ) -> Iterator[EncounterSummary]:
+        """Stream encounter key columns in ``created_at`` order straight from the indexes."""
+        clauses, params = [], []
+        for column, value in (("patient_id", patient_id), ("clinician_id", clinician_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("created_at >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("created_at <= ?")
+            params.append(end)
+        sql = "SELECT encounter_id, patient_id, clinician_id, created_at FROM encounters"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC" if newest_first else " ORDER BY created_at"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for row in self._read(sql, params):
+            yield EncounterSummary(*row)
+
+    def encounters_between(
+        self,
+        patient_id: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[EncounterSummary]:
+        """Encounter summaries with ``start <= created_at <= end``, oldest first."""
+        return list(self.iter_encounter_summaries(patient_id=patient_id, start=start, end=end, newest_first=False))
+
+    def latest_encounters(self, patient_id: str, limit: int) -> List[EncounterSummary]:
+        """The ``limit`` most recent encounter summaries, newest first."""
+        if limit <= 0:
+            return []
+        return list(self.iter_encounter_summaries(patient_id=patient_id, limit=limit))
+
+    def iter_export_pages(
+        self,
+        role: AccessRole,
+        access_level: AccessLevel,
+        cursor: Optional[str] = None,
+        page_size: int = 500,
+    ) -> Iterator[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Walk patients in id order with two indexed queries per page of patients."""
+        while True:
+            profiles = self._read(
+                "SELECT e.patient_id, e.medications, e.insurance FROM encounters e "
+                "JOIN (SELECT patient_id, MAX(created_at) AS latest FROM encounters "
+                "      WHERE patient_id > ? GROUP BY patient_id ORDER BY patient_id LIMIT ?) page "
+                "ON e.patient_id = page.patient_id AND e.created_at = page.latest "
+                "ORDER BY e.patient_id",
+                [cursor if cursor is not None else "", page_size],
+            )
+            if not profiles:
+                return
+            records: Dict[str, Dict[str, Any]] = {}
+            for patient_id, medications, insurance in profiles:
+                records[patient_id] = {
+                    "patient_id": patient_id,
+                    "lab_reports": [],
+                    "appointments": [],
+                    "medications": json.loads(medications),
+                    "insurance": json.loads(insurance) if insurance is not None else None,
+                    "emergency_events": [],
+                }
+            placeholders = ", ".join("?" for _ in records)
+            events = self._read(
+                "SELECT patient_id, encounter_id, reason, confirmed, created_at FROM emergency_events "
+                f"WHERE patient_id IN ({placeholders}) ORDER BY created_at, id",
+                list(records),
+            )
+            for patient_id, encounter_id, reason, confirmed, created_at in events:
+                records[patient_id]["emergency_events"].append(
+                    {
+                        "encounter_id": encounter_id,
+                        "reason": reason,
+                        "confirmed": bool(confirmed),
+                        "created_at": created_at,
+                    }
+                )
+            cursor = profiles[-1][0]
+            yield list(records.values()), cursor
+
+    def get_encounter_payload(self, encounter_id: str) -> Optional[Dict[str, Any]]:
+        """Inflate the full stored payload of a single encounter."""
+        rows = self._read("SELECT payload FROM encounters WHERE encounter_id = ?", [encounter_id])
+        if not rows:
+            return None
+        return json.loads(zlib.decompress(rows[0][0]))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _rematerialize(self, patient_ids: Iterable[str]) -> None:
+        with self._records_lock:
+            for patient_id in patient_ids:
+                self._materialize(patient_id)
+
+    def _drop_stale_views(self) -> None:
+        super()._drop_stale_views()
+        data_version = self._read("PRAGMA data_version", [])[0][0]
+        if data_version != self._data_version:
+            self._views = {}
+            self._data_version = data_version
+
+    def _latest_profile(self, patient_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._read(
+            "SELECT medications, insurance FROM encounters "
+            "WHERE patient_id = ? ORDER BY created_at DESC LIMIT 1",
+            [patient_id],
+        )
+        if not rows:
+            return None
+        medications, insurance = rows[0]
+        return {
+            "medications": json.loads(medications),
+            "insurance": json.loads(insurance) if insurance is not None else None,
+        }
+
+    def _emergency_summaries(self, patient_id: str) -> List[Dict[str, Any]]:
+        rows = self._read(
+            "SELECT encounter_id, reason, confirmed, created_at FROM emergency_events "
+            "WHERE patient_id = ? ORDER BY created_at, id",
+            [patient_id],
+        )
+        return [
+            {
+                "encounter_id": encounter_id,
+                "reason": reason,
+                "confirmed": bool(confirmed),
+                "created_at": created_at,
+            }
+            for encounter_id, reason, confirmed, created_at in rows
+        ]
+
+    @staticmethod
+    def _encounter_row(encounter: EncounterContext, document: EncounterDocument) -> tuple:
+        profile = encounter.patient_profile
+        return (
+            encounter.encounter_id,
+            profile.patient_id,
+            encounter.clinician_id,
+            encounter.created_at,
+            json.dumps(profile.medications),
+            json.dumps(profile.insurance) if profile.insurance is not None else None,
+            zlib.compress(document.body),
+        )
+
+    def _write_many(self, sql: str, rows: List[tuple]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as exc:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                logger.error("Failed to write to %s: %s", self.db_path, exc)
+                raise SQLiteStoreException(str(exc)) from exc
+
+    def _read(self, sql: str, params: List[Any]) -> List[tuple]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as exc:
+                logger.error("Failed to read from %s: %s", self.db_path, exc)
+                raise SQLiteStoreException(str(exc)) from exc
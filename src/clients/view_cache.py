@@ -0,0 +1,154 @@
+"""Read-through cache for privacy-filtered patient views."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+from src.core.privacy import AccessRole, AccessLevel, PrivacyPolicy
+
+ViewKey = Tuple[str, AccessRole, AccessLevel]
+
+
+class PatientViewCache:
+    """Bounded TTL cache of patient views keyed by (patient_id, role, access level).
+
+    Writes that touch a patient must call ``invalidate(patient_id)``. Patients with a
+    load in flight carry a generation counter that invalidation bumps, so a view
+    fetched concurrently with a write is never stored over the newer state. Views for
+    patients with no records are cached as well (negative caching) with their own TTL.
+    Cached views are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        negative_ttl_seconds: float = 5.0,
+        max_entries: int = 1024,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # key -> (view, stored_at, expires_at)
+        self._entries: "OrderedDict[ViewKey, Tuple[Dict[str, Any], float, float]]" = OrderedDict()
+        self._keys_by_patient: Dict[str, set] = {}
+        self._inflight: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+        self._stats = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "evictions": 0,
+            "served_age_total": 0.0,
+            "served_age_max": 0.0,
+        }
+
+    def get_or_load(
+        self,
+        patient_id: str,
+        role: AccessRole,
+        access_level: AccessLevel,
+        loader: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        key = (patient_id, role, access_level)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end(key)
+                age = now - entry[1]
+                self._stats["hits"] += 1
+                if _is_empty_view(entry[0]):
+                    self._stats["negative_hits"] += 1
+                self._stats["served_age_total"] += age
+                self._stats["served_age_max"] = max(self._stats["served_age_max"], age)
+                return entry[0]
+            self._stats["misses"] += 1
+            self._inflight[patient_id] = self._inflight.get(patient_id, 0) + 1
+            generation = self._generations.get(patient_id, 0)
+
+        loaded = False
+        try:
+            view = loader()
+            loaded = True
+        finally:
+            # Check, store and drop the in-flight marker under one lock hold: once the
+            # marker is gone invalidate() stops bumping the generation, so a check made
+            # after releasing the lock could miss an invalidation and cache a stale view.
+            with self._lock:
+                if loaded and self._generations.get(patient_id, 0) == generation:
+                    self._store(key, view)
+                self._inflight[patient_id] -= 1
+                if not self._inflight[patient_id]:
+                    del self._inflight[patient_id]
+                    self._generations.pop(patient_id, None)
+        return view
+
+    def invalidate(self, patient_id: str) -> None:
+        with self._lock:
+            if patient_id in self._inflight:
+                self._generations[patient_id] = self._generations.get(patient_id, 0) + 1
+            for key in self._keys_by_patient.pop(patient_id, set()):
+                self._entries.pop(key, None)
+            self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for patient_id in self._inflight:
+                self._generations[patient_id] = self._generations.get(patient_id, 0) + 1
+            self._entries.clear()
+            self._keys_by_patient.clear()
+
+    def watch(self, policy: PrivacyPolicy) -> None:
+        """Clear the cache after every permission change of ``policy``.
+
+        The listener is a method of the cache, so watching the same policy again is a
+        no-op and the policy never holds on to whoever asked for the watch.
+        """
+        policy.add_listener(self._on_policy_change)
+
+    def _on_policy_change(self, _policy: PrivacyPolicy) -> None:
+        self.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "entries": entries,
+            "hits": stats["hits"],
+            "negative_hits": stats["negative_hits"],
+            "misses": stats["misses"],
+            "invalidations": stats["invalidations"],
+            "evictions": stats["evictions"],
+            "hit_ratio": stats["hits"] / lookups if lookups else 0.0,
+            "avg_served_age_seconds": stats["served_age_total"] / stats["hits"] if stats["hits"] else 0.0,
+            "max_served_age_seconds": stats["served_age_max"],
+        }
+
+    def _store(self, key: ViewKey, view: Dict[str, Any]) -> None:
+        ttl = self.negative_ttl_seconds if _is_empty_view(view) else self.ttl_seconds
+        if ttl <= 0:
+            return
+        stored_at = time.monotonic()
+        self._entries[key] = (view, stored_at, stored_at + ttl)
+        self._entries.move_to_end(key)
+        self._keys_by_patient.setdefault(key[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._forget_key(evicted)
+            self._stats["evictions"] += 1
+
+    def _forget_key(self, key: ViewKey) -> None:
+        keys = self._keys_by_patient.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_patient[key[0]]
+
+
+def _is_empty_view(view: Dict[str, Any]) -> bool:
+    return not any(value for name, value in view.items() if name != "patient_id")
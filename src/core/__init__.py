@@ -3,10 +3,11 @@
 from src.core.logger import setup_logger
 from src.core.state import StateManager, AgentStatus, DecisionOutcome, AgentAction
 from src.core.clinical import PatientProfile, EncounterContext, SOAPNote, ClinicalRecommendation
-from src.core.consent import ConsentManager, ConsentType
-from src.core.audit import AuditLogger, AuditEvent
-from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel
+from src.core.consent import ConsentManager, ConsentType, ConsentStore, FileConsentStore
+from src.core.audit import AuditLogger, AuditEvent, AuditQuery, AuditPage
+from src.core.privacy import PrivacyPolicy, ProjectionPlan, AccessRole, DataResource, AccessLevel
 from src.core.emergency import EmergencyEvent, EmergencyRecommendation, EmergencyManager
+from src.core.feature_flags import FeatureFlags
 
 __all__ = [
 	"setup_logger",
@@ -20,13 +21,19 @@ __all__ = [
 	"ClinicalRecommendation",
 	"ConsentManager",
 	"ConsentType",
+	"ConsentStore",
+	"FileConsentStore",
 	"AuditLogger",
 	"AuditEvent",
+	"AuditQuery",
+	"AuditPage",
 	"PrivacyPolicy",
+	"ProjectionPlan",
 	"AccessRole",
 	"DataResource",
 	"AccessLevel",
 	"EmergencyEvent",
 	"EmergencyRecommendation",
 	"EmergencyManager",
+	"FeatureFlags",
 ]
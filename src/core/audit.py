@@ -1,11 +1,16 @@
 """Audit logging utilities for clinical AI workflows."""
 
+from bisect import bisect_right
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import json
+import os
+import threading
 from pathlib import Path
 
+from src.core.compact import EpochUs, from_epoch_us, intern, to_epoch_us
+
 
 def _now() -> str:
     return datetime.utcnow().isoformat()
@@ -21,24 +26,266 @@ class AuditEvent:
     correlation_id: Optional[str] = None
 
 
+class CompactAuditEvent:
+    __slots__ = ("actor_id", "action", "resource_id", "metadata", "timestamp_us", "correlation_id")
+
+    def __init__(
+        self,
+        actor_id: str,
+        action: str,
+        resource_id: str,
+        metadata: Dict[str, Any],
+        timestamp_us: EpochUs,
+        correlation_id: Optional[str] = None,
+    ) -> None:
+        self.actor_id = intern(actor_id)
+        self.action = intern(action)
+        self.resource_id = resource_id
+        self.metadata = metadata or None  # most events carry none; share the empty case
+        self.timestamp_us = timestamp_us
+        self.correlation_id = correlation_id
+
+    @property
+    def timestamp(self) -> str:
+        return from_epoch_us(self.timestamp_us)
+
+    @classmethod
+    def from_record(cls, record: AuditEvent) -> "CompactAuditEvent":
+        return cls(
+            record.actor_id,
+            record.action,
+            record.resource_id,
+            record.metadata,
+            to_epoch_us(record.timestamp),
+            record.correlation_id,
+        )
+
+    def to_record(self) -> AuditEvent:
+        return AuditEvent(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "actor_id": self.actor_id,
+            "action": self.action,
+            "resource_id": self.resource_id,
+            "metadata": dict(self.metadata) if self.metadata else {},
+            "timestamp": self.timestamp,
+            "correlation_id": self.correlation_id,
+        }
+
+
+@dataclass
+class AuditQuery:
+    """Filters for reading audit events back; ``start``/``end`` are inclusive ISO timestamps."""
+
+    resource_id: Optional[str] = None
+    actor_id: Optional[str] = None
+    action: Optional[str] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+    def matches_keys(self, resource_id: str, actor_id: str, action: str, timestamp: str) -> bool:
+        if self.resource_id is not None and resource_id != self.resource_id:
+            return False
+        if self.actor_id is not None and actor_id != self.actor_id:
+            return False
+        if self.action is not None and action != self.action:
+            return False
+        if self.start is not None and timestamp < self.start:
+            return False
+        if self.end is not None and timestamp > self.end:
+            return False
+        return True
+
+    def matches(self, event: AuditEvent) -> bool:
+        return self.matches_keys(event.resource_id, event.actor_id, event.action, event.timestamp)
+
+
+@dataclass
+class AuditPage:
+    events: List[AuditEvent]
+    next_cursor: Optional[str] = None
+
+
 class AuditLogger:
-    """Write audit events to a JSON lines log file."""
+    """Write audit events to a JSON lines log file.
+
+    Reads are served from an offset index over the log (resource, actor, action and
+    timestamp per line) so filters are resolved without re-parsing the whole file.
+    The index is extended lazily from the last indexed byte, which keeps ``log_event``
+    a plain append and also picks up lines written by other processes. A log that was
+    rotated (a different file at the path) or truncated is re-indexed from the start.
+    Each posting list keeps the byte offsets of its lines alongside, so resuming
+    after a cursor is a binary search.
+    """
 
     def __init__(self, log_file: str = "logs/audit.log") -> None:
         self.log_file = log_file
         log_path = Path(log_file).parent
         log_path.mkdir(parents=True, exist_ok=True)
+        self._index_lock = threading.Lock()
+        self._reset_index()
 
     def log_event(self, event: AuditEvent) -> None:
         with open(self.log_file, "a", encoding="utf-8") as handle:
             handle.write(json.dumps(asdict(event)) + "\n")
 
+    # =========================================================================
+    # Read path
+    # =========================================================================
+
+    def query(self, query: AuditQuery, cursor: Optional[str] = None) -> Iterator[AuditEvent]:
+        """Stream events matching ``query`` in log order, resuming after ``cursor``."""
+        for _, event in self._iter_matches(query, cursor):
+            yield event
+
+    def query_page(
+        self,
+        query: AuditQuery,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> AuditPage:
+        """Return up to ``limit`` events plus a cursor for the next page (None when exhausted)."""
+        events: List[AuditEvent] = []
+        last_cursor: Optional[str] = None
+        for position, event in self._iter_matches(query, cursor):
+            if len(events) == limit:
+                return AuditPage(events=events, next_cursor=last_cursor)
+            events.append(event)
+            last_cursor = position
+        return AuditPage(events=events, next_cursor=None)
+
+    def count_by_action(self, query: Optional[AuditQuery] = None) -> Dict[str, int]:
+        """Count matching events per action straight from the index."""
+        query = query or AuditQuery()
+        counts: Dict[str, int] = {}
+        for entry in self._candidate_entries(query):
+            _, timestamp, resource_id, actor_id, action = entry
+            if query.matches_keys(resource_id, actor_id, action, timestamp):
+                counts[action] = counts.get(action, 0) + 1
+        return counts
+
+    def _iter_matches(
+        self,
+        query: AuditQuery,
+        cursor: Optional[str],
+    ) -> Iterator[Tuple[str, AuditEvent]]:
+        candidates = self._candidate_entries(query, after=int(cursor) if cursor else -1)
+        if not candidates:
+            return
+        with open(self.log_file, "rb") as handle:
+            for offset, timestamp, resource_id, actor_id, action in candidates:
+                if not query.matches_keys(resource_id, actor_id, action, timestamp):
+                    continue
+                handle.seek(offset)
+                yield str(offset), AuditEvent(**json.loads(handle.readline()))
+
+    def _candidate_entries(self, query: AuditQuery, after: int = -1) -> List[Tuple[int, str, str, str, str]]:
+        """Indexed lines that may match ``query``, starting after byte offset ``after``."""
+        self._refresh_index()
+        with self._index_lock:
+            keys = [
+                (name, value)
+                for name, value in (
+                    ("resource_id", query.resource_id),
+                    ("actor_id", query.actor_id),
+                    ("action", query.action),
+                )
+                if value is not None
+            ]
+            if not keys:
+                entries = self._entries[bisect_right(self._offsets, after):]
+            else:
+                key = min(keys, key=lambda key: len(self._postings.get(key, ())))
+                start = bisect_right(self._posting_offsets.get(key, []), after)
+                entries = [self._entries[i] for i in self._postings.get(key, [])[start:]]
+        if query.start is None and query.end is None:
+            return entries
+        return [
+            entry
+            for entry in entries
+            if (query.start is None or entry[1] >= query.start)
+            and (query.end is None or entry[1] <= query.end)
+        ]
+
+    def _reset_index(self) -> None:
+        self._indexed_file: Optional[Tuple[int, int]] = None
+        self._indexed_bytes = 0
+        # (offset, timestamp, resource_id, actor_id, action) in file order, and the offsets alone
+        self._entries: List[Tuple[int, str, str, str, str]] = []
+        self._offsets: List[int] = []
+        # (field, value) -> entry ids, and the offsets of those entries
+        self._postings: Dict[Tuple[str, str], List[int]] = {}
+        self._posting_offsets: Dict[Tuple[str, str], List[int]] = {}
+
+    def _refresh_index(self) -> None:
+        with self._index_lock:
+            try:
+                handle = open(self.log_file, "rb")
+            except FileNotFoundError:
+                return
+            with handle:
+                stat = os.fstat(handle.fileno())
+                identity = (stat.st_dev, stat.st_ino)
+                if identity != self._indexed_file or stat.st_size < self._indexed_bytes:
+                    self._reset_index()  # first read, rotation or truncation
+                    self._indexed_file = identity
+                if stat.st_size <= self._indexed_bytes:
+                    return
+                handle.seek(self._indexed_bytes)
+                offset = self._indexed_bytes
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break  # partial write; index it on the next refresh
+                    record = json.loads(line)
+                    entry_id = len(self._entries)
+                    self._offsets.append(offset)
+                    self._entries.append(
+                        (
+                            offset,
+                            record["timestamp"],
+                            record["resource_id"],
+                            record["actor_id"],
+                            record["action"],
+                        )
+                    )
+                    for name in ("resource_id", "actor_id", "action"):
+                        self._postings.setdefault((name, record[name]), []).append(entry_id)
+                        self._posting_offsets.setdefault((name, record[name]), []).append(offset)
+                    offset += len(line)
+                self._indexed_bytes = offset
+
 
 class InMemoryAuditLogger(AuditLogger):
-    """In-memory audit logger for testing."""
+    """In-memory audit logger for testing.
+
+    Events are held as ``CompactAuditEvent``s in ``compact_events``; ``events`` inflates
+    them back into ``AuditEvent``s on access.
+    """
 
     def __init__(self) -> None:
-        self.events = []
+        self.compact_events: List[CompactAuditEvent] = []
+
+    @property
+    def events(self) -> List[AuditEvent]:
+        return [event.to_record() for event in self.compact_events]
 
     def log_event(self, event: AuditEvent) -> None:
-        self.events.append(event)
+        self.compact_events.append(CompactAuditEvent.from_record(event))
+
+    def count_by_action(self, query: Optional[AuditQuery] = None) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for event in self.query(query or AuditQuery()):
+            counts[event.action] = counts.get(event.action, 0) + 1
+        return counts
+
+    def _iter_matches(
+        self,
+        query: AuditQuery,
+        cursor: Optional[str],
+    ) -> Iterator[Tuple[str, AuditEvent]]:
+        start = int(cursor) + 1 if cursor else 0
+        for position in range(start, len(self.compact_events)):
+            event = self.compact_events[position]
+            if query.matches(event):
+                yield str(position), event.to_record()
@@ -1,9 +1,11 @@
 """Clinical data models for the AI Med Agent."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from src.core.compact import EpochUs, from_epoch_us, intern, to_epoch_us
+
 
 def _now() -> str:
     return datetime.utcnow().isoformat()
@@ -21,13 +23,109 @@ class PatientProfile:
     insurance: Optional[Dict[str, Any]] = None
 
 
+@dataclass(frozen=True)
+class TranscriptSpan:
+    """``[start, end)`` of one transcript chunk, referenced instead of copying its text."""
+
+    chunk_index: int
+    start: int
+    end: int
+
+    def resolve(self, chunks: List[str]) -> str:
+        return chunks[self.chunk_index][self.start:self.end]
+
+
 @dataclass
 class ClinicalObservation:
+    """An extracted finding; ``span``, when set, locates ``value`` in the encounter transcript.
+
+    Spans cover whole chunks, so ``value`` is the transcript's own string rather than
+    a copy of it. Serialized forms that carry the transcript alongside may drop the
+    text; ``resolve`` reads it back from the chunks.
+    """
+
     category: str
     value: str
     source: str
     confidence: float = 0.6
     timestamp: str = field(default_factory=_now)
+    span: Optional[TranscriptSpan] = None
+
+    def resolve(self, chunks: List[str]) -> str:
+        return self.span.resolve(chunks) if self.span is not None else self.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "category": self.category,
+            "value": self.value,
+            "source": self.source,
+            "confidence": self.confidence,
+            "timestamp": self.timestamp,
+            "span": [self.span.chunk_index, self.span.start, self.span.end] if self.span else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ClinicalObservation":
+        span = data.get("span")
+        return cls(
+            category=data["category"],
+            value=data["value"],
+            source=data["source"],
+            confidence=data.get("confidence", 0.6),
+            timestamp=data["timestamp"],
+            span=TranscriptSpan(*span) if span else None,
+        )
+
+
+class CompactObservation:
+    __slots__ = ("category", "value", "source", "confidence", "timestamp_us", "span")
+
+    def __init__(
+        self,
+        category: str,
+        value: str,
+        source: str,
+        confidence: float,
+        timestamp_us: EpochUs,
+        span: Optional[TranscriptSpan] = None,
+    ) -> None:
+        self.category = intern(category)
+        self.value = value
+        self.source = intern(source)
+        self.confidence = confidence
+        self.timestamp_us = timestamp_us
+        self.span = span
+
+    @property
+    def timestamp(self) -> str:
+        return from_epoch_us(self.timestamp_us)
+
+    def resolve(self, chunks: List[str]) -> str:
+        return self.span.resolve(chunks) if self.span is not None else self.value
+
+    @classmethod
+    def from_record(cls, record: ClinicalObservation) -> "CompactObservation":
+        return cls(
+            record.category,
+            record.value,
+            record.source,
+            record.confidence,
+            to_epoch_us(record.timestamp),
+            record.span,
+        )
+
+    def to_record(self) -> ClinicalObservation:
+        return ClinicalObservation(
+            category=self.category,
+            value=self.value,
+            source=self.source,
+            confidence=self.confidence,
+            timestamp=self.timestamp,
+            span=self.span,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_record().to_dict()
 
 
 @dataclass
@@ -86,3 +184,12 @@ class EncounterContext:
     soap_note: Optional[SOAPNote] = None
     recommendations: List[ClinicalRecommendation] = field(default_factory=list)
     created_at: str = field(default_factory=_now)
+    # Transcript chunks ingested without real-time extraction, extracted at finalize
+    deferred_chunks: List[int] = field(default_factory=list)
+
+    def resolved_observations(self) -> List[ClinicalObservation]:
+        """Observations with span references replaced by the transcript text they cover."""
+        return [
+            replace(obs, value=obs.resolve(self.transcript), span=None) if obs.span is not None else obs
+            for obs in self.observations
+        ]
@@ -0,0 +1,49 @@
+"""Helpers for the compact, slotted record variants.
+
+``ClinicalObservation``, ``AuditEvent``, ``ConsentRecord`` and ``AgentAction`` each
+have a ``Compact*`` counterpart next to them for stores that hold many records. The
+variants use ``__slots__``, intern low-cardinality strings and keep timestamps as
+integer microseconds since the epoch, formatting them only on access or
+serialization; ``from_record``/``to_record`` convert losslessly. A timestamp that
+would not format back to the same string (a UTC offset, a date without a time, a
+non-ISO value) is kept as the original string instead.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from typing import Optional, Union
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Integer microseconds since the epoch, or the original string when that would be lossy
+EpochUs = Union[int, str]
+
+
+def to_epoch_us(timestamp: Optional[str]) -> Optional[EpochUs]:
+    """Naive ISO timestamp to integer microseconds since the epoch.
+
+    Anything else, or a timestamp ``from_epoch_us`` would not reproduce exactly,
+    is returned unchanged.
+    """
+    if timestamp is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return timestamp
+    if parsed.tzinfo is not None:
+        return timestamp
+    delta = parsed - _EPOCH
+    value = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return value if from_epoch_us(value) == timestamp else timestamp
+
+
+def from_epoch_us(value: Optional[EpochUs]) -> Optional[str]:
+    """Inverse of ``to_epoch_us``; yields the same string the record was built with."""
+    if value is None or isinstance(value, str):
+        return value
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
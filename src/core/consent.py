@@ -1,9 +1,16 @@
 """Consent management for clinical AI workflows."""
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from enum import Enum
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from src.core.compact import EpochUs, from_epoch_us, intern, to_epoch_us
 
 
 def _now() -> str:
@@ -18,40 +25,267 @@ class ConsentType(Enum):
 
 @dataclass
 class ConsentRecord:
+    """A consent decision; ``encounter_id=None`` is a standing patient-level consent."""
+
     patient_id: str
-    encounter_id: str
+    encounter_id: Optional[str]
     consent_type: ConsentType
     granted: bool
     actor: str
     timestamp: str = field(default_factory=_now)
 
+    @property
+    def scope(self) -> str:
+        return consent_scope(self.patient_id, self.encounter_id)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["consent_type"] = self.consent_type.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "ConsentRecord":
+        return cls(
+            patient_id=str(data["patient_id"]),
+            encounter_id=data.get("encounter_id") or None,
+            consent_type=ConsentType(data["consent_type"]),
+            granted=bool(data["granted"]),
+            actor=str(data["actor"]),
+            timestamp=str(data["timestamp"]),
+        )
+
+
+class CompactConsentRecord:
+    __slots__ = ("patient_id", "encounter_id", "consent_type", "granted", "actor", "timestamp_us")
+
+    def __init__(
+        self,
+        patient_id: str,
+        encounter_id: Optional[str],
+        consent_type: ConsentType,
+        granted: bool,
+        actor: str,
+        timestamp_us: EpochUs,
+    ) -> None:
+        self.patient_id = patient_id
+        self.encounter_id = encounter_id
+        self.consent_type = consent_type
+        self.granted = granted
+        self.actor = intern(actor)
+        self.timestamp_us = timestamp_us
+
+    @property
+    def timestamp(self) -> str:
+        return from_epoch_us(self.timestamp_us)
+
+    @classmethod
+    def from_record(cls, record: ConsentRecord) -> "CompactConsentRecord":
+        return cls(
+            record.patient_id,
+            record.encounter_id,
+            record.consent_type,
+            record.granted,
+            record.actor,
+            to_epoch_us(record.timestamp),
+        )
+
+    def to_record(self) -> ConsentRecord:
+        return ConsentRecord(
+            patient_id=self.patient_id,
+            encounter_id=self.encounter_id,
+            consent_type=self.consent_type,
+            granted=self.granted,
+            actor=self.actor,
+            timestamp=self.timestamp,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_record().to_dict()
+
+
+def consent_scope(patient_id: str, encounter_id: Optional[str]) -> str:
+    """Index scope: the encounter id, or ``patient:<id>`` for standing consents."""
+    return encounter_id if encounter_id is not None else f"patient:{patient_id}"
+
+
+class ConsentStore:
+    """Consent persistence interface; this base keeps nothing beyond the manager's index.
+
+    Stores that cannot report ``changes`` from other writers set ``index_ttl``: the
+    manager then trusts an index entry for at most that many seconds before checking
+    it again with ``lookup``.
+    """
+
+    index_ttl: Optional[float] = None
+
+    def load(self) -> Iterable[ConsentRecord]:
+        """Records to seed the manager's index with at startup."""
+        return []
+
+    def save_many(self, records: List[ConsentRecord]) -> None:
+        return None
+
+    def changes(self) -> Iterable[ConsentRecord]:
+        """Records written by other processes since the last ``load``/``changes`` call."""
+        return []
+
+    def lookup(self, scope: str, consent_type: ConsentType) -> Optional[ConsentRecord]:
+        """Latest record for ``(scope, consent_type)`` when it is not in the local index."""
+        return None
+
+
+class FileConsentStore(ConsentStore):
+    """Append consent records to a JSON lines file shared by local workers.
+
+    ``changes`` tails the file from the last read offset, so checking for records from
+    other workers costs a ``stat`` when nothing new was written.
+    """
+
+    def __init__(self, path: str = "data/consents.jsonl") -> None:
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._offset = 0
+
+    def load(self) -> Iterable[ConsentRecord]:
+        return self.changes()
+
+    def save_many(self, records: List[ConsentRecord]) -> None:
+        payload = "".join(json.dumps(record.to_dict()) + "\n" for record in records)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+    def changes(self) -> Iterable[ConsentRecord]:
+        records: List[ConsentRecord] = []
+        with self._lock:
+            if not os.path.exists(self.path) or os.path.getsize(self.path) <= self._offset:
+                return records
+            with open(self.path, "rb") as handle:
+                handle.seek(self._offset)
+                for line in handle:
+                    if not line.endswith(b"\n"):
+                        break  # partial write; picked up on the next call
+                    self._offset += len(line)
+                    records.append(ConsentRecord.from_dict(json.loads(line)))
+        return records
+
 
 class ConsentManager:
-    """Manage consent records for encounters."""
+    """Manage consent records for encounters.
+
+    Records are indexed as ``CompactConsentRecord``s by (scope, consent type) with
+    latest-wins semantics, where the scope is the encounter or, for standing consents,
+    the patient. ``has_consent`` is a dict lookup: an encounter-level record takes
+    precedence, otherwise the patient's standing consent applies. Misses fall back to
+    the ``store``, which makes consent captured by other workers visible; ``changes``
+    from the store are applied before each check so revocations written elsewhere win
+    as well. For stores with an ``index_ttl``, entries older than the TTL are re-read
+    with ``lookup``, and the stored record replaces the local one; an entry the store
+    no longer holds is dropped, so consent fails closed.
+    """
 
-    def __init__(self) -> None:
-        self._records: Dict[str, List[ConsentRecord]] = {}
+    def __init__(self, store: Optional[ConsentStore] = None) -> None:
+        self.store = store or ConsentStore()
+        self._lock = threading.Lock()
+        self._latest: Dict[Tuple[str, ConsentType], CompactConsentRecord] = {}
+        self._checked: Dict[Tuple[str, ConsentType], float] = {}
+        self._encounter_patients: Dict[str, str] = {}
+        for record in self.store.load():
+            self._index(record)
 
     def record_consent(
         self,
         patient_id: str,
-        encounter_id: str,
+        encounter_id: Optional[str],
         consent_type: ConsentType,
         granted: bool,
         actor: str,
     ) -> ConsentRecord:
-        record = ConsentRecord(
-            patient_id=patient_id,
-            encounter_id=encounter_id,
-            consent_type=consent_type,
-            granted=granted,
-            actor=actor,
-        )
-        self._records.setdefault(encounter_id, []).append(record)
+        return self.record_consents(patient_id, encounter_id, [consent_type], granted, actor)[0]
+
+    def record_consents(
+        self,
+        patient_id: str,
+        encounter_id: Optional[str],
+        consent_types: Iterable[ConsentType],
+        granted: bool,
+        actor: str,
+    ) -> List[ConsentRecord]:
+        """Record several consent decisions with a single store write."""
+        records = [
+            ConsentRecord(
+                patient_id=patient_id,
+                encounter_id=encounter_id,
+                consent_type=consent_type,
+                granted=granted,
+                actor=actor,
+            )
+            for consent_type in consent_types
+        ]
+        self.store.save_many(records)
+        for record in records:
+            self._index(record)
+        return records
+
+    def has_consent(
+        self,
+        encounter_id: str,
+        consent_type: ConsentType,
+        patient_id: Optional[str] = None,
+    ) -> bool:
+        for changed in self.store.changes():
+            self._index(changed)
+        record = self._find(encounter_id, consent_type)
+        if record is not None:
+            return record.granted
+        patient_id = patient_id or self._encounter_patients.get(encounter_id)
+        if patient_id is None:
+            return False
+        standing = self._find(consent_scope(patient_id, None), consent_type)
+        return standing.granted if standing is not None else False
+
+    def _find(self, scope: str, consent_type: ConsentType) -> Optional[CompactConsentRecord]:
+        key = (scope, consent_type)
+        record = self._latest.get(key)
+        ttl = self.store.index_ttl
+        if record is not None and (ttl is None or time.monotonic() - self._checked.get(key, 0.0) < ttl):
+            return record
+        stored = self.store.lookup(scope, consent_type)
+        with self._lock:
+            if stored is None:
+                self._latest.pop(key, None)
+                self._checked.pop(key, None)
+                return None
+            # The store holds the latest decision for the key; it replaces the local entry
+            record = self._latest[key] = CompactConsentRecord.from_record(stored)
+            self._checked[key] = time.monotonic()
+            if stored.encounter_id is not None:
+                self._encounter_patients[stored.encounter_id] = stored.patient_id
         return record
 
-    def has_consent(self, encounter_id: str, consent_type: ConsentType) -> bool:
-        for record in self._records.get(encounter_id, []):
-            if record.consent_type == consent_type and record.granted:
-                return True
-        return False
+    def _index(self, record: ConsentRecord) -> None:
+        compact = CompactConsentRecord.from_record(record)
+        with self._lock:
+            key = _keep_latest(self._latest, compact)
+            self._checked[key] = time.monotonic()
+            if record.encounter_id is not None:
+                self._encounter_patients[record.encounter_id] = record.patient_id
+
+
+def _keep_latest(
+    index: Dict[Tuple[str, ConsentType], CompactConsentRecord],
+    record: CompactConsentRecord,
+) -> Tuple[str, ConsentType]:
+    key = (consent_scope(record.patient_id, record.encounter_id), record.consent_type)
+    current = index.get(key)
+    if current is None:
+        index[key] = record
+    elif isinstance(record.timestamp_us, int) and isinstance(current.timestamp_us, int):
+        if record.timestamp_us >= current.timestamp_us:
+            index[key] = record
+    elif record.timestamp >= current.timestamp:
+        index[key] = record
+    return key
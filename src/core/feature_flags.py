@@ -0,0 +1,96 @@
+"""In-process feature flag evaluation."""
+
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flag(NamedTuple):
+    enabled: bool
+    rollout_percentage: int
+    tenants: Mapping[str, bool]
+
+
+class FeatureFlags:
+    """Evaluate feature flags against an in-memory snapshot.
+
+    A flag spec holds ``enabled``, an optional ``rollout_percentage`` (0-100) and
+    optional per-tenant overrides under ``tenants``. ``load`` accepts the local
+    ``{"flags": {...}}`` file layout, the ``{"features": {...}}`` layout from the
+    AppConfig reference, an AppConfig feature-flag definition (specs under
+    ``values``) and the document AppConfig returns for a feature-flag profile, where
+    every flag sits at the top level as ``{name: {"enabled": ...}}``. It swaps the
+    compiled snapshot in one assignment, so it can be registered as an AppConfig
+    subscriber while other threads evaluate.
+
+    ``is_enabled`` is a dict lookup plus, for partial rollouts, a CRC-32 bucket of
+    the flag name and ``key``, so the same key always lands on the same side.
+    Flags missing from the snapshot evaluate to ``default``.
+    """
+
+    def __init__(self, document: Optional[Mapping[str, Any]] = None) -> None:
+        self._flags: Dict[str, _Flag] = {}
+        if document is not None:
+            self.load(document)
+
+    @classmethod
+    def from_file(cls, path: str) -> "FeatureFlags":
+        if not Path(path).exists():
+            logger.info("Feature flag file %s not found; every flag uses its default", path)
+            return cls()
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def load(self, document: Mapping[str, Any]) -> None:
+        specs = _flag_specs(document)
+        self._flags = {
+            name: _Flag(
+                enabled=bool(spec.get("enabled", False)),
+                rollout_percentage=int(spec.get("rollout_percentage", 100)),
+                tenants={tenant: bool(value) for tenant, value in spec.get("tenants", {}).items()},
+            )
+            for name, spec in specs.items()
+        }
+        if document and not self._flags:
+            logger.warning("Feature flag document with keys %s contains no flags", sorted(document)[:10])
+        logger.info("Loaded %d feature flags", len(self._flags))
+
+    def is_enabled(
+        self,
+        name: str,
+        tenant_id: Optional[str] = None,
+        key: Optional[str] = None,
+        default: bool = True,
+    ) -> bool:
+        """Evaluate ``name`` for ``tenant_id``; ``key`` (default: the tenant) buckets rollouts."""
+        flag = self._flags.get(name)
+        if flag is None:
+            return default
+        if tenant_id is not None and tenant_id in flag.tenants:
+            return flag.tenants[tenant_id]
+        if not flag.enabled:
+            return False
+        if flag.rollout_percentage >= 100:
+            return True
+        bucket_key = key if key is not None else tenant_id or ""
+        return zlib.crc32(f"{name}:{bucket_key}".encode("utf-8")) % 100 < flag.rollout_percentage
+
+    def snapshot(self, tenant_id: Optional[str] = None) -> Dict[str, bool]:
+        """Every known flag evaluated for ``tenant_id``."""
+        return {name: self.is_enabled(name, tenant_id) for name in self._flags}
+
+
+def _flag_specs(document: Mapping[str, Any]) -> Mapping[str, Mapping[str, Any]]:
+    for section in ("values", "flags", "features"):
+        specs = document.get(section)
+        if isinstance(specs, Mapping) and all(isinstance(spec, Mapping) for spec in specs.values()):
+            return specs
+    return {
+        name: spec
+        for name, spec in document.items()
+        if isinstance(spec, Mapping) and "enabled" in spec
+    }
@@ -1,7 +1,9 @@
 """Privacy and access control policies for clinical data."""
 
+import threading
+from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, Set
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Set, Tuple
 
 
 class AccessRole(Enum):
@@ -27,8 +29,49 @@ class AccessLevel(Enum):
     WRITE = "write"
 
 
+RESOURCE_BITS: Dict[DataResource, int] = {
+    resource: 1 << position for position, resource in enumerate(DataResource)
+}
+
+
+@dataclass(frozen=True)
+class ProjectionPlan:
+    """Precompiled permissions for one (role, access level): a resource bitmask.
+
+    ``select`` turns a resource-to-field map into the tuple of permitted field names,
+    which ``project_many`` then applies to whole batches without per-field checks.
+    """
+
+    role: AccessRole
+    access_level: AccessLevel
+    mask: int
+    version: int
+
+    def allows(self, resource: DataResource) -> bool:
+        return bool(self.mask & RESOURCE_BITS[resource])
+
+    def select(self, field_map: Mapping[DataResource, str]) -> Tuple[str, ...]:
+        return tuple(name for resource, name in field_map.items() if self.mask & RESOURCE_BITS[resource])
+
+    def project_many(
+        self,
+        records: Iterable[Mapping[str, Any]],
+        field_map: Mapping[DataResource, str],
+        keep: Tuple[str, ...] = (),
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield each record reduced to ``keep`` plus the permitted fields it contains."""
+        fields = keep + self.select(field_map)
+        for record in records:
+            yield {name: record[name] for name in fields if name in record}
+
+
 class PrivacyPolicy:
-    """Enforce least-privilege access to clinical data."""
+    """Enforce least-privilege access to clinical data.
+
+    Every (role, access level) is compiled into a ``ProjectionPlan`` on first use.
+    ``grant``/``revoke`` bump ``version``, drop the compiled plans and notify
+    listeners so materialized views and caches can rebuild.
+    """
 
     def __init__(self) -> None:
         self._read_permissions: Dict[AccessRole, Set[DataResource]] = {
@@ -54,7 +97,50 @@ class PrivacyPolicy:
             AccessRole.ADMIN: set(DataResource),
             AccessRole.PATIENT: set(),
         }
+        self.version = 0
+        self._plans: Dict[Tuple[AccessRole, AccessLevel], ProjectionPlan] = {}
+        self._listeners: List[Callable[["PrivacyPolicy"], None]] = []
+        self._lock = threading.Lock()
 
     def can_access(self, role: AccessRole, resource: DataResource, level: AccessLevel) -> bool:
-        permissions = self._read_permissions if level == AccessLevel.READ else self._write_permissions
-        return resource in permissions.get(role, set())
+        return self.plan(role, level).allows(resource)
+
+    def plan(self, role: AccessRole, level: AccessLevel) -> ProjectionPlan:
+        """Return the compiled projection plan for ``role`` at ``level``."""
+        plan = self._plans.get((role, level))
+        if plan is not None:
+            return plan
+        with self._lock:
+            permissions = self._read_permissions if level == AccessLevel.READ else self._write_permissions
+            mask = 0
+            for resource in permissions.get(role, set()):
+                mask |= RESOURCE_BITS[resource]
+            plan = ProjectionPlan(role=role, access_level=level, mask=mask, version=self.version)
+            self._plans[(role, level)] = plan
+        return plan
+
+    def grant(self, role: AccessRole, resource: DataResource, level: AccessLevel) -> None:
+        self._change(role, level, lambda resources: resources.add(resource))
+
+    def revoke(self, role: AccessRole, resource: DataResource, level: AccessLevel) -> None:
+        self._change(role, level, lambda resources: resources.discard(resource))
+
+    def add_listener(self, callback: Callable[["PrivacyPolicy"], None]) -> None:
+        """Call ``callback(policy)`` after every permission change; a callback is registered once."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def _change(
+        self,
+        role: AccessRole,
+        level: AccessLevel,
+        mutate: Callable[[Set[DataResource]], None],
+    ) -> None:
+        with self._lock:
+            permissions = self._read_permissions if level == AccessLevel.READ else self._write_permissions
+            mutate(permissions.setdefault(role, set()))
+            self.version += 1
+            self._plans = {}
+        for callback in list(self._listeners):
+            callback(self)
@@ -0,0 +1,169 @@
+"""Compiled serializers for clinical records.
+
+``to_primitive`` turns dataclasses, enums, mappings and sequences into JSON-ready
+values and raises ``TypeError`` for anything else. The encoder for each dataclass
+is generated once per class: fields annotated with a primitive type are read
+directly, and only the remaining fields recurse. ``dumps`` encodes straight to
+bytes, using ``orjson`` when it is installed.
+
+``EncounterDocument`` serializes a finalized encounter a single time so the API
+response, the record stores and the audit trail share the same values and bytes.
+"""
+
+import hashlib
+import json
+import zlib
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Union, get_args, get_origin
+
+from src.core.clinical import EncounterContext, TranscriptSpan
+
+try:
+    import orjson
+except ImportError:  # optional fast encoder
+    orjson = None
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def register_encoder(cls: type, encoder: Callable[[Any], Any]) -> None:
+    """Use ``encoder`` for instances of exactly ``cls``."""
+    _ENCODERS[cls] = encoder
+
+
+def to_primitive(value: Any) -> Any:
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        encoder = _ENCODERS[type(value)] = _compile(type(value))
+    return encoder(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes of ``value`` (primitives, or anything ``to_primitive`` handles)."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return to_primitive(value)
+
+
+def _compile(cls: type) -> Callable[[Any], Any]:
+    if issubclass(cls, _PRIMITIVES):
+        return _identity
+    if issubclass(cls, Enum):
+        return _enum_value
+    if is_dataclass(cls):
+        return _compile_dataclass(cls)
+    if issubclass(cls, Mapping):
+        return lambda value: {key: to_primitive(item) for key, item in value.items()}
+    if issubclass(cls, (list, tuple)):
+        return lambda value: [to_primitive(item) for item in value]
+    if hasattr(cls, "to_dict"):
+        return lambda value: value.to_dict()
+    raise TypeError(f"Object of type {cls.__name__} is not serializable")
+
+
+def _compile_dataclass(cls: type) -> Callable[[Any], Any]:
+    items = []
+    for field in fields(cls):
+        access = f"obj.{field.name}"
+        if not _is_primitive(field.type):
+            access = f"_p({access})"
+        items.append(f"{field.name!r}: {access}")
+    source = f"def encode(obj):\n    return {{{', '.join(items)}}}\n"
+    namespace: Dict[str, Any] = {"_p": to_primitive}
+    exec(source, namespace)
+    encode = namespace["encode"]
+    encode.__qualname__ = f"encode_{cls.__name__}"
+    return encode
+
+
+def _is_primitive(annotation: Any) -> bool:
+    if annotation in _PRIMITIVES:
+        return True
+    if get_origin(annotation) is Union:
+        return all(arg in _PRIMITIVES for arg in get_args(annotation))
+    return False
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _enum_value(value: Enum) -> Any:
+    return value.value
+
+
+register_encoder(TranscriptSpan, lambda span: [span.chunk_index, span.start, span.end])
+
+
+class EncounterDocument:
+    """A finalized encounter serialized once.
+
+    ``fields`` holds the primitive form of each part; ``part_bytes`` and
+    ``compressed_part`` encode a part on first use and reuse the result, and
+    ``body``/``digest`` cover the whole document. Observations are stored resolved,
+    so a part persisted without the transcript still carries their text.
+    """
+
+    PARTS = ("patient_profile", "transcript", "observations", "soap_note", "recommendations")
+
+    def __init__(self, encounter: EncounterContext) -> None:
+        self.encounter_id = encounter.encounter_id
+        self.fields: Dict[str, Any] = {
+            "patient_profile": to_primitive(encounter.patient_profile),
+            "transcript": list(encounter.transcript),
+            "observations": to_primitive(encounter.resolved_observations()),
+            "soap_note": to_primitive(encounter.soap_note) if encounter.soap_note else {},
+            "recommendations": to_primitive(encounter.recommendations),
+        }
+        self._bytes: Dict[str, bytes] = {}
+        self._compressed: Dict[str, bytes] = {}
+        self._body: Optional[bytes] = None
+
+    def part_bytes(self, name: str) -> bytes:
+        encoded = self._bytes.get(name)
+        if encoded is None:
+            encoded = self._bytes[name] = dumps(self.fields[name])
+        return encoded
+
+    def compressed_part(self, name: str) -> bytes:
+        compressed = self._compressed.get(name)
+        if compressed is None:
+            compressed = self._compressed[name] = zlib.compress(self.part_bytes(name))
+        return compressed
+
+    @property
+    def body(self) -> bytes:
+        """JSON object of every part, assembled from the cached part encodings."""
+        if self._body is None:
+            self._body = (
+                b"{"
+                + b",".join(b'"%s":%s' % (name.encode("ascii"), self.part_bytes(name)) for name in self.PARTS)
+                + b"}"
+            )
+        return self._body
+
+    def encode_response(self, response: Dict[str, Any]) -> bytes:
+        """JSON bytes of ``response``, splicing in cached part bytes for values taken
+        from ``fields`` instead of encoding them again."""
+        members = []
+        for key, value in response.items():
+            if key in self.fields and value is self.fields[key]:
+                encoded = self.part_bytes(key)
+            else:
+                encoded = dumps(value)
+            members.append(dumps(key) + b":" + encoded)
+        return b"{" + b",".join(members) + b"}"
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha256(self.body).hexdigest()
@@ -1,11 +1,20 @@
 """Agent state management for autonomous operations"""
 
+import gzip
+import json
 import logging
+import os
+import threading
+import uuid
+from collections import deque
 from dataclasses import dataclass, asdict
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from itertools import islice
+from typing import Dict, Any, Deque, Iterable, Iterator, List, Optional, TextIO, Tuple
 from datetime import datetime
 
+from src.core.compact import EpochUs, from_epoch_us, intern, to_epoch_us
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,22 +59,192 @@ class AgentAction:
             self.created_at = datetime.now().isoformat()
 
 
+class CompactAction:
+    """Completed ``AgentAction``; ``created_at``/``completed_at`` are formatted on access."""
+
+    __slots__ = (
+        "action_type",
+        "description",
+        "parameters",
+        "requires_approval",
+        "priority",
+        "retry_count",
+        "max_retries",
+        "status",
+        "result",
+        "error",
+        "created_us",
+        "completed_us",
+    )
+
+    def __init__(
+        self,
+        action_type: str,
+        description: str,
+        parameters: Dict[str, Any],
+        requires_approval: bool,
+        priority: int,
+        retry_count: int,
+        max_retries: int,
+        status: str,
+        result: Any,
+        error: Optional[str],
+        created_us: EpochUs,
+        completed_us: Optional[EpochUs],
+    ) -> None:
+        self.action_type = intern(action_type)
+        self.description = intern(description)
+        self.parameters = parameters
+        self.requires_approval = requires_approval
+        self.priority = priority
+        self.retry_count = retry_count
+        self.max_retries = max_retries
+        self.status = intern(status)
+        self.result = result
+        self.error = error
+        self.created_us = created_us
+        self.completed_us = completed_us
+
+    @property
+    def created_at(self) -> str:
+        return from_epoch_us(self.created_us)
+
+    @property
+    def completed_at(self) -> Optional[str]:
+        return from_epoch_us(self.completed_us)
+
+    @classmethod
+    def from_record(cls, record: AgentAction) -> "CompactAction":
+        return cls(
+            record.action_type,
+            record.description,
+            record.parameters,
+            record.requires_approval,
+            record.priority,
+            record.retry_count,
+            record.max_retries,
+            record.status,
+            record.result,
+            record.error,
+            to_epoch_us(record.created_at),
+            to_epoch_us(record.completed_at),
+        )
+
+    def to_record(self) -> AgentAction:
+        return AgentAction(**self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "action_type": self.action_type,
+            "description": self.description,
+            "parameters": self.parameters,
+            "requires_approval": self.requires_approval,
+            "priority": self.priority,
+            "retry_count": self.retry_count,
+            "max_retries": self.max_retries,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
+        }
+
+
+HISTORY_KINDS = ('actions', 'decisions', 'errors')
+
+
+class EncounterState:
+    """Status and in-flight action of a single encounter
+
+    Partitions are handed out by ``StateManager.partition``. Each keeps its own status
+    and current action, and records finished actions and decisions into the parent
+    manager's shared history and metrics under the manager's lock, so encounters
+    processed in parallel threads never overwrite each other's state.
+    """
+
+    def __init__(self, manager: 'StateManager', encounter_id: str):
+        self.manager = manager
+        self.encounter_id = encounter_id
+        self.status = AgentStatus.IDLE
+        self.current_action: Optional[AgentAction] = None
+
+    def set_status(self, status: AgentStatus) -> None:
+        """Update encounter status"""
+        self.status = status
+        logger.info(f"Encounter {self.encounter_id} status changed to {status.value}")
+
+    def queue_action(self, action: AgentAction) -> None:
+        """Queue an action for execution"""
+        self.current_action = action
+        logger.info(f"Queued action for encounter {self.encounter_id}: {action.action_type}")
+
+    def complete_action(self, result: Any = None) -> None:
+        """Mark current action as completed"""
+        if self.current_action:
+            self.manager._finish_action(self.current_action, result=result)
+
+    def fail_action(self, error: str) -> None:
+        """Mark current action as failed"""
+        if self.current_action:
+            self.manager._finish_action(self.current_action, error=error)
+
+    def log_decision(
+        self,
+        decision_type: str,
+        outcome: DecisionOutcome,
+        reasoning: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Log a decision made for this encounter"""
+        self.manager._record_decision(decision_type, outcome, reasoning, data, self.encounter_id)
+
+
 class StateManager:
-    """Manage agent state across autonomous operations"""
+    """Manage agent state across autonomous operations
+
+    ``action_history`` (as ``CompactAction``s), ``decision_log`` and ``errors`` are ring
+    buffers holding at most ``max_history`` recent entries each. When a buffer
+    overflows, its oldest ``segment_size`` entries are written to a gzipped JSON lines segment in
+    ``spill_dir`` (or dropped when no directory is configured); ``export_history``
+    reads spilled segments back before the in-memory entries. Segment names carry a
+    per-instance run id and are created exclusively, so restarts and other processes
+    sharing the agent id never overwrite earlier history.
 
-    def __init__(self, agent_id: str):
+    Concurrent encounters each get an ``EncounterState`` partition from ``partition``;
+    history and metrics updates are serialized by a lock, and the summary aggregates
+    the statuses of active partitions.
+    """
+
+    def __init__(
+        self,
+        agent_id: str,
+        max_history: int = 1000,
+        spill_dir: Optional[str] = None,
+        segment_size: int = 250,
+    ):
         self.agent_id = agent_id
         self.status = AgentStatus.IDLE
         self.current_action: Optional[AgentAction] = None
-        self.action_history: List[AgentAction] = []
-        self.decision_log: List[Dict[str, Any]] = []
-        self.errors: List[str] = []
+        self.max_history = max(1, max_history)
+        self.spill_dir = spill_dir
+        self.run_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.segment_size = max(1, min(segment_size, self.max_history))
+        self.action_history: Deque[CompactAction] = deque()
+        self.decision_log: Deque[Dict[str, Any]] = deque()
+        self.errors: Deque[str] = deque()
         self.metrics = {
             'actions_executed': 0,
             'actions_failed': 0,
             'decisions_made': 0,
             'approvals_required': 0,
         }
+        self._lock = threading.RLock()
+        self._partitions: Dict[str, EncounterState] = {}
+        self._spilled = {kind: 0 for kind in HISTORY_KINDS}
+        self._dropped = {kind: 0 for kind in HISTORY_KINDS}
+        self._segments: Dict[str, List[Tuple[str, Optional[str], Optional[str]]]] = {
+            kind: [] for kind in HISTORY_KINDS
+        }
         logger.info(f"StateManager initialized for agent {agent_id}")
 
     def set_status(self, status: AgentStatus) -> None:
@@ -73,6 +252,19 @@ class StateManager:
         self.status = status
         logger.info(f"Agent {self.agent_id} status changed to {status.value}")
 
+    def partition(self, encounter_id: str) -> EncounterState:
+        """Return the state partition for ``encounter_id``, creating it on first use"""
+        with self._lock:
+            partition = self._partitions.get(encounter_id)
+            if partition is None:
+                partition = self._partitions[encounter_id] = EncounterState(self, encounter_id)
+            return partition
+
+    def release(self, encounter_id: str) -> None:
+        """Drop the partition of a finished encounter"""
+        with self._lock:
+            self._partitions.pop(encounter_id, None)
+
     def create_action(
         self,
         action_type: str,
@@ -100,32 +292,131 @@ class StateManager:
     def complete_action(self, result: Any = None) -> None:
         """Mark current action as completed"""
         if self.current_action:
-            self.current_action.status = "completed"
-            self.current_action.result = result
-            self.current_action.completed_at = datetime.now().isoformat()
-            self.action_history.append(self.current_action)
-            self.metrics['actions_executed'] += 1
-            logger.info(f"Completed action: {self.current_action.action_type}")
+            self._finish_action(self.current_action, result=result)
 
     def fail_action(self, error: str) -> None:
         """Mark current action as failed"""
         if self.current_action:
-            self.current_action.status = "failed"
-            self.current_action.error = error
-            self.current_action.completed_at = datetime.now().isoformat()
-            self.action_history.append(self.current_action)
-            self.metrics['actions_failed'] += 1
-            self.errors.append(error)
-            logger.error(f"Action failed: {self.current_action.action_type} - {error}")
+            self._finish_action(self.current_action, error=error)
 
     def log_decision(
         self,
         decision_type: str,
         outcome: DecisionOutcome,
         reasoning: str,
-        data: Optional[Dict[str, Any]] = None
+        data: Optional[Dict[str, Any]] = None,
+        encounter_id: Optional[str] = None,
     ) -> None:
         """Log a decision made by the agent"""
+        self._record_decision(decision_type, outcome, reasoning, data, encounter_id)
+
+    def get_state_summary(self) -> Dict[str, Any]:
+        """Get current state summary"""
+        with self._lock:
+            encounters: Dict[str, int] = {}
+            for partition in self._partitions.values():
+                encounters[partition.status.value] = encounters.get(partition.status.value, 0) + 1
+            return {
+                'agent_id': self.agent_id,
+                'status': self.status.value,
+                'current_action': asdict(self.current_action) if self.current_action else None,
+                'total_actions': self._total('actions', self.action_history),
+                'total_decisions': self._total('decisions', self.decision_log),
+                'active_encounters': encounters,
+                'metrics': dict(self.metrics),
+                'errors': list(islice(reversed(self.errors), 10))[::-1],  # Last 10 errors
+            }
+
+    def export_history(self) -> Dict[str, Any]:
+        """Export complete operation history, including spilled segments
+
+        Builds the whole history in memory; use ``iter_history`` or ``write_history``
+        for large exports.
+        """
+        return {
+            'agent_id': self.agent_id,
+            'actions': list(self._iter_history('actions', self.action_history)),
+            'decisions': list(self._iter_history('decisions', self.decision_log)),
+            'metrics': dict(self.metrics),
+            'errors': list(self._iter_history('errors', self.errors)),
+            'dropped': dict(self._dropped),
+        }
+
+    def iter_history(
+        self,
+        kinds: Iterable[str] = HISTORY_KINDS,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        decision_type: Optional[str] = None,
+        outcome: Optional[DecisionOutcome] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield history records one at a time, oldest first, tagged with ``kind``
+
+        ``start``/``end`` are inclusive ISO timestamps matched against an action's
+        ``created_at`` and a decision's ``timestamp``; errors carry no timestamp and are
+        skipped when a time range is given. ``decision_type`` and ``outcome`` select
+        decisions only.
+        """
+        kinds = set(kinds)
+        if start is not None or end is not None:
+            kinds.discard('errors')
+        if decision_type is not None or outcome is not None:
+            kinds &= {'decisions'}
+        outcome_value = outcome.value if outcome is not None else None
+        buffers = {'actions': self.action_history, 'decisions': self.decision_log, 'errors': self.errors}
+        for kind in HISTORY_KINDS:
+            if kind not in kinds:
+                continue
+            for record in self._iter_history(kind, buffers[kind], start, end):
+                if kind == 'errors':
+                    yield {'kind': 'error', 'error': record}
+                    continue
+                timestamp = record[_TIMESTAMP_FIELDS[kind]]
+                if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                    continue
+                if decision_type is not None and record['type'] != decision_type:
+                    continue
+                if outcome_value is not None and record['outcome'] != outcome_value:
+                    continue
+                yield {'kind': kind[:-1], **record}
+
+    def write_history(self, stream: TextIO, **filters: Any) -> int:
+        """Write ``iter_history(**filters)`` to ``stream`` as NDJSON; returns the record count
+
+        ``stream`` is any text writer, e.g. an open file or ``socket.makefile('w')``.
+        """
+        count = 0
+        for record in self.iter_history(**filters):
+            stream.write(json.dumps(record, default=str) + '\n')
+            count += 1
+        stream.flush()
+        return count
+
+    def _finish_action(self, action: AgentAction, result: Any = None, error: Optional[str] = None) -> None:
+        action.status = "failed" if error is not None else "completed"
+        action.result = result
+        action.error = error
+        action.completed_at = datetime.now().isoformat()
+        with self._lock:
+            self._append('actions', self.action_history, CompactAction.from_record(action))
+            if error is None:
+                self.metrics['actions_executed'] += 1
+            else:
+                self.metrics['actions_failed'] += 1
+                self._append('errors', self.errors, error)
+        if error is None:
+            logger.info(f"Completed action: {action.action_type}")
+        else:
+            logger.error(f"Action failed: {action.action_type} - {error}")
+
+    def _record_decision(
+        self,
+        decision_type: str,
+        outcome: DecisionOutcome,
+        reasoning: str,
+        data: Optional[Dict[str, Any]],
+        encounter_id: Optional[str] = None,
+    ) -> None:
         decision = {
             'timestamp': datetime.now().isoformat(),
             'type': decision_type,
@@ -133,32 +424,65 @@ class StateManager:
             'reasoning': reasoning,
             'data': data or {}
         }
-        self.decision_log.append(decision)
-        self.metrics['decisions_made'] += 1
-        
-        if outcome == DecisionOutcome.REQUIRE_APPROVAL:
-            self.metrics['approvals_required'] += 1
-        
+        if encounter_id is not None:
+            decision['encounter_id'] = encounter_id
+        with self._lock:
+            self._append('decisions', self.decision_log, decision)
+            self.metrics['decisions_made'] += 1
+            if outcome == DecisionOutcome.REQUIRE_APPROVAL:
+                self.metrics['approvals_required'] += 1
+
         logger.info(f"Decision logged: {decision_type} -> {outcome.value}")
 
-    def get_state_summary(self) -> Dict[str, Any]:
-        """Get current state summary"""
-        return {
-            'agent_id': self.agent_id,
-            'status': self.status.value,
-            'current_action': asdict(self.current_action) if self.current_action else None,
-            'total_actions': len(self.action_history),
-            'total_decisions': len(self.decision_log),
-            'metrics': self.metrics,
-            'errors': self.errors[-10:],  # Last 10 errors
-        }
+    def _append(self, kind: str, buffer: Deque[Any], entry: Any) -> None:
+        buffer.append(entry)
+        if len(buffer) <= self.max_history:
+            return
+        oldest = [buffer.popleft() for _ in range(self.segment_size)]
+        if self.spill_dir is None:
+            self._dropped[kind] += len(oldest)
+            return
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(
+            self.spill_dir, f"{self.agent_id}-{self.run_id}-{kind}-{len(self._segments[kind]):06d}.jsonl.gz"
+        )
+        records = [_history_record(item) for item in oldest]
+        with gzip.open(path, 'xt', encoding='utf-8') as handle:
+            for record in records:
+                handle.write(json.dumps(record, default=str) + '\n')
+        timestamps = [record[_TIMESTAMP_FIELDS[kind]] for record in records] if kind in _TIMESTAMP_FIELDS else [None]
+        self._segments[kind].append((path, min(timestamps), max(timestamps)))
+        self._spilled[kind] += len(oldest)
+        logger.debug(f"Spilled {len(oldest)} {kind} entries to {path}")
 
-    def export_history(self) -> Dict[str, Any]:
-        """Export complete operation history"""
-        return {
-            'agent_id': self.agent_id,
-            'actions': [asdict(action) for action in self.action_history],
-            'decisions': self.decision_log,
-            'metrics': self.metrics,
-            'errors': self.errors,
-        }
+    def _total(self, kind: str, buffer: Deque[Any]) -> int:
+        return self._spilled[kind] + self._dropped[kind] + len(buffer)
+
+    def _iter_history(
+        self,
+        kind: str,
+        buffer: Deque[Any],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[Any]:
+        with self._lock:
+            segments = list(self._segments[kind])
+            entries = list(buffer)
+        for path, first, last in segments:
+            if (start is not None and last is not None and last < start) or (
+                end is not None and first is not None and first > end
+            ):
+                continue
+            with gzip.open(path, 'rt', encoding='utf-8') as handle:
+                for line in handle:
+                    yield json.loads(line)
+        for item in entries:
+            yield _history_record(item)
+
+
+_TIMESTAMP_FIELDS = {'actions': 'created_at', 'decisions': 'timestamp'}
+
+
+def _history_record(item: Any) -> Any:
+    """Shallow dict of an action (``asdict`` would deep-copy parameters and results)"""
+    return item.to_dict() if isinstance(item, CompactAction) else item
@@ -1,5 +1,5 @@
 """Utility modules for AI Med Agent"""
 
-from src.utils.secrets import get_secret, update_secret, list_secrets
+from src.utils.secrets import SecretCache, secret_cache, get_secret, update_secret, list_secrets
 
-__all__ = ['get_secret', 'update_secret', 'list_secrets']
+__all__ = ['SecretCache', 'secret_cache', 'get_secret', 'update_secret', 'list_secrets']
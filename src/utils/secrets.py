@@ -13,12 +13,149 @@ Usage:
 
 import boto3
 import json
-from typing import Dict, Any
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 import logging
 
+from botocore.exceptions import BotoCoreError, ClientError
+
 logger = logging.getLogger(__name__)
 
 
+class _Entry:
+    __slots__ = ("response", "version_id", "expires_at")
+
+    def __init__(self, response: Dict[str, Any], expires_at: float) -> None:
+        self.response = response
+        self.version_id = response.get("VersionId")
+        self.expires_at = expires_at
+
+
+class _Fetch:
+    __slots__ = ("done", "entry", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.entry: Optional[_Entry] = None
+        self.error: Optional[BaseException] = None
+
+
+class SecretCache:
+    """
+    Process-wide Secrets Manager cache shared by every secret entry point.
+
+    Values are kept for ``ttl_seconds``. Once an entry expires, ``describe_secret``
+    checks which version currently holds the requested stage; the value is only
+    fetched again when the secret was rotated. Concurrent misses for the same
+    secret wait on a single in-flight fetch, and if a refresh fails the previous
+    value keeps being served until the next expiry.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str, str], _Entry] = {}
+        self._inflight: Dict[Tuple[str, str, str], _Fetch] = {}
+        self._clients: Dict[str, Any] = {}
+
+    def client(self, region_name: str = 'us-east-1') -> Any:
+        """Shared Secrets Manager client for ``region_name``"""
+        with self._lock:
+            client = self._clients.get(region_name)
+            if client is None:
+                client = self._clients[region_name] = boto3.client('secretsmanager', region_name=region_name)
+            return client
+
+    def get_secret_value(
+        self,
+        secret_id: str,
+        region_name: str = 'us-east-1',
+        version_stage: str = 'AWSCURRENT',
+        client: Optional[Any] = None,
+        force_refresh: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Return the cached ``GetSecretValue`` response for a secret.
+
+        Args:
+            secret_id: Name or ARN of the secret
+            region_name: AWS region of the secret
+            version_stage: Staging label to read (default: AWSCURRENT)
+            client: Secrets Manager client to use on a miss (default: shared regional client)
+            force_refresh: Fetch the value even if the cached entry is fresh
+
+        Returns:
+            Response dict with ``SecretString`` or ``SecretBinary`` and ``VersionId``
+        """
+        key = (region_name, secret_id, version_stage)
+        entry = self._entries.get(key)
+        if entry is not None and not force_refresh and entry.expires_at > time.monotonic():
+            return entry.response
+
+        with self._lock:
+            fetch = self._inflight.get(key)
+            leader = fetch is None
+            if leader:
+                fetch = self._inflight[key] = _Fetch()
+        if not leader:
+            fetch.done.wait()
+            if fetch.error is not None:
+                raise fetch.error
+            return fetch.entry.response
+
+        try:
+            fetch.entry = self._load(key, entry, client or self.client(region_name), force_refresh)
+        except BaseException as e:
+            fetch.error = e
+            raise
+        finally:
+            with self._lock:
+                if fetch.entry is not None:
+                    self._entries[key] = fetch.entry
+                del self._inflight[key]
+            fetch.done.set()
+        return fetch.entry.response
+
+    def invalidate(self, secret_id: Optional[str] = None) -> None:
+        """Drop cached values for ``secret_id``, or every secret when omitted"""
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[1] == secret_id]:
+                    del self._entries[key]
+
+    def _load(self, key: Tuple[str, str, str], entry: Optional[_Entry], client: Any, force_refresh: bool) -> _Entry:
+        _, secret_id, version_stage = key
+        expires_at = time.monotonic() + self.ttl_seconds
+        if entry is not None and not force_refresh:
+            try:
+                if self._current_version(client, secret_id, version_stage) == entry.version_id:
+                    return _Entry(entry.response, expires_at)
+            except (BotoCoreError, ClientError) as e:
+                logger.warning(f"Could not refresh secret {secret_id}; serving cached version: {e}")
+                return _Entry(entry.response, expires_at)
+        response = client.get_secret_value(SecretId=secret_id, VersionStage=version_stage)
+        logger.info(f"Fetched secret {secret_id} (version {response.get('VersionId')})")
+        return _Entry(
+            {name: response[name] for name in ("SecretString", "SecretBinary", "VersionId") if name in response},
+            expires_at,
+        )
+
+    @staticmethod
+    def _current_version(client: Any, secret_id: str, version_stage: str) -> Optional[str]:
+        versions = client.describe_secret(SecretId=secret_id).get("VersionIdsToStages", {})
+        for version_id, stages in versions.items():
+            if version_stage in stages:
+                return version_id
+        return None
+
+
+secret_cache = SecretCache(ttl_seconds=float(os.getenv("AI_MED_AGENT_SECRET_TTL", "300")))
+
+
 def get_secret(secret_name: str, region_name: str = 'us-east-1') -> Dict[str, Any]:
     """
     Retrieve secret from AWS Secrets Manager.
@@ -39,38 +176,29 @@ def get_secret(secret_name: str, region_name: str = 'us-east-1') -> Dict[str, An
         >>> print(f"Key loaded: {aws_key[:4]}...")
     """
     
-    # Create Secrets Manager client
-    client = boto3.client('secretsmanager', region_name=region_name)
-    
     try:
-        logger.info(f"Retrieving secret: {secret_name}")
-        
-        # Get secret value
-        response = client.get_secret_value(SecretId=secret_name)
+        # Served from the process-wide cache; Secrets Manager is only called on expiry
+        response = secret_cache.get_secret_value(secret_name, region_name=region_name)
         
         # Parse secret string
         if 'SecretString' in response:
-            secret = json.loads(response['SecretString'])
-            logger.info(f"✅ Secret retrieved successfully: {secret_name}")
-            return secret
+            return json.loads(response['SecretString'])
         else:
             # Binary secret (less common)
             import base64
             decoded = base64.b64decode(response['SecretBinary'])
-            logger.info(f"✅ Binary secret retrieved: {secret_name}")
             return json.loads(decoded)
             
-    except client.exceptions.ResourceNotFoundException:
-        logger.error(f"❌ Secret not found: {secret_name}")
-        raise Exception(f"Secret '{secret_name}' does not exist in Secrets Manager")
-        
-    except client.exceptions.InvalidRequestException as e:
-        logger.error(f"❌ Invalid request: {e}")
-        raise Exception(f"Invalid request for secret '{secret_name}': {e}")
-        
-    except client.exceptions.InvalidParameterException as e:
-        logger.error(f"❌ Invalid parameter: {e}")
-        raise Exception(f"Invalid parameter for secret '{secret_name}': {e}")
+    except ClientError as e:
+        code = e.response['Error']['Code']
+        if code == 'ResourceNotFoundException':
+            logger.error(f"❌ Secret not found: {secret_name}")
+            raise Exception(f"Secret '{secret_name}' does not exist in Secrets Manager")
+        if code in ('InvalidRequestException', 'InvalidParameterException'):
+            logger.error(f"❌ Invalid request: {e}")
+            raise Exception(f"Invalid request for secret '{secret_name}': {e}")
+        logger.error(f"❌ Error retrieving secret: {e}")
+        raise Exception(f"Failed to retrieve secret '{secret_name}': {e}")
         
     except Exception as e:
         logger.error(f"❌ Error retrieving secret: {e}")
@@ -98,7 +226,7 @@ def update_secret(secret_name: str, secret_dict: Dict[str, Any], region_name: st
         True
     """
     
-    client = boto3.client('secretsmanager', region_name=region_name)
+    client = secret_cache.client(region_name)
     
     try:
         logger.info(f"Updating secret: {secret_name}")
@@ -112,6 +240,7 @@ def update_secret(secret_name: str, secret_dict: Dict[str, Any], region_name: st
             SecretString=secret_string
         )
         
+        secret_cache.invalidate(secret_name)
         logger.info(f"✅ Secret updated successfully: {secret_name}")
         logger.info(f"Version ID: {response['VersionId']}")
         return True
@@ -137,11 +266,14 @@ def list_secrets(region_name: str = 'us-east-1') -> list:
         ['ai-med-agent/prod', 'ai-med-agent/dev']
     """
     
-    client = boto3.client('secretsmanager', region_name=region_name)
+    client = secret_cache.client(region_name)
     
     try:
-        response = client.list_secrets()
-        secret_names = [secret['Name'] for secret in response['SecretList']]
+        secret_names = [
+            secret['Name']
+            for page in client.get_paginator('list_secrets').paginate()
+            for secret in page['SecretList']
+        ]
         
         logger.info(f"Found {len(secret_names)} secrets")
         return secret_names
@@ -0,0 +1,313 @@
+"""Unit tests for the audit trail read path."""
+
+import os
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.core.audit import AuditLogger, AuditEvent, AuditQuery, CompactAuditEvent, InMemoryAuditLogger
+from src.clients.dynamodb_store import DynamoDBAuditLogger
+
+
+def _event(actor_id, action, resource_id, timestamp):
+    return AuditEvent(actor_id=actor_id, action=action, resource_id=resource_id, timestamp=timestamp)
+
+
+def _seed(audit_logger):
+    audit_logger.log_event(_event("clin-1", "encounter_started", "enc-1", "2026-01-01T09:00:00"))
+    audit_logger.log_event(_event("agent", "transcript_ingested", "enc-1", "2026-01-01T09:01:00"))
+    audit_logger.log_event(_event("clin-2", "encounter_started", "enc-2", "2026-01-01T10:00:00"))
+    audit_logger.log_event(_event("agent", "transcript_ingested", "enc-2", "2026-01-01T10:01:00"))
+    audit_logger.log_event(_event("clin-1", "encounter_finalized", "enc-1", "2026-01-02T09:00:00"))
+
+
+class FakeAuditTable:
+    """Records query/scan requests and serves pre-baked pages."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def query(self, **request):
+        self.requests.append(("query", request))
+        return self.pages.pop(0)
+
+    def scan(self, **request):
+        self.requests.append(("scan", request))
+        return self.pages.pop(0)
+
+
+class TestFileAuditLogger:
+    def test_query_by_resource(self, tmp_path):
+        audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        _seed(audit_logger)
+
+        events = list(audit_logger.query(AuditQuery(resource_id="enc-1")))
+
+        assert [event.action for event in events] == [
+            "encounter_started",
+            "transcript_ingested",
+            "encounter_finalized",
+        ]
+
+    def test_query_by_actor_and_time_range(self, tmp_path):
+        audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        _seed(audit_logger)
+
+        events = list(
+            audit_logger.query(
+                AuditQuery(actor_id="clin-1", start="2026-01-01T00:00:00", end="2026-01-01T23:59:59")
+            )
+        )
+
+        assert [event.resource_id for event in events] == ["enc-1"]
+        assert events[0].action == "encounter_started"
+
+    def test_cursor_pagination(self, tmp_path):
+        audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        _seed(audit_logger)
+
+        first = audit_logger.query_page(AuditQuery(), limit=2)
+        second = audit_logger.query_page(AuditQuery(), limit=2, cursor=first.next_cursor)
+        third = audit_logger.query_page(AuditQuery(), limit=2, cursor=second.next_cursor)
+
+        assert [event.timestamp for event in first.events + second.events + third.events] == [
+            "2026-01-01T09:00:00",
+            "2026-01-01T09:01:00",
+            "2026-01-01T10:00:00",
+            "2026-01-01T10:01:00",
+            "2026-01-02T09:00:00",
+        ]
+        assert third.next_cursor is None
+
+    def test_index_picks_up_later_writes(self, tmp_path):
+        audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        _seed(audit_logger)
+        assert audit_logger.count_by_action()["encounter_started"] == 2
+
+        audit_logger.log_event(_event("clin-3", "encounter_started", "enc-3", "2026-01-03T09:00:00"))
+        reader = AuditLogger(str(tmp_path / "audit.log"))
+
+        assert audit_logger.count_by_action()["encounter_started"] == 3
+        assert reader.count_by_action(AuditQuery(resource_id="enc-1")) == {
+            "encounter_started": 1,
+            "transcript_ingested": 1,
+            "encounter_finalized": 1,
+        }
+
+    def test_filtered_cursor_pagination(self, tmp_path):
+        audit_logger = AuditLogger(str(tmp_path / "audit.log"))
+        _seed(audit_logger)
+
+        first = audit_logger.query_page(AuditQuery(actor_id="agent"), limit=1)
+        second = audit_logger.query_page(AuditQuery(actor_id="agent"), limit=1, cursor=first.next_cursor)
+
+        assert [event.resource_id for event in first.events + second.events] == ["enc-1", "enc-2"]
+        assert second.next_cursor is None
+
+    def test_index_is_rebuilt_after_rotation(self, tmp_path):
+        log_file = tmp_path / "audit.log"
+        audit_logger = AuditLogger(str(log_file))
+        _seed(audit_logger)
+        assert audit_logger.count_by_action()["encounter_started"] == 2
+
+        os.replace(log_file, tmp_path / "audit.log.1")
+        audit_logger.log_event(_event("clin-3", "encounter_started", "enc-3", "2026-01-03T09:00:00"))
+
+        assert audit_logger.count_by_action() == {"encounter_started": 1}
+        assert [event.resource_id for event in audit_logger.query(AuditQuery())] == ["enc-3"]
+
+    def test_index_is_rebuilt_after_truncation(self, tmp_path):
+        log_file = tmp_path / "audit.log"
+        audit_logger = AuditLogger(str(log_file))
+        _seed(audit_logger)
+        assert audit_logger.count_by_action(AuditQuery(resource_id="enc-1"))["encounter_started"] == 1
+
+        open(log_file, "w").close()
+        audit_logger.log_event(_event("clin-3", "encounter_finalized", "enc-3", "2026-01-03T09:00:00"))
+
+        assert audit_logger.count_by_action(AuditQuery(resource_id="enc-1")) == {}
+        assert audit_logger.count_by_action() == {"encounter_finalized": 1}
+
+
+class TestInMemoryAuditLogger:
+    def test_query_and_counts(self):
+        audit_logger = InMemoryAuditLogger()
+        _seed(audit_logger)
+
+        page = audit_logger.query_page(AuditQuery(action="transcript_ingested"), limit=1)
+
+        assert page.events[0].resource_id == "enc-1"
+        assert page.next_cursor is not None
+        assert audit_logger.count_by_action(AuditQuery(actor_id="agent")) == {"transcript_ingested": 2}
+
+    def test_events_are_held_compact_and_read_back_unchanged(self):
+        audit_logger = InMemoryAuditLogger()
+        event = AuditEvent(
+            actor_id="clin-1",
+            action="encounter_started",
+            resource_id="enc-1",
+            metadata={"patient_id": "patient-1"},
+            timestamp="2026-01-01T09:00:00.123456",
+        )
+        audit_logger.log_event(event)
+        audit_logger.log_event(_event("clin-1", "encounter_started", "enc-2", "2026-01-01T09:05:00"))
+
+        assert isinstance(audit_logger.compact_events[0], CompactAuditEvent)
+        assert audit_logger.compact_events[0].action is audit_logger.compact_events[1].action
+        assert list(audit_logger.query(AuditQuery(resource_id="enc-1"))) == [event]
+        assert audit_logger.events[0] == event
+        assert audit_logger.events[1].metadata == {}
+
+    def test_timestamps_that_do_not_round_trip_are_kept_verbatim(self):
+        audit_logger = InMemoryAuditLogger()
+        timestamps = ["2026-01-01T09:00:00+00:00", "2026-01-01T09:00:00Z", "2026-01-01", "yesterday"]
+        events = [_event("clin-1", "encounter_started", f"enc-{index}", value) for index, value in enumerate(timestamps)]
+        for event in events:
+            audit_logger.log_event(event)
+
+        assert list(audit_logger.query(AuditQuery(actor_id="clin-1"))) == events
+        assert [event.timestamp_us for event in audit_logger.compact_events] == timestamps
+
+
+class TestDynamoDBAuditLoggerQueries:
+    def _logger(self, pages):
+        audit_logger = DynamoDBAuditLogger(table_name="audit")
+        audit_logger.table = FakeAuditTable(pages)
+        return audit_logger
+
+    def test_resource_filter_uses_key_condition_and_follows_pages(self):
+        item = {
+            "resource_id": "enc-1",
+            "timestamp": "2026-01-01T09:00:00",
+            "actor_id": "clin-1",
+            "action": "encounter_started",
+            "metadata": {},
+            "correlation_id": "",
+        }
+        audit_logger = self._logger(
+            [
+                {"Items": [item], "LastEvaluatedKey": {"resource_id": "enc-1", "timestamp": "x"}},
+                {"Items": [dict(item, action="encounter_finalized")]},
+            ]
+        )
+
+        events = list(audit_logger.query(AuditQuery(resource_id="enc-1", actor_id="clin-1")))
+
+        assert [event.action for event in events] == ["encounter_started", "encounter_finalized"]
+        operation, request = audit_logger.table.requests[1]
+        assert operation == "query"
+        assert "IndexName" not in request
+        assert "FilterExpression" in request
+        assert request["ExclusiveStartKey"] == {"resource_id": "enc-1", "timestamp": "x"}
+
+    def test_actor_filter_uses_gsi(self):
+        audit_logger = self._logger([{"Items": []}])
+
+        list(audit_logger.query(AuditQuery(actor_id="clin-1", start="2026-01-01")))
+
+        operation, request = audit_logger.table.requests[0]
+        assert operation == "query"
+        assert request["IndexName"] == DynamoDBAuditLogger.ACTOR_INDEX
+        assert "FilterExpression" not in request
+
+    def test_unfiltered_query_scans(self):
+        audit_logger = self._logger([{"Items": [{"action": "encounter_started"}]}])
+
+        counts = audit_logger.count_by_action()
+
+        assert counts == {"encounter_started": 1}
+        assert audit_logger.table.requests[0][0] == "scan"
+
+
+class FakeBatchResource:
+    """Stands in for the DynamoDB resource; the first batch leaves one item unprocessed."""
+
+    def __init__(self, table_name):
+        self.table_name = table_name
+        self.batches = []
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems[self.table_name]
+        self.batches.append([request["PutRequest"]["Item"]["resource_id"] for request in requests])
+        if len(self.batches) == 1:
+            return {"UnprocessedItems": {self.table_name: requests[-1:]}}
+        return {"UnprocessedItems": {}}
+
+
+class BlockingBatchResource:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def batch_write_item(self, RequestItems):
+        self.release.wait()
+        return {"UnprocessedItems": {}}
+
+
+class ErrorBatchResource:
+    def __init__(self, code, status):
+        self.error = ClientError(
+            {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "BatchWriteItem"
+        )
+        self.calls = 0
+
+    def batch_write_item(self, RequestItems):
+        self.calls += 1
+        raise self.error
+
+
+class FailingTable:
+    def put_item(self, **kwargs):
+        raise AssertionError("batched logger must not write synchronously")
+
+
+class TestDynamoDBAuditLoggerBatching:
+    def test_events_are_batched_and_unprocessed_items_retried(self):
+        audit_logger = DynamoDBAuditLogger(
+            table_name="audit",
+            batch_writes=True,
+            batch_size=3,
+            linger_seconds=0.2,
+            base_backoff_seconds=0.001,
+        )
+        audit_logger.client = FakeBatchResource("audit")
+        audit_logger.table = FailingTable()
+
+        for index in range(4):
+            audit_logger.log_event(_event("agent", "transcript_ingested", f"enc-{index}", "2026-01-01"))
+        audit_logger.close()
+
+        written = [resource_id for batch in audit_logger.client.batches for resource_id in batch]
+        assert all(len(batch) <= 3 for batch in audit_logger.client.batches)
+        assert sorted(set(written)) == ["enc-0", "enc-1", "enc-2", "enc-3"]
+        assert written.count("enc-2") == 2
+        assert audit_logger.dropped_events == 0
+
+    def test_reads_stop_waiting_for_a_stuck_writer(self):
+        audit_logger = DynamoDBAuditLogger(
+            table_name="audit", batch_writes=True, linger_seconds=0, read_flush_timeout=0.05
+        )
+        audit_logger.client = BlockingBatchResource()
+        audit_logger.table = FakeAuditTable([{"Items": []}])
+
+        audit_logger.log_event(_event("agent", "transcript_ingested", "enc-1", "2026-01-01"))
+
+        assert list(audit_logger.query(AuditQuery(resource_id="enc-1"))) == []
+        assert audit_logger.flush(timeout=0.01) is False
+        audit_logger.client.release.set()
+        assert audit_logger.flush(timeout=5) is True
+        audit_logger.close()
+
+    @pytest.mark.parametrize(
+        "code, status, calls",
+        [("ValidationException", 400, 1), ("ProvisionedThroughputExceededException", 400, 3), ("InternalServerError", 500, 3)],
+    )
+    def test_only_throttling_and_server_errors_are_retried(self, code, status, calls):
+        audit_logger = DynamoDBAuditLogger(table_name="audit", max_retries=2, base_backoff_seconds=0.001)
+        audit_logger.client = ErrorBatchResource(code, status)
+
+        audit_logger._write_batch([{"resource_id": "enc-1", "timestamp": "2026-01-01"}])
+
+        assert audit_logger.client.calls == calls
+        assert audit_logger.dropped_events == 1
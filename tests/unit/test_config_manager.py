@@ -0,0 +1,104 @@
+"""Unit tests for AppConfig sessions in the configuration manager."""
+
+import io
+import json
+import threading
+
+import pytest
+from botocore.exceptions import ClientError
+
+from src.clients.config_manager import ConfigManager
+
+
+class FakeAppConfigData:
+    """Serves deployed configurations the way AppConfig data does: content only on change."""
+
+    def __init__(self, configuration, poll_interval=15):
+        self.configuration = configuration
+        self.poll_interval = poll_interval
+        self.sessions = 0
+        self.polls = 0
+        self.expired = set()
+        self._served = {}
+
+    def deploy(self, configuration):
+        self.configuration = configuration
+
+    def start_configuration_session(self, **kwargs):
+        self.sessions += 1
+        return {"InitialConfigurationToken": f"session-{self.sessions}-0"}
+
+    def get_latest_configuration(self, ConfigurationToken):
+        if ConfigurationToken in self.expired:
+            raise ClientError({"Error": {"Code": "BadRequestException"}}, "GetLatestConfiguration")
+        self.polls += 1
+        session, _, _ = ConfigurationToken.rpartition("-")
+        body = b""
+        if self._served.get(session) != self.configuration:
+            self._served[session] = self.configuration
+            body = json.dumps(self.configuration).encode()
+        return {
+            "NextPollConfigurationToken": f"{session}-{self.polls}",
+            "NextPollIntervalInSeconds": self.poll_interval,
+            "Configuration": io.BytesIO(body),
+            "VersionLabel": str(self.polls),
+        }
+
+
+@pytest.fixture
+def manager():
+    config_manager = ConfigManager(background_polling=False)
+    config_manager.appconfigdata_client = FakeAppConfigData(
+        {"values": {"explainability_logs": {"enabled": True}, "realtime_transcription": {"enabled": False}}}
+    )
+    yield config_manager
+    config_manager.close()
+
+
+class TestAppConfigSessions:
+    def test_reads_reuse_the_session_snapshot(self, manager):
+        for _ in range(3):
+            flags = manager.get_feature_flags()
+        assert flags == {"explainability_logs": True, "realtime_transcription": False}
+        assert manager.appconfigdata_client.sessions == 1
+        assert manager.appconfigdata_client.polls == 1
+
+    def test_poll_follows_tokens_and_notifies_on_change(self, manager):
+        client = manager.appconfigdata_client
+        changes = []
+        manager.subscribe("ie50sgm", "backend-dev", "feature-flags", changes.append)
+        session = manager.appconfig_session("ie50sgm", "backend-dev", "feature-flags")
+        session.load()
+
+        assert session.poll() is False
+        client.deploy({"values": {"explainability_logs": {"enabled": False}}})
+        assert session.poll() is True
+
+        assert manager.get_feature_flags() == {"explainability_logs": False}
+        assert len(changes) == 2
+        assert client.sessions == 1
+
+    def test_expired_token_starts_a_new_session(self, manager):
+        client = manager.appconfigdata_client
+        session = manager.appconfig_session("ie50sgm", "backend-dev", "feature-flags")
+        session.load()
+        client.expired.add(session._token)
+
+        session.poll()
+        assert client.sessions == 2
+        assert manager.get_feature_flags()["explainability_logs"] is True
+
+    def test_background_poller_refreshes_snapshots(self):
+        config_manager = ConfigManager(min_poll_interval=1)
+        client = config_manager.appconfigdata_client = FakeAppConfigData({"version": 1}, poll_interval=0)
+        updated = threading.Event()
+        config_manager.subscribe(
+            "app", "env", "profile", lambda config: config.get("version") == 2 and updated.set()
+        )
+        try:
+            assert config_manager.get_appconfig_configuration("app", "env", "profile")["version"] == 1
+            client.deploy({"version": 2})
+            assert updated.wait(5)
+            assert config_manager.get_appconfig_configuration("app", "env", "profile") == {"version": 2}
+        finally:
+            config_manager.close()
@@ -0,0 +1,143 @@
+"""Unit tests for consent management."""
+
+import pytest
+
+from src.clients.dynamodb_store import DynamoDBConsentStore, DynamoDBStoreException
+from src.core.consent import ConsentManager, ConsentRecord, ConsentStore, ConsentType, FileConsentStore
+
+
+class RecordingStore(ConsentStore):
+    def __init__(self):
+        self.batches = []
+
+    def save_many(self, records):
+        self.batches.append(list(records))
+
+
+class FakeConsentTable:
+    """One in-memory table shared by several stores, keyed like the consent table."""
+
+    def __init__(self):
+        self.items = {}
+
+    def get_item(self, Key):
+        item = self.items.get((Key["scope"], Key["consent_type"]))
+        return {"Item": dict(item)} if item else {}
+
+    def batch_write_item(self, RequestItems):
+        for requests in RequestItems.values():
+            for request in requests:
+                item = request["PutRequest"]["Item"]
+                self.items[(item["scope"], item["consent_type"])] = item
+        return {"UnprocessedItems": {}}
+
+
+def _dynamodb_store(table, index_ttl):
+    store = DynamoDBConsentStore(table_name="consents", index_ttl=index_ttl)
+    store.client = store.table = table
+    return store
+
+
+class TestConsentManager:
+    def test_latest_decision_wins(self):
+        manager = ConsentManager()
+        manager.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, True, "clin-1")
+        assert manager.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+        manager.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, False, "patient-1")
+
+        assert not manager.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+    def test_latest_decision_wins_across_timestamp_formats(self):
+        store = ConsentStore()
+        store.load = lambda: [
+            ConsentRecord("patient-1", "enc-1", ConsentType.AI_ASSIST, True, "clin-1", "2026-01-01T09:00:00"),
+            ConsentRecord("patient-1", "enc-1", ConsentType.AI_ASSIST, False, "patient-1", "2026-01-01T10:00:00+00:00"),
+            ConsentRecord("patient-1", "enc-1", ConsentType.AI_ASSIST, True, "clin-1", "2026-01-01"),
+        ]
+        manager = ConsentManager(store)
+
+        assert not manager.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+    def test_standing_consent_applies_without_encounter_record(self):
+        manager = ConsentManager()
+        manager.record_consent("patient-1", None, ConsentType.TRANSCRIPTION, True, "patient-1")
+
+        assert manager.has_consent("enc-9", ConsentType.TRANSCRIPTION, patient_id="patient-1")
+        assert not manager.has_consent("enc-9", ConsentType.TRANSCRIPTION)
+
+        manager.record_consent("patient-1", "enc-9", ConsentType.TRANSCRIPTION, False, "clin-1")
+        assert not manager.has_consent("enc-9", ConsentType.TRANSCRIPTION, patient_id="patient-1")
+
+    def test_record_consents_writes_one_batch(self):
+        store = RecordingStore()
+        manager = ConsentManager(store)
+
+        manager.record_consents("patient-1", "enc-1", list(ConsentType), True, "clin-1")
+
+        assert len(store.batches) == 1
+        assert [record.consent_type for record in store.batches[0]] == list(ConsentType)
+        assert all(manager.has_consent("enc-1", consent_type) for consent_type in ConsentType)
+
+    def test_file_store_shares_decisions_between_managers(self, tmp_path):
+        path = str(tmp_path / "consents.jsonl")
+        first = ConsentManager(FileConsentStore(path))
+        second = ConsentManager(FileConsentStore(path))
+
+        first.record_consent("patient-1", "enc-1", ConsentType.AUDIO_RECORDING, True, "clin-1")
+        assert second.has_consent("enc-1", ConsentType.AUDIO_RECORDING)
+
+        first.record_consent("patient-1", "enc-1", ConsentType.AUDIO_RECORDING, False, "patient-1")
+        assert not second.has_consent("enc-1", ConsentType.AUDIO_RECORDING)
+
+        restarted = ConsentManager(FileConsentStore(path))
+        assert not restarted.has_consent("enc-1", ConsentType.AUDIO_RECORDING)
+
+    def test_dynamodb_revocation_reaches_other_managers(self):
+        table = FakeConsentTable()
+        first = ConsentManager(_dynamodb_store(table, index_ttl=0))
+        second = ConsentManager(_dynamodb_store(table, index_ttl=0))
+
+        first.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, True, "clin-1")
+        assert second.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+        first.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, False, "patient-1")
+        assert not second.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+        table.items.clear()
+        assert not first.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+    def test_dynamodb_index_entries_are_trusted_until_their_ttl(self):
+        table = FakeConsentTable()
+        first = ConsentManager(_dynamodb_store(table, index_ttl=0))
+        second = ConsentManager(_dynamodb_store(table, index_ttl=3600))
+
+        first.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, True, "clin-1")
+        assert second.has_consent("enc-1", ConsentType.AI_ASSIST)
+        first.record_consent("patient-1", "enc-1", ConsentType.AI_ASSIST, False, "patient-1")
+        assert second.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+        second.store.index_ttl = 0
+        assert not second.has_consent("enc-1", ConsentType.AI_ASSIST)
+
+    def test_dynamodb_save_many_chunks_and_gives_up_on_throttling(self):
+        class ThrottledTable(FakeConsentTable):
+            def __init__(self):
+                super().__init__()
+                self.calls = []
+
+            def batch_write_item(self, RequestItems):
+                requests = RequestItems["consents"]
+                self.calls.append(len(requests))
+                return {"UnprocessedItems": {"consents": requests[-1:]}}
+
+        table = ThrottledTable()
+        store = _dynamodb_store(table, index_ttl=0)
+        store.max_retries, store.base_backoff_seconds = 2, 0
+        records = [
+            ConsentRecord("patient-1", f"enc-{index}", ConsentType.AI_ASSIST, True, "clin-1") for index in range(30)
+        ]
+
+        with pytest.raises(DynamoDBStoreException):
+            store.save_many(records)
+        assert table.calls == [25, 1, 1, 5, 1, 1]
@@ -0,0 +1,58 @@
+"""Unit tests for the shared service container."""
+
+from src.agent.container import ServiceContainer
+from src.core.audit import InMemoryAuditLogger
+from src.core.privacy import AccessLevel, AccessRole, DataResource
+
+
+class TestServiceContainer:
+    def test_tenants_share_services_but_not_state(self, patient_profile, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        container = ServiceContainer()
+        clinic_a = container.create_orchestrator("clinic-a")
+        clinic_b = container.create_orchestrator("clinic-b")
+
+        for shared in ("nlp_service", "guideline_service", "agents", "privacy_policy", "feature_flags"):
+            assert getattr(clinic_a, shared) is getattr(clinic_b, shared)
+        for own in ("state", "consent_manager", "transcriber", "audit_logger", "record_store", "view_cache"):
+            assert getattr(clinic_a, own) is not getattr(clinic_b, own)
+        assert container.create_orchestrator("clinic-a").record_store is clinic_a.record_store
+        assert clinic_a.audit_logger.log_file != clinic_b.audit_logger.log_file
+
+        encounter = clinic_a.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        clinic_a.ingest_transcript_chunk(encounter, "Patient reports cough.")
+        clinic_a.finalize_encounter(encounter)
+        assert clinic_a.get_state_summary()["total_actions"] == 1
+        assert clinic_b.get_state_summary()["total_actions"] == 0
+
+    def test_overrides_replace_shared_components(self, audit_logger):
+        container = ServiceContainer()
+        orchestrator = container.create_orchestrator("clinic-a", audit_logger=audit_logger)
+        assert orchestrator.audit_logger is audit_logger
+        assert "audit_logger" not in container._components
+
+    def test_tenant_cannot_read_another_tenants_patients(self, patient_profile):
+        container = ServiceContainer()
+        clinic_a = container.create_orchestrator("clinic-a", audit_logger=InMemoryAuditLogger())
+        clinic_b = container.create_orchestrator("clinic-b", audit_logger=InMemoryAuditLogger())
+
+        encounter = clinic_b.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        clinic_b.ingest_transcript_chunk(encounter, "Patient reports cough.")
+        clinic_b.finalize_encounter(encounter)
+
+        assert list(clinic_b.get_patient_view(patient_profile.patient_id)["medications"]) == patient_profile.medications
+        assert list(clinic_a.get_patient_view(patient_profile.patient_id)["medications"]) == []
+        assert clinic_a.record_store.latest_encounters(patient_profile.patient_id, 10) == []
+        assert not list(clinic_a.audit_logger.events)
+
+    def test_policy_change_clears_each_tenant_view_cache(self, audit_logger, patient_profile):
+        container = ServiceContainer()
+        tenants = [container.create_orchestrator(f"clinic-{index}", audit_logger=audit_logger) for index in range(3)]
+        container.create_orchestrator("clinic-0", audit_logger=audit_logger)
+        for tenant in tenants:
+            tenant.get_patient_view(patient_profile.patient_id)
+            assert tenant.view_cache.metrics()["entries"] == 1
+        assert len(container.privacy_policy._listeners) == 3
+
+        container.privacy_policy.revoke(AccessRole.PATIENT, DataResource.INSURANCE, AccessLevel.READ)
+        assert [tenant.view_cache.metrics()["entries"] for tenant in tenants] == [0, 0, 0]
@@ -0,0 +1,86 @@
+"""Unit tests for the encounter write-ahead log."""
+
+from src.agent.orchestrator import AgentOrchestrator
+from src.clients.clinical_services import ClinicalNLPService, RealTimeTranscriber
+from src.clients.encounter_wal import EncounterWAL
+from src.core.audit import InMemoryAuditLogger
+from src.core.clinical import EncounterContext
+
+
+def _orchestrator(wal_path):
+    return AgentOrchestrator(
+        agent_id="wal-agent",
+        audit_logger=InMemoryAuditLogger(),
+        transcriber=RealTimeTranscriber(),
+        encounter_wal=EncounterWAL(wal_path),
+    )
+
+
+class TestEncounterWAL:
+    def test_recover_returns_only_open_encounters(self, tmp_path, patient_profile):
+        path = str(tmp_path / "encounters.wal")
+        wal = EncounterWAL(path)
+        nlp = ClinicalNLPService()
+        for encounter_id in ("enc-1", "enc-2"):
+            wal.open(EncounterContext(encounter_id=encounter_id, patient_profile=patient_profile, clinician_id="clin-1"))
+        chunk = "History of asthma, reports cough."
+        wal.append_chunk("enc-1", chunk, nlp.extract_key_details(chunk, chunk_index=0))
+        wal.append_chunk("enc-2", "Fever since Monday.", [])
+        wal.close("enc-2")
+
+        recovered = EncounterWAL(path).recover()
+
+        assert [encounter.encounter_id for encounter in recovered] == ["enc-1"]
+        encounter = recovered[0]
+        assert encounter.patient_profile == patient_profile
+        assert encounter.transcript == [chunk]
+        history = [obs for obs in encounter.observations if obs.category == "history"]
+        assert history[0].resolve(encounter.transcript) == chunk
+        assert history[0].value == chunk
+        with open(path, "rb") as handle:
+            assert handle.read().count(chunk.encode("utf-8")) == 1
+
+    def test_torn_tail_is_truncated(self, tmp_path, patient_profile):
+        path = tmp_path / "encounters.wal"
+        wal = EncounterWAL(str(path))
+        wal.open(EncounterContext(encounter_id="enc-1", patient_profile=patient_profile, clinician_id="clin-1"))
+        wal.append_chunk("enc-1", "Patient reports nausea.", [])
+        intact = path.stat().st_size
+        wal.append_chunk("enc-1", "Lost in the crash.", [])
+        with open(path, "r+b") as handle:
+            handle.truncate(intact + 7)
+
+        reopened = EncounterWAL(str(path))
+        assert reopened.recover()[0].transcript == ["Patient reports nausea."]
+        assert path.stat().st_size == intact
+
+        reopened.append_chunk("enc-1", "Resumed.", [])
+        assert EncounterWAL(str(path)).recover()[0].transcript == ["Patient reports nausea.", "Resumed."]
+
+    def test_compaction_keeps_open_encounters(self, tmp_path, patient_profile):
+        path = tmp_path / "encounters.wal"
+        wal = EncounterWAL(str(path), compact_bytes=1)
+        for encounter_id in ("enc-1", "enc-2"):
+            wal.open(EncounterContext(encounter_id=encounter_id, patient_profile=patient_profile, clinician_id="clin-1"))
+            wal.append_chunk(encounter_id, f"Chunk for {encounter_id}.", [])
+        before = path.stat().st_size
+        wal.close("enc-1")
+
+        assert path.stat().st_size < before
+        recovered = EncounterWAL(str(path)).recover()
+        assert [(encounter.encounter_id, encounter.transcript) for encounter in recovered] == [
+            ("enc-2", ["Chunk for enc-2."])
+        ]
+
+    def test_orchestrator_resumes_open_encounters(self, tmp_path, patient_profile):
+        path = str(tmp_path / "encounters.wal")
+        crashed = _orchestrator(path)
+        encounter = crashed.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        crashed.ingest_transcript_chunk(encounter, "Patient reports fever.")
+
+        restarted = _orchestrator(path)
+
+        assert [resumed.encounter_id for resumed in restarted.recovered_encounters] == [encounter.encounter_id]
+        result = restarted.finalize_encounter(restarted.recovered_encounters[0])
+        assert result["soap_note"]["symptoms"] == ["fever"]
+        assert _orchestrator(path).recovered_encounters == []
@@ -0,0 +1,89 @@
+"""Unit tests for streaming bulk patient export."""
+
+import gzip
+import json
+
+import pytest
+
+from src.clients.export import PatientExporter
+from src.clients.sqlite_store import SQLiteClinicalRecordStore
+from src.core.clinical import EncounterContext, PatientProfile
+from src.core.emergency import EmergencyEvent
+from src.core.privacy import AccessRole, AccessLevel, DataResource
+
+
+def _populate(store, count):
+    for index in range(count):
+        profile = PatientProfile(
+            patient_id=f"patient-{index:03d}",
+            medications=[f"med-{index}"],
+            insurance={"provider": "Acme Health"},
+        )
+        store.store_encounter(
+            EncounterContext(encounter_id=f"enc-{index}", patient_profile=profile, clinician_id="clin-1")
+        )
+    store.record_emergency_event(
+        EmergencyEvent(
+            encounter_id="enc-0",
+            patient_id="patient-000",
+            initiated_by="patient-000",
+            reason="Chest pain",
+            confirmed=True,
+        )
+    )
+
+
+class FlakyStore:
+    """Wraps a store and fails after yielding a number of pages."""
+
+    def __init__(self, store, fail_after):
+        self.store = store
+        self.fail_after = fail_after
+        self.privacy_policy = store.privacy_policy
+        self.EXPORT_KEYS = store.EXPORT_KEYS
+        self.EXPORT_FIELDS = store.EXPORT_FIELDS
+
+    def iter_export_pages(self, *args, **kwargs):
+        for count, page in enumerate(self.store.iter_export_pages(*args, **kwargs)):
+            if count == self.fail_after:
+                raise RuntimeError("worker crashed")
+            yield page
+
+
+class TestPatientExporter:
+    def test_ndjson_export_applies_role_projection(self, tmp_path, record_store):
+        _populate(record_store, 5)
+        output = str(tmp_path / "export.ndjson")
+
+        result = PatientExporter(record_store, page_size=2).export(output, AccessRole.AGENT)
+
+        lines = [json.loads(line) for line in open(output, encoding="utf-8")]
+        assert result.records == 5
+        assert [line["patient_id"] for line in lines] == [f"patient-{i:03d}" for i in range(5)]
+        assert lines[0]["emergency_events"][0]["reason"] == "Chest pain"
+
+    def test_revoked_resources_are_dropped_from_export(self, tmp_path, record_store):
+        _populate(record_store, 2)
+        record_store.privacy_policy.revoke(AccessRole.PATIENT, DataResource.INSURANCE, AccessLevel.READ)
+        output = str(tmp_path / "export.ndjson")
+
+        PatientExporter(record_store).export(output, AccessRole.PATIENT)
+
+        first = json.loads(open(output, encoding="utf-8").readline())
+        assert "insurance" not in first
+        assert first["medications"] == ["med-0"]
+
+    def test_resume_after_crash_from_sqlite(self, tmp_path):
+        store = SQLiteClinicalRecordStore(db_path=":memory:")
+        _populate(store, 7)
+        output = str(tmp_path / "export.ndjson.gz")
+
+        with pytest.raises(RuntimeError):
+            PatientExporter(FlakyStore(store, fail_after=2), page_size=3).export(output, AccessRole.DOCTOR)
+        result = PatientExporter(store, page_size=3).export(output, AccessRole.DOCTOR)
+
+        with gzip.open(output, "rt", encoding="utf-8") as handle:
+            lines = [json.loads(line) for line in handle]
+        assert result.records == 7
+        assert [line["patient_id"] for line in lines] == [f"patient-{i:03d}" for i in range(7)]
+        assert lines[0]["insurance"] == {"provider": "Acme Health"}
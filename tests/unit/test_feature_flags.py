@@ -0,0 +1,106 @@
+"""Unit tests for feature flag evaluation and orchestrator stage pruning."""
+
+import json
+import logging
+
+import pytest
+
+from src.agent.orchestrator import AgentOrchestrator
+from src.clients.encounter_wal import EncounterWAL
+from src.core.feature_flags import FeatureFlags
+
+
+def _orchestrator(audit_logger, flags, agent_id="clinic-a", **kwargs):
+    return AgentOrchestrator(agent_id=agent_id, audit_logger=audit_logger, feature_flags=FeatureFlags(flags), **kwargs)
+
+
+class TestFeatureFlags:
+    def test_repository_flags_enable_every_stage(self):
+        flags = FeatureFlags.from_file("configs/ai-med-agent/feature-flags.json")
+        assert all(flags.snapshot().values())
+        assert flags.is_enabled("unknown_flag") is True
+        assert flags.is_enabled("unknown_flag", default=False) is False
+
+    def test_rollout_and_tenant_overrides(self):
+        flags = FeatureFlags(
+            {
+                "values": {
+                    "ml_recommendations": {
+                        "enabled": True,
+                        "rollout_percentage": 25,
+                        "tenants": {"clinic-beta": True, "clinic-opt-out": False},
+                    },
+                    "incident_mode": {"enabled": False, "tenants": {"clinic-pilot": True}},
+                }
+            }
+        )
+        enabled = sum(flags.is_enabled("ml_recommendations", key=f"enc-{index}") for index in range(2000))
+        assert 400 < enabled < 600
+        assert flags.is_enabled("ml_recommendations", key="enc-7") == flags.is_enabled("ml_recommendations", key="enc-7")
+        assert flags.is_enabled("ml_recommendations", tenant_id="clinic-beta", key="enc-7") is True
+        assert flags.is_enabled("ml_recommendations", tenant_id="clinic-opt-out") is False
+        assert flags.is_enabled("incident_mode", tenant_id="clinic-pilot") is True
+        assert flags.is_enabled("incident_mode", tenant_id="clinic-a") is False
+
+    def test_appconfig_retrieved_document(self, caplog):
+        # Body of GetLatestConfiguration for an AWS.AppConfig.FeatureFlags profile.
+        body = b'{"autonomous_clinical_support":{"enabled":true},"emergency_risk_detection":{"enabled":false},"ml_recommendations":{"enabled":true,"rollout_percentage":0}}'
+        flags = FeatureFlags(json.loads(body))
+        assert flags.snapshot() == {
+            "autonomous_clinical_support": True,
+            "emergency_risk_detection": False,
+            "ml_recommendations": False,
+        }
+
+        flags.load({"features": {"auto_remediation": {"enabled": False, "description": "Remediate"}}})
+        assert flags.snapshot() == {"auto_remediation": False}
+
+        with caplog.at_level(logging.WARNING, logger="src.core.feature_flags"):
+            flags.load({"version": "1", "toggles": [{"name": "emergency_risk_detection", "enabled": False}]})
+        assert flags.snapshot() == {}
+        assert "contains no flags" in caplog.text
+
+
+class TestOrchestratorStagePruning:
+    def test_disabled_agents_are_skipped(self, audit_logger, patient_profile):
+        orchestrator = _orchestrator(
+            audit_logger, {"flags": {"monitoring_agent": {"enabled": False}, "follow_up_agent": {"enabled": False}}}
+        )
+        encounter = orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        result = orchestrator.finalize_encounter(encounter)
+        assert set(result["agent_tasks"]) == {"triage", "diagnosis", "documentation"}
+
+        orchestrator.feature_flags.load({"flags": {"multi_agent_orchestration": {"enabled": False}}})
+        encounter = orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        assert orchestrator.finalize_encounter(encounter)["agent_tasks"] == {}
+
+    def test_tenant_override_turns_off_recommendations(self, audit_logger, patient_profile):
+        flags = {"flags": {"autonomous_clinical_support": {"enabled": True, "tenants": {"clinic-b": False}}}}
+        for agent_id, expected in (("clinic-a", True), ("clinic-b", False)):
+            orchestrator = _orchestrator(audit_logger, flags, agent_id=agent_id)
+            encounter = orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+            orchestrator.ingest_transcript_chunk(encounter, "Patient reports fever and cough.")
+            assert bool(orchestrator.finalize_encounter(encounter)["recommendations"]) is expected
+
+    def test_realtime_extraction_is_deferred_to_finalize(self, audit_logger, patient_profile, tmp_path):
+        wal_path = str(tmp_path / "encounters.wal")
+        flags = {"flags": {"realtime_transcription": {"enabled": False}}}
+        orchestrator = _orchestrator(audit_logger, flags, encounter_wal=EncounterWAL(wal_path))
+        encounter = orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        orchestrator.ingest_transcript_chunk(encounter, "Patient reports fever.")
+        assert encounter.observations == []
+        assert encounter.deferred_chunks == [0]
+
+        recovered = _orchestrator(audit_logger, flags, encounter_wal=EncounterWAL(wal_path)).recovered_encounters
+        assert recovered[0].deferred_chunks == [0]
+
+        result = orchestrator.finalize_encounter(encounter)
+        assert result["soap_note"]["symptoms"] == ["fever"]
+        assert encounter.deferred_chunks == []
+
+    def test_emergency_risk_detection_flag(self, audit_logger, patient_profile):
+        orchestrator = _orchestrator(audit_logger, {"flags": {"emergency_risk_detection": {"enabled": False}}})
+        encounter = orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        assert orchestrator.recommend_emergency_action(encounter, severity="high", reason="chest pain") is None
+        event = orchestrator.trigger_emergency_call(encounter, initiated_by="patient-123", reason="chest pain", confirmed=True)
+        assert event.confirmed is True
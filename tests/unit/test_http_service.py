@@ -0,0 +1,200 @@
+"""Unit tests for the orchestrator HTTP service."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.agent.http_service import OrchestratorService, bearer_token_authorizer
+from src.agent.orchestrator import AgentOrchestrator
+from src.clients.encounter_wal import EncounterWAL
+from src.core.audit import AuditQuery
+
+
+TOKEN = "test-token"
+AUTHORIZED = [(b"authorization", f"Bearer {TOKEN}".encode())]
+
+
+def _allow(scope):
+    return True
+
+
+def _request(app, method, path, body=None, headers=AUTHORIZED, raw=None):
+    payload = raw if raw is not None else json.dumps(body).encode() if body is not None else b""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({"type": "http", "method": method, "path": path, "headers": headers}, receive, send))
+    start, response = messages
+    headers = dict(start["headers"])
+    return start["status"], headers, json.loads(response["body"])
+
+
+@pytest.fixture
+def start_body(patient_profile):
+    return {
+        "patient_profile": {
+            "patient_id": patient_profile.patient_id,
+            "name": patient_profile.name,
+            "medications": patient_profile.medications,
+            "allergies": patient_profile.allergies,
+        },
+        "clinician_id": "clin-1",
+        "consent_granted": True,
+    }
+
+
+@pytest.fixture
+def service(audit_logger):
+    app = OrchestratorService(
+        AgentOrchestrator(audit_logger=audit_logger),
+        max_concurrent_encounters=2,
+        authorize=bearer_token_authorizer(TOKEN),
+        max_body_bytes=4096,
+    )
+    yield app
+    app.close()
+
+
+class TestOrchestratorService:
+    def test_encounter_lifecycle(self, service, start_body):
+        status, _, created = _request(service, "POST", "/encounters", start_body)
+        assert status == 201
+        encounter_id = created["encounter_id"]
+
+        status, _, _ = _request(service, "POST", f"/encounters/{encounter_id}/chunks", {"text": "Patient reports fever."})
+        assert status == 202
+
+        status, _, recommendation = _request(
+            service, "POST", f"/encounters/{encounter_id}/emergency/recommendation", {"reason": "chest pain"}
+        )
+        assert status == 200
+        assert recommendation["reason"] == "chest pain"
+
+        status, _, result = _request(service, "POST", f"/encounters/{encounter_id}/finalize")
+        assert status == 200
+        assert result["soap_note"]["symptoms"] == ["fever"]
+
+        status, _, _ = _request(service, "POST", f"/encounters/{encounter_id}/finalize")
+        assert status == 404
+        assert service.health()["open_encounters"] == 0
+
+    def test_request_errors(self, service, start_body):
+        start_body["consent_granted"] = False
+        assert _request(service, "POST", "/encounters", start_body)[0] == 403
+        assert _request(service, "POST", "/encounters", {"clinician_id": "clin-1"})[0] == 400
+        assert _request(service, "GET", "/encounters")[0] == 405
+        assert _request(service, "GET", "/unknown")[0] == 404
+        assert _request(service, "POST", "/encounters", raw=b"not json")[0] == 400
+        for payload in ([], "x", 3):
+            status, _, body = _request(service, "POST", "/encounters", payload)
+            assert (status, body["error"]) == (400, "Request body must be a JSON object")
+
+    def test_routes_require_authorization(self, service, start_body, audit_logger):
+        wrong = [(b"authorization", b"Bearer nope")]
+        assert _request(service, "GET", "/patients/p-1/view", headers=[])[0] == 401
+        assert _request(service, "GET", "/patients/p-1/view", headers=wrong)[0] == 401
+        assert _request(service, "POST", "/encounters", start_body, headers=[])[0] == 401
+        assert _request(service, "GET", "/health", headers=[])[0] == 200
+        assert _request(service, "GET", "/patients/p-1/view")[0] == 200
+
+        default = OrchestratorService(AgentOrchestrator(audit_logger=audit_logger))
+        assert _request(default, "GET", "/patients/p-1/view")[0] == 401
+        default.close()
+
+    def test_oversized_body_returns_413(self, service, start_body):
+        start_body["clinician_id"] = "x" * 5000
+        assert _request(service, "POST", "/encounters", start_body)[0] == 413
+        assert service.health()["open_encounters"] == 0
+
+    def test_encounter_limit_returns_429(self, service, start_body):
+        for _ in range(2):
+            assert _request(service, "POST", "/encounters", start_body)[0] == 201
+
+        status, headers, _ = _request(service, "POST", "/encounters", raw=b"[" * 10000)
+        assert status == 429
+        assert headers[b"retry-after"] == b"1"
+        assert service.health()["rejected_encounters"] == 1
+
+    def test_delete_abandons_encounter(self, service, start_body, audit_logger):
+        encounter_id = _request(service, "POST", "/encounters", start_body)[2]["encounter_id"]
+
+        status, _, body = _request(service, "DELETE", f"/encounters/{encounter_id}", {"reason": "patient left"})
+        assert (status, body["status"]) == (200, "abandoned")
+        assert _request(service, "DELETE", f"/encounters/{encounter_id}")[0] == 404
+        assert service.health()["open_encounters"] == 0
+        abandoned = list(audit_logger.query(AuditQuery(action="encounter_abandoned")))
+        assert abandoned[0].metadata["reason"] == "patient left"
+
+    def test_idle_encounters_release_their_slots(self, audit_logger, start_body):
+        app = OrchestratorService(
+            AgentOrchestrator(audit_logger=audit_logger),
+            max_concurrent_encounters=2,
+            idle_timeout_seconds=0.05,
+            authorize=_allow,
+        )
+        idle = [_request(app, "POST", "/encounters", start_body)[2]["encounter_id"] for _ in range(2)]
+        time.sleep(0.1)
+
+        assert _request(app, "POST", "/encounters", start_body)[0] == 201
+        assert app.health()["expired_encounters"] == 2
+        assert _request(app, "POST", f"/encounters/{idle[0]}/chunks", {"text": "Still there?"})[0] == 404
+        app.close()
+
+    def test_recovered_encounters_are_served(self, audit_logger, patient_profile, tmp_path):
+        wal_path = str(tmp_path / "encounters.wal")
+        before = AgentOrchestrator(audit_logger=audit_logger, encounter_wal=EncounterWAL(wal_path))
+        encounter = before.start_encounter(patient_profile, "clin-1", consent_granted=True)
+
+        app = OrchestratorService(
+            AgentOrchestrator(audit_logger=audit_logger, encounter_wal=EncounterWAL(wal_path)), authorize=_allow
+        )
+        assert app.health()["open_encounters"] == 1
+        status, _, _ = _request(app, "POST", f"/encounters/{encounter.encounter_id}/chunks", {"text": "Fever."})
+        app.close()
+        assert status == 202
+
+    def test_full_queue_returns_503(self):
+        release = threading.Event()
+
+        class SlowOrchestrator:
+            def get_patient_view(self, patient_id):
+                release.wait(5)
+                return {"patient_id": patient_id}
+
+        app = OrchestratorService(SlowOrchestrator(), workers=1, max_queue=1, retry_after_seconds=3, authorize=_allow)
+        read = []
+
+        async def scenario():
+            async def call(path):
+                messages = []
+
+                async def receive():
+                    read.append(path)
+                    return {"type": "http.request", "body": b""}
+
+                async def send(message):
+                    messages.append(message)
+
+                await app({"type": "http", "method": "GET", "path": path}, receive, send)
+                return messages[0]
+
+            held = [asyncio.ensure_future(call("/patients/p-1/view")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            rejected = await call("/patients/p-2/view")
+            release.set()
+            return rejected, await asyncio.gather(*held)
+
+        rejected, accepted = asyncio.run(scenario())
+        app.close()
+        assert rejected["status"] == 503
+        assert dict(rejected["headers"])[b"retry-after"] == b"3"
+        assert [start["status"] for start in accepted] == [200, 200]
+        assert "/patients/p-2/view" not in read
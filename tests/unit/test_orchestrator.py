@@ -1,7 +1,8 @@
 """Unit tests for clinical agent orchestrator."""
 
 import pytest
-from src.core.state import AgentStatus
+from src.core.clinical import CompactObservation
+from src.core.state import AgentStatus, DecisionOutcome, StateManager
 
 
 class TestAgentOrchestrator:
@@ -41,6 +42,31 @@ class TestAgentOrchestrator:
         assert result["soap_note"]["symptoms"]
         assert len(result["recommendations"]) >= 1
 
+    def test_history_observations_reference_transcript(self, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports cough.")
+        agent_orchestrator.ingest_transcript_chunk(encounter, "History of hypertension.")
+
+        history = [obs for obs in encounter.observations if obs.category == "history"]
+        assert history[0].value is encounter.transcript[1]
+        assert history[0].to_dict()["span"] == [1, 0, len("History of hypertension.")]
+        assert history[0].resolve(encounter.transcript) == "History of hypertension."
+
+        result = agent_orchestrator.finalize_encounter(encounter)
+        assert result["soap_note"]["history"] == ["History of hypertension."]
+
+    def test_compact_observations_round_trip(self, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports cough. History of asthma.")
+
+        compact = [CompactObservation.from_record(obs) for obs in encounter.observations]
+
+        assert [obs.to_record() for obs in compact] == encounter.observations
+        assert all(isinstance(obs.timestamp_us, int) for obs in compact)
+        assert [obs.resolve(encounter.transcript) for obs in compact] == [
+            obs.resolve(encounter.transcript) for obs in encounter.observations
+        ]
+
     def test_patient_read_only_view(self, agent_orchestrator, patient_profile):
         encounter = agent_orchestrator.start_encounter(
             patient_profile=patient_profile,
@@ -129,3 +155,108 @@ class TestStateManager:
         assert state_manager.action_history[0].status == "failed"
         assert state_manager.metrics["actions_failed"] == 1
         assert len(state_manager.errors) == 1
+
+    def test_history_spills_to_disk_segments(self, tmp_path):
+        state_manager = StateManager("spill-agent", max_history=4, spill_dir=str(tmp_path), segment_size=2)
+        for index in range(10):
+            state_manager.log_decision(f"decision-{index}", DecisionOutcome.PROCEED, "ok")
+            action = state_manager.create_action("task", f"task-{index}", {"index": index})
+            state_manager.queue_action(action)
+            state_manager.fail_action(f"error-{index}")
+
+        assert len(state_manager.decision_log) <= 4
+        summary = state_manager.get_state_summary()
+        assert summary["total_decisions"] == 10
+        assert summary["total_actions"] == 10
+        assert summary["errors"][-1] == "error-9"
+
+        history = state_manager.export_history()
+        assert [decision["type"] for decision in history["decisions"]] == [f"decision-{i}" for i in range(10)]
+        assert [action["parameters"]["index"] for action in history["actions"]] == list(range(10))
+        assert history["errors"] == [f"error-{i}" for i in range(10)]
+        assert len(list(tmp_path.iterdir())) == 9
+
+    def test_spill_segments_survive_a_restart(self, tmp_path):
+        for run in range(2):
+            state_manager = StateManager("spill-agent", max_history=2, spill_dir=str(tmp_path), segment_size=1)
+            for index in range(3):
+                state_manager.log_decision(f"run-{run}-{index}", DecisionOutcome.PROCEED, "ok")
+
+        assert len(list(tmp_path.iterdir())) == 2
+        assert [decision["type"] for decision in state_manager.export_history()["decisions"]] == [
+            "run-1-0",
+            "run-1-1",
+            "run-1-2",
+        ]
+
+    def test_history_without_spill_dir_drops_oldest(self):
+        state_manager = StateManager("bounded-agent", max_history=3, segment_size=1)
+        for index in range(5):
+            state_manager.log_decision(f"decision-{index}", DecisionOutcome.SKIP, "skip")
+
+        history = state_manager.export_history()
+        assert [decision["type"] for decision in history["decisions"]] == ["decision-2", "decision-3", "decision-4"]
+        assert history["dropped"]["decisions"] == 2
+        assert state_manager.get_state_summary()["total_decisions"] == 5
+
+    def test_partitions_keep_concurrent_encounters_apart(self, state_manager):
+        first = state_manager.partition("enc-1")
+        second = state_manager.partition("enc-2")
+        first.set_status(AgentStatus.EVALUATING)
+        first.queue_action(state_manager.create_action("task", "first", {}))
+        second.queue_action(state_manager.create_action("task", "second", {}))
+        second.fail_action("timeout")
+        first.complete_action(result="ok")
+        first.log_decision("clinical_support", DecisionOutcome.REQUIRE_APPROVAL, "review")
+
+        assert first.current_action.status == "completed"
+        assert second.current_action.status == "failed"
+        summary = state_manager.get_state_summary()
+        assert summary["active_encounters"] == {"evaluating": 1, "idle": 1}
+        assert summary["metrics"]["actions_executed"] == 1
+        assert summary["metrics"]["actions_failed"] == 1
+        assert state_manager.decision_log[0]["encounter_id"] == "enc-1"
+
+        state_manager.release("enc-1")
+        assert state_manager.get_state_summary()["active_encounters"] == {"idle": 1}
+
+    def test_parallel_finalization_aggregates_metrics(self, agent_orchestrator, patient_profile):
+        from concurrent.futures import ThreadPoolExecutor
+
+        encounters = [
+            agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+            for _ in range(8)
+        ]
+        for encounter in encounters:
+            agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports fatigue.")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(agent_orchestrator.finalize_encounter, encounters))
+
+        summary = agent_orchestrator.get_state_summary()
+        assert summary["metrics"]["actions_executed"] == 8
+        assert summary["total_decisions"] == 8
+        assert summary["active_encounters"] == {}
+
+    def test_write_history_streams_filtered_ndjson(self, tmp_path):
+        import io
+        import json
+
+        state_manager = StateManager("stream-agent", max_history=2, spill_dir=str(tmp_path), segment_size=1)
+        for index in range(4):
+            outcome = DecisionOutcome.ABORT if index % 2 else DecisionOutcome.PROCEED
+            state_manager.log_decision("consent_check", outcome, f"reason-{index}")
+            state_manager.queue_action(state_manager.create_action("task", f"task-{index}", {}))
+            state_manager.fail_action(f"error-{index}")
+
+        stream = io.StringIO()
+        count = state_manager.write_history(stream, outcome=DecisionOutcome.ABORT)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert count == 2
+        assert [record["reasoning"] for record in records] == ["reason-1", "reason-3"]
+        assert {record["kind"] for record in records} == {"decision"}
+
+        newest = state_manager.decision_log[-1]["timestamp"]
+        recent = list(state_manager.iter_history(start=newest))
+        assert {record["kind"] for record in recent} <= {"action", "decision"}
+        assert any(record.get("reasoning") == "reason-3" for record in recent)
+        assert len(list(state_manager.iter_history(kinds=["errors"]))) == 4
@@ -0,0 +1,53 @@
+"""Unit tests for compiled privacy projection plans."""
+
+from src.core.privacy import PrivacyPolicy, AccessRole, DataResource, AccessLevel
+
+
+FIELD_MAP = {
+    DataResource.MEDICATIONS: "medications",
+    DataResource.CLINICAL_NOTES: "soap_note",
+}
+
+
+class TestProjectionPlans:
+    def test_plans_are_compiled_once_and_match_can_access(self):
+        policy = PrivacyPolicy()
+
+        plan = policy.plan(AccessRole.PATIENT, AccessLevel.READ)
+
+        assert policy.plan(AccessRole.PATIENT, AccessLevel.READ) is plan
+        for resource in DataResource:
+            assert plan.allows(resource) == (resource in policy._read_permissions[AccessRole.PATIENT])
+
+    def test_project_many_filters_batches(self):
+        policy = PrivacyPolicy()
+        records = [
+            {"patient_id": "p1", "medications": ["a"], "soap_note": {"plan": []}},
+            {"patient_id": "p2", "medications": ["b"], "soap_note": {"plan": []}},
+        ]
+
+        projected = list(
+            policy.plan(AccessRole.PATIENT, AccessLevel.READ).project_many(records, FIELD_MAP, keep=("patient_id",))
+        )
+
+        assert projected == [
+            {"patient_id": "p1", "medications": ["a"]},
+            {"patient_id": "p2", "medications": ["b"]},
+        ]
+
+    def test_policy_change_recompiles_and_rematerializes(self, record_store, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        record_store.store_encounter(encounter)
+        policy = record_store.privacy_policy
+        notified = []
+        policy.add_listener(notified.append)
+        before = policy.plan(AccessRole.PATIENT, AccessLevel.READ)
+
+        policy.revoke(AccessRole.PATIENT, DataResource.INSURANCE, AccessLevel.READ)
+
+        after = policy.plan(AccessRole.PATIENT, AccessLevel.READ)
+        assert after is not before
+        assert not after.allows(DataResource.INSURANCE)
+        assert notified == [policy]
+        view = record_store.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.READ)
+        assert view["insurance"] is None
@@ -0,0 +1,48 @@
+"""Unit tests for the lazy provider registry."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.agent.orchestrator import AgentOrchestrator
+from src.clients.clinical_services import ClinicalNLPService
+from src.clients.providers import PROVIDERS, ProviderException, load_provider, register_provider, selected_provider
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class KeywordNLPService(ClinicalNLPService):
+    pass
+
+
+@pytest.fixture
+def custom_nlp_provider():
+    register_provider("AI_MED_AGENT_NLP_PROVIDER", "keyword", f"{__name__}:KeywordNLPService")
+    yield
+    PROVIDERS["AI_MED_AGENT_NLP_PROVIDER"].pop("keyword")
+
+
+class TestProviderRegistry:
+    def test_local_startup_does_not_import_boto3(self, tmp_path):
+        probe = "import sys; import src; src.AgentOrchestrator(); print('boto3' in sys.modules)"
+        env = dict(os.environ, PYTHONPATH=str(ROOT))
+        for variable in PROVIDERS:
+            env.pop(variable, None)
+        output = subprocess.run(
+            [sys.executable, "-c", probe], cwd=tmp_path, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        assert output.strip() == "False"
+
+    def test_registered_provider_is_selected_by_env(self, monkeypatch, custom_nlp_provider, audit_logger):
+        monkeypatch.setenv("AI_MED_AGENT_NLP_PROVIDER", "Keyword")
+        orchestrator = AgentOrchestrator(audit_logger=audit_logger)
+        assert type(orchestrator.nlp_service) is KeywordNLPService
+
+    def test_unknown_provider_falls_back_to_default(self, monkeypatch):
+        monkeypatch.setenv("AI_MED_AGENT_RECORD_STORE", "cassandra")
+        assert selected_provider("AI_MED_AGENT_RECORD_STORE", "local") == "local"
+        with pytest.raises(ProviderException):
+            load_provider("AI_MED_AGENT_RECORD_STORE", "cassandra")
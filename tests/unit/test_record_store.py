@@ -0,0 +1,366 @@
+"""Unit tests for clinical record store backends."""
+
+import threading
+
+import pytest
+
+from src.clients.dynamodb_store import DynamoDBClinicalRecordStore, EncodedEncounter
+from src.clients.record_store import ClinicalRecordStore, EncounterSummary, FrozenDict, FrozenList
+from src.clients.sqlite_store import SQLiteClinicalRecordStore
+from src.core.emergency import EmergencyEvent
+from src.core.privacy import AccessRole, AccessLevel, PrivacyPolicy
+
+
+class FakeEncounterTable:
+    """Records query requests and serves pre-baked pages."""
+
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def query(self, **request):
+        self.requests.append(dict(request))
+        return self.pages.pop(0)
+
+
+def _item(encounter_id, created_at):
+    return {"patient_id": "patient-123", "encounter_id": encounter_id, "created_at": created_at, "clinician_id": "clin-1"}
+
+
+class TestDynamoDBPatientQueries:
+    def _store(self, pages, **kwargs):
+        store = DynamoDBClinicalRecordStore(table_name="encounters", **kwargs)
+        store.table = FakeEncounterTable(pages)
+        return store
+
+    def test_follows_last_evaluated_key(self):
+        store = self._store(
+            [
+                {"Items": [_item("enc-1", "2026-01-01")], "LastEvaluatedKey": {"patient_id": "patient-123"}},
+                {"Items": [_item("enc-2", "2026-01-02")]},
+            ]
+        )
+
+        view = store.get_patient_view("patient-123", AccessRole.DOCTOR, AccessLevel.READ)
+
+        assert [item["encounter_id"] for item in view["encounters"]] == ["enc-1", "enc-2"]
+        assert store.table.requests[1]["ExclusiveStartKey"] == {"patient_id": "patient-123"}
+        assert store.table.requests[0]["ScanIndexForward"] is True
+
+    def test_limited_view_keeps_ascending_order(self):
+        store = self._store([{"Items": [_item("enc-3", "2026-01-03"), _item("enc-2", "2026-01-02")]}])
+
+        view = store.get_patient_view("patient-123", AccessRole.DOCTOR, AccessLevel.READ, limit=2)
+
+        assert [item["encounter_id"] for item in view["encounters"]] == ["enc-2", "enc-3"]
+        assert store.table.requests[0]["ScanIndexForward"] is False
+
+    def test_patient_projection_excludes_clinical_attributes(self):
+        store = self._store([{"Items": []}, {"Items": []}])
+
+        list(store.iter_encounters("patient-123", AccessRole.PATIENT, AccessLevel.READ))
+        list(store.iter_encounters("patient-123", AccessRole.DOCTOR, AccessLevel.READ))
+
+        patient_attributes = set(store.table.requests[0]["ExpressionAttributeNames"].values())
+        doctor_attributes = set(store.table.requests[1]["ExpressionAttributeNames"].values())
+        assert patient_attributes == set(DynamoDBClinicalRecordStore.BASE_ATTRIBUTES)
+        assert {"soap_note", "recommendations", "observations"} <= doctor_attributes
+
+    def test_limit_stops_paging(self):
+        store = self._store(
+            [{"Items": [_item("enc-3", "2026-01-03"), _item("enc-2", "2026-01-02")], "LastEvaluatedKey": {"k": 1}}],
+            page_size=2,
+        )
+
+        items = list(
+            store.iter_encounters(
+                "patient-123",
+                AccessRole.DOCTOR,
+                AccessLevel.READ,
+                start="2026-01-01",
+                limit=2,
+            )
+        )
+
+        assert len(items) == 2
+        assert len(store.table.requests) == 1
+        assert store.table.requests[0]["Limit"] == 2
+
+
+class RecordingPutTable:
+    def __init__(self):
+        self.items = []
+
+    def put_item(self, Item, **kwargs):
+        self.items.append(Item)
+        return {"ConsumedCapacity": {"CapacityUnits": 1.0}}
+
+
+class TestDynamoDBCompactEncoding:
+    def test_bulky_fields_round_trip_through_binary_attributes(self, agent_orchestrator, patient_profile):
+        from boto3.dynamodb.types import TypeSerializer
+
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports fever. History of asthma.")
+        agent_orchestrator.finalize_encounter(encounter)
+        store = DynamoDBClinicalRecordStore(table_name="encounters")
+        store.table = RecordingPutTable()
+
+        store.store_encounter(encounter)
+
+        item = store.table.items[0]
+        serializer = TypeSerializer()
+        assert all(serializer.serialize(value) for value in item.values())  # floats no longer reach the serializer
+        assert isinstance(item["observations"], bytes)
+        assert store.consumed_capacity["write"] == 1.0
+
+        decoded = EncodedEncounter(item)
+        assert decoded["encounter_id"] == encounter.encounter_id
+        assert decoded["observations"][0]["confidence"] == 0.7
+        assert decoded["soap_note"]["symptoms"] == ["fever"]
+
+    def test_history_observations_keep_their_text_after_a_round_trip(self, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports fever. History of asthma.")
+        agent_orchestrator.finalize_encounter(encounter)
+        assert any(obs.span is not None for obs in encounter.observations)
+        store = DynamoDBClinicalRecordStore(table_name="encounters")
+        store.table = RecordingPutTable()
+        store.store_encounter(encounter)
+
+        store.table = FakeEncounterTable([{"Items": store.table.items}])
+        view = store.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)
+
+        assert isinstance(view, FrozenDict) and isinstance(view["encounters"][0], FrozenDict)
+        with pytest.raises(TypeError):
+            view["encounters"][0]["soap_note"]["symptoms"].append("rash")
+        observations = view["encounters"][0]["observations"]
+        assert [obs["value"] for obs in observations] == [
+            obs.resolve(encounter.transcript) for obs in encounter.observations
+        ]
+        assert all(obs["span"] is None for obs in observations)
+
+
+class TestSQLiteClinicalRecordStore:
+    def _finalized(self, agent_orchestrator, patient_profile, chunk):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, chunk)
+        agent_orchestrator.finalize_encounter(encounter)
+        return encounter
+
+    def test_patient_view_survives_reopen(self, tmp_path, agent_orchestrator, patient_profile):
+        db_path = str(tmp_path / "records.db")
+        store = SQLiteClinicalRecordStore(db_path=db_path)
+        encounter = self._finalized(agent_orchestrator, patient_profile, "Patient reports fever.")
+        store.store_encounter(encounter)
+        store.record_emergency_event(
+            EmergencyEvent(
+                encounter_id=encounter.encounter_id,
+                patient_id=patient_profile.patient_id,
+                initiated_by="patient-123",
+                reason="Chest pain",
+                confirmed=True,
+            )
+        )
+        store.close()
+
+        reopened = SQLiteClinicalRecordStore(db_path=db_path)
+        view = reopened.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.READ)
+
+        assert view["medications"] == patient_profile.medications
+        assert view["insurance"] == patient_profile.insurance
+        assert view["emergency_events"][0]["reason"] == "Chest pain"
+        payload = reopened.get_encounter_payload(encounter.encounter_id)
+        assert payload["soap_note"]["symptoms"] == ["fever"]
+
+    def test_views_are_frozen_and_follow_other_connections(self, tmp_path, agent_orchestrator, patient_profile):
+        db_path = str(tmp_path / "records.db")
+        store = SQLiteClinicalRecordStore(db_path=db_path)
+        other = SQLiteClinicalRecordStore(db_path=db_path)
+        store.store_encounter(self._finalized(agent_orchestrator, patient_profile, "Patient reports fever."))
+
+        view = store.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)
+        assert isinstance(view, FrozenDict)
+        assert store.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ) is view
+        with pytest.raises(TypeError):
+            view["medications"].append("med-2")
+
+        other.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)
+        patient_profile.medications = ["med-2"]
+        later = self._finalized(agent_orchestrator, patient_profile, "Patient reports cough.")
+        later.created_at = "2999-01-01T00:00:00"
+        store.store_encounter(later)
+        assert other.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)["medications"] == [
+            "med-2"
+        ]
+
+    def test_batched_writes_and_index_queries(self, agent_orchestrator, patient_profile):
+        store = SQLiteClinicalRecordStore(db_path=":memory:")
+        encounters = [
+            self._finalized(agent_orchestrator, patient_profile, "Patient reports cough."),
+            self._finalized(agent_orchestrator, patient_profile, "Patient reports headache."),
+        ]
+        encounters[0].created_at = "2026-01-01T09:00:00"
+        encounters[1].created_at = "2026-01-02T09:00:00"
+
+        store.store_encounters(encounters)
+
+        latest = list(store.iter_encounter_summaries(patient_id=patient_profile.patient_id, limit=1))
+        assert latest[0].encounter_id == encounters[1].encounter_id
+        by_clinician = list(store.iter_encounter_summaries(clinician_id="clin-1", end="2026-01-01T23:59:59"))
+        assert [summary.encounter_id for summary in by_clinician] == [encounters[0].encounter_id]
+        assert store.get_patient_view("unknown", AccessRole.PATIENT, AccessLevel.READ)["medications"] == []
+
+
+class TestMaterializedPatientViews:
+    def test_views_are_materialized_on_write_and_immutable(self, record_store, agent_orchestrator, patient_profile):
+        import json
+        import pytest
+
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        record_store.store_encounter(encounter)
+
+        first = record_store.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.READ)
+        second = record_store.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.READ)
+        assert first is second
+        assert json.loads(json.dumps(first))["medications"] == patient_profile.medications
+        with pytest.raises(TypeError):
+            first["medications"].append("med-2")
+
+        record_store.record_emergency_event(
+            EmergencyEvent(
+                encounter_id=encounter.encounter_id,
+                patient_id=patient_profile.patient_id,
+                initiated_by="patient-123",
+                reason="Dizziness",
+                confirmed=True,
+            )
+        )
+        updated = record_store.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.READ)
+        assert [event["reason"] for event in updated["emergency_events"]] == ["Dizziness"]
+        assert first["emergency_events"] == []
+
+    def test_views_survive_pickling(self, record_store, agent_orchestrator, patient_profile):
+        import copy
+        import pickle
+
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        record_store.store_encounter(encounter)
+        view = record_store.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)
+
+        for restored in (pickle.loads(pickle.dumps(view)), copy.deepcopy(view)):
+            assert restored == view
+            assert isinstance(restored, FrozenDict) and isinstance(restored["medications"], FrozenList)
+            with pytest.raises(TypeError):
+                restored["medications"].append("med-2")
+
+    def test_write_access_level_views_follow_policy(self, record_store, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        record_store.store_encounter(encounter)
+
+        view = record_store.get_patient_view(patient_profile.patient_id, AccessRole.PATIENT, AccessLevel.WRITE)
+
+        assert view["medications"] == []
+        assert view["insurance"] is None
+
+
+class KeyedEncounterTable:
+    """Stores put items and answers ``patient_id``/``created_at`` key-condition queries."""
+
+    def __init__(self):
+        self.items = []
+
+    def put_item(self, Item, **kwargs):
+        self.items.append(Item)
+        return {}
+
+    def query(self, KeyConditionExpression, ScanIndexForward, Limit, ExpressionAttributeNames, **kwargs):
+        conditions = [KeyConditionExpression]
+        if KeyConditionExpression.expression_operator == "AND":
+            conditions = list(KeyConditionExpression.get_expression()["values"])
+        tests = {
+            "=": lambda value, bound: value == bound[0],
+            ">=": lambda value, bound: value >= bound[0],
+            "<=": lambda value, bound: value <= bound[0],
+            "BETWEEN": lambda value, bound: bound[0] <= value <= bound[1],
+        }
+
+        def matches(item):
+            for condition in conditions:
+                key, *bound = condition.get_expression()["values"]
+                if not tests[condition.expression_operator](item[key.name], bound):
+                    return False
+            return True
+
+        items = [item for item in self.items if matches(item)]
+        items.sort(key=lambda item: item["created_at"], reverse=not ScanIndexForward)
+        attributes = ExpressionAttributeNames.values()
+        return {"Items": [{name: item[name] for name in attributes if name in item} for item in items[:Limit]]}
+
+
+def _dynamodb_store():
+    store = DynamoDBClinicalRecordStore(table_name="encounters")
+    store.table = KeyedEncounterTable()
+    return store
+
+
+class TestEncounterTimeline:
+    def _encounter(self, agent_orchestrator, patient_profile, created_at):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        encounter.created_at = created_at
+        return encounter
+
+    @pytest.mark.parametrize(
+        "build_store",
+        [
+            lambda: ClinicalRecordStore(PrivacyPolicy()),
+            lambda: SQLiteClinicalRecordStore(db_path=":memory:"),
+            _dynamodb_store,
+        ],
+        ids=["memory", "sqlite", "dynamodb"],
+    )
+    def test_out_of_order_writes_are_kept_sorted(self, build_store, agent_orchestrator, patient_profile):
+        store = build_store()
+        encounters = {}
+        for created_at in ("2026-03-01", "2026-01-01", "2026-02-01", "2026-04-01"):
+            encounters[created_at] = self._encounter(agent_orchestrator, patient_profile, created_at)
+            store.store_encounter(encounters[created_at])
+
+        between = store.encounters_between(patient_profile.patient_id, "2026-01-15", "2026-03-01")
+        latest = store.latest_encounters(patient_profile.patient_id, 2)
+
+        assert between == [EncounterSummary.of(encounters["2026-02-01"]), EncounterSummary.of(encounters["2026-03-01"])]
+        assert [summary.created_at for summary in latest] == ["2026-04-01", "2026-03-01"]
+        assert latest[0].encounter_id == encounters["2026-04-01"].encounter_id
+        assert latest[0].clinician_id == "clin-1"
+        assert store.latest_encounters("unknown", 3) == []
+
+    def test_concurrent_writes_keep_timeline_and_views_consistent(self, record_store, agent_orchestrator, patient_profile):
+        encounters = [
+            self._encounter(agent_orchestrator, patient_profile, f"2026-01-{day:02d}") for day in range(28, 0, -1)
+        ]
+        threads = [
+            threading.Thread(target=lambda batch=encounters[index::4]: [record_store.store_encounter(e) for e in batch])
+            for index in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        between = record_store.encounters_between(patient_profile.patient_id)
+        assert [summary.created_at for summary in between] == sorted(encounter.created_at for encounter in encounters)
+        assert all(summary == EncounterSummary.of(encounter) for summary, encounter in zip(between, encounters[::-1]))
+        view = record_store.get_patient_view(patient_profile.patient_id, AccessRole.DOCTOR, AccessLevel.READ)
+        assert view["medications"] == patient_profile.medications
+
+    def test_dynamodb_range_uses_key_condition(self):
+        store = DynamoDBClinicalRecordStore(table_name="encounters")
+        store.table = FakeEncounterTable([{"Items": [_item("enc-1", "2026-01-01")]}])
+
+        store.encounters_between("patient-123", start="2026-01-01", end="2026-01-31")
+
+        request = store.table.requests[0]
+        assert request["ScanIndexForward"] is True
+        patient_key, time_range = request["KeyConditionExpression"].get_expression()["values"]
+        assert time_range.get_expression()["operator"] == "BETWEEN"
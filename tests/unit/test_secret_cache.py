@@ -0,0 +1,93 @@
+"""Unit tests for the process-wide secret cache."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.clients.config_manager import ConfigManager
+from src.utils import secrets
+from src.utils.secrets import SecretCache
+
+
+class FakeSecretsManager:
+    def __init__(self, value, block=None):
+        self.value = value
+        self.version = 1
+        self.block = block
+        self.fetches = 0
+        self.describes = 0
+
+    def rotate(self, value):
+        self.value = value
+        self.version += 1
+
+    def get_secret_value(self, SecretId, VersionStage):
+        if self.block is not None:
+            self.block.wait(5)
+        self.fetches += 1
+        return {"SecretString": json.dumps(self.value), "VersionId": f"v{self.version}", "ARN": SecretId}
+
+    def describe_secret(self, SecretId):
+        self.describes += 1
+        return {"VersionIdsToStages": {f"v{self.version}": ["AWSCURRENT"], "v0": ["AWSPREVIOUS"]}}
+
+    def get_paginator(self, operation):
+        assert operation == "list_secrets"
+        pages = [{"SecretList": [{"Name": "ai-med-agent/dev"}]}, {"SecretList": [{"Name": "ai-med-agent/prod"}]}]
+
+        class Paginator:
+            def paginate(self):
+                return iter(pages)
+
+        return Paginator()
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    cache = SecretCache(ttl_seconds=300)
+    client = FakeSecretsManager({"password": "s3cret"})
+    cache._clients["us-east-1"] = client
+    monkeypatch.setattr(secrets, "secret_cache", cache)
+    return cache, client
+
+
+class TestSecretCache:
+    def test_entry_points_share_one_fetch(self, shared_cache, monkeypatch):
+        cache, client = shared_cache
+        monkeypatch.setattr("src.clients.config_manager.secret_cache", cache)
+        manager = ConfigManager(background_polling=False)
+        manager.secrets_client = client
+
+        assert secrets.get_secret("ai-med-agent/db") == {"password": "s3cret"}
+        assert manager.get_secret("ai-med-agent/db") == {"password": "s3cret"}
+        assert client.fetches == 1
+
+        manager.get_secret("ai-med-agent/db", use_cache=False)
+        assert client.fetches == 2
+
+    def test_expired_entries_refetch_only_after_rotation(self, shared_cache):
+        cache, client = shared_cache
+        cache.ttl_seconds = 0
+        secrets.get_secret("ai-med-agent/db")
+        secrets.get_secret("ai-med-agent/db")
+        assert (client.fetches, client.describes) == (1, 1)
+
+        client.rotate({"password": "rotated"})
+        assert secrets.get_secret("ai-med-agent/db") == {"password": "rotated"}
+        assert (client.fetches, client.describes) == (2, 2)
+
+    def test_concurrent_misses_are_coalesced(self):
+        release = threading.Event()
+        client = FakeSecretsManager({"token": "abc"}, block=release)
+        cache = SecretCache()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(cache.get_secret_value, "api-key", client=client) for _ in range(8)]
+            threading.Timer(0.1, release.set).start()
+            responses = [future.result() for future in futures]
+        assert client.fetches == 1
+        assert all(response is responses[0] for response in responses)
+
+    def test_list_secrets_reads_every_page(self, shared_cache):
+        assert secrets.list_secrets() == ["ai-med-agent/dev", "ai-med-agent/prod"]
@@ -0,0 +1,73 @@
+"""Unit tests for the compiled serializers."""
+
+import json
+import zlib
+from datetime import datetime
+
+import pytest
+
+from src.clients.dynamodb_store import EncodedEncounter
+from src.core.audit import AuditQuery
+from src.core.clinical import ClinicalObservation, ClinicalRecommendation, EncounterContext, SOAPNote, TranscriptSpan
+from src.core.serialization import EncounterDocument, dumps, to_primitive
+
+
+def _encounter(patient_profile):
+    return EncounterContext(
+        encounter_id="enc-1",
+        patient_profile=patient_profile,
+        clinician_id="clin-1",
+        transcript=["History of asthma."],
+        observations=[
+            ClinicalObservation(category="history", value="", source="transcript", span=TranscriptSpan(0, 0, 18)),
+        ],
+        soap_note=SOAPNote(symptoms=["cough"]),
+        recommendations=[ClinicalRecommendation(title="Follow up", rationale="Routine")],
+    )
+
+
+class TestSerialization:
+    def test_compiled_encoders_match_to_dict(self, patient_profile):
+        encounter = _encounter(patient_profile)
+
+        assert to_primitive(encounter.soap_note) == encounter.soap_note.to_dict()
+        assert to_primitive(encounter.recommendations[0]) == encounter.recommendations[0].to_dict()
+        assert to_primitive(encounter.observations[0]) == encounter.observations[0].to_dict()
+        assert json.loads(dumps(encounter.observations[0])) == encounter.observations[0].to_dict()
+
+    def test_mappings_encode_as_objects_and_unknown_types_raise(self):
+        item = {
+            "encounter_id": "enc-1",
+            "encoding_version": 1,
+            "soap_note": zlib.compress(b'{"symptoms":["cough"]}'),
+        }
+
+        assert json.loads(dumps({"encounters": [EncodedEncounter(item)]})) == {
+            "encounters": [{"encounter_id": "enc-1", "encoding_version": 1, "soap_note": {"symptoms": ["cough"]}}]
+        }
+        with pytest.raises(TypeError):
+            to_primitive(datetime(2026, 1, 1))
+        with pytest.raises(TypeError):
+            dumps({"handle": object()})
+
+    def test_document_encodes_each_part_once(self, patient_profile):
+        document = EncounterDocument(_encounter(patient_profile))
+
+        assert document.part_bytes("soap_note") is document.part_bytes("soap_note")
+        assert json.loads(document.body)["soap_note"] == document.fields["soap_note"]
+        assert json.loads(zlib.decompress(document.compressed_part("recommendations"))) == document.fields[
+            "recommendations"
+        ]
+
+        response = {"encounter_id": "enc-1", "soap_note": document.fields["soap_note"]}
+        assert json.loads(document.encode_response(response)) == response
+
+    def test_finalize_shares_document_with_audit_and_response(self, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports fever.")
+
+        body = json.loads(agent_orchestrator.finalize_encounter_bytes(encounter))
+
+        assert body["soap_note"]["symptoms"] == ["fever"]
+        finalized = list(agent_orchestrator.audit_logger.query(AuditQuery(action="encounter_finalized")))
+        assert len(finalized[0].metadata["payload_sha256"]) == 64
@@ -0,0 +1,131 @@
+"""Unit tests for the patient view cache."""
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from src.agent.orchestrator import AgentOrchestrator
+from src.clients.view_cache import PatientViewCache
+from src.core.privacy import AccessRole, AccessLevel, DataResource
+
+
+class ReleaseHookLock:
+    """Lock that runs ``on_release`` once, right after the next release."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.on_release = None
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+        hook, self.on_release = self.on_release, None
+        if hook is not None:
+            hook()
+
+
+class TestPatientViewCache:
+    def test_repeat_reads_hit_until_invalidated(self, agent_orchestrator, patient_profile):
+        encounter = agent_orchestrator.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        agent_orchestrator.ingest_transcript_chunk(encounter, "Patient reports fatigue.")
+        agent_orchestrator.finalize_encounter(encounter)
+
+        first = agent_orchestrator.get_patient_view(patient_profile.patient_id)
+        second = agent_orchestrator.get_patient_view(patient_profile.patient_id)
+        assert first is second
+
+        agent_orchestrator.trigger_emergency_call(
+            encounter=encounter,
+            initiated_by="patient-123",
+            reason="Chest pain",
+            confirmed=True,
+        )
+        third = agent_orchestrator.get_patient_view(patient_profile.patient_id)
+
+        assert third["emergency_events"][0]["reason"] == "Chest pain"
+        metrics = agent_orchestrator.get_view_cache_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 2
+        assert metrics["invalidations"] == 2
+
+    def test_unknown_patients_are_negatively_cached(self, agent_orchestrator):
+        agent_orchestrator.get_patient_view("nobody")
+        agent_orchestrator.get_patient_view("nobody")
+
+        assert agent_orchestrator.get_view_cache_metrics()["negative_hits"] == 1
+        with pytest.raises(TypeError):
+            agent_orchestrator.get_patient_view("nobody")["medications"].append("med-1")
+        assert agent_orchestrator.get_patient_view("nobody")["medications"] == []
+
+    def test_invalidation_during_load_is_not_cached(self):
+        cache = PatientViewCache()
+
+        def loader():
+            cache.invalidate("patient-1")
+            return {"patient_id": "patient-1", "medications": ["stale"]}
+
+        cache.get_or_load("patient-1", AccessRole.PATIENT, AccessLevel.READ, loader)
+        fresh = cache.get_or_load(
+            "patient-1",
+            AccessRole.PATIENT,
+            AccessLevel.READ,
+            lambda: {"patient_id": "patient-1", "medications": ["fresh"]},
+        )
+
+        assert fresh["medications"] == ["fresh"]
+
+    def test_invalidation_right_after_load_is_not_lost(self):
+        cache = PatientViewCache()
+        cache._lock = ReleaseHookLock()
+
+        def loader():
+            # Invalidate as soon as the cache releases its lock after this load returns
+            cache._lock.on_release = lambda: cache.invalidate("patient-1")
+            return {"patient_id": "patient-1", "medications": ["stale"]}
+
+        cache.get_or_load("patient-1", AccessRole.PATIENT, AccessLevel.READ, loader)
+        fresh = cache.get_or_load(
+            "patient-1",
+            AccessRole.PATIENT,
+            AccessLevel.READ,
+            lambda: {"patient_id": "patient-1", "medications": ["fresh"]},
+        )
+
+        assert fresh["medications"] == ["fresh"]
+
+    def test_lru_bound(self):
+        cache = PatientViewCache(max_entries=2)
+        for patient_id in ("a", "b", "c"):
+            cache.get_or_load(
+                patient_id,
+                AccessRole.DOCTOR,
+                AccessLevel.READ,
+                lambda: {"patient_id": patient_id, "medications": ["x"]},
+            )
+
+        assert cache.metrics()["entries"] == 2
+        assert cache.metrics()["evictions"] == 1
+
+    def test_orchestrators_register_one_policy_listener_per_cache(self, audit_logger, record_store):
+        cache = PatientViewCache()
+        orchestrators = [
+            AgentOrchestrator(
+                audit_logger=audit_logger,
+                record_store=record_store,
+                privacy_policy=record_store.privacy_policy,
+                view_cache=cache,
+            )
+            for _ in range(3)
+        ]
+        cache.get_or_load("a", AccessRole.DOCTOR, AccessLevel.READ, lambda: {"patient_id": "a", "medications": ["x"]})
+        dead = weakref.ref(orchestrators.pop())
+        gc.collect()
+
+        assert dead() is None
+        assert len(record_store.privacy_policy._listeners) == 1
+        record_store.privacy_policy.revoke(AccessRole.DOCTOR, DataResource.MEDICATIONS, AccessLevel.READ)
+        assert cache.metrics()["entries"] == 0
@@ -0,0 +1,120 @@
+"""Unit tests for the multi-process encounter worker pool."""
+
+import functools
+import os
+
+import pytest
+
+from src.agent.orchestrator import AgentOrchestrator
+from src.agent.worker_pool import EncounterWorkerPool, WorkerPoolDraining, WorkerPoolException
+from src.clients.sqlite_store import SQLiteClinicalRecordStore
+from src.clients.view_cache import PatientViewCache
+from src.core.audit import InMemoryAuditLogger
+
+
+def _refuse_to_load():
+    raise ValueError("not loadable here")
+
+
+class Unloadable:
+    def __reduce__(self):
+        return _refuse_to_load, ()
+
+
+class ProbeOrchestrator(AgentOrchestrator):
+    def unloadable_result(self):
+        return Unloadable()
+
+    def exit_worker(self):
+        os._exit(3)
+
+
+def _factory(worker_index):
+    return ProbeOrchestrator(agent_id=f"pool-worker-{worker_index}", audit_logger=InMemoryAuditLogger())
+
+
+def _shared_store_factory(db_path, worker_index):
+    return AgentOrchestrator(
+        agent_id=f"pool-worker-{worker_index}",
+        audit_logger=InMemoryAuditLogger(),
+        record_store=SQLiteClinicalRecordStore(db_path=db_path),
+        view_cache=PatientViewCache(ttl_seconds=0, negative_ttl_seconds=0),
+    )
+
+
+@pytest.fixture
+def pool():
+    with EncounterWorkerPool(workers=2, orchestrator_factory=_factory) as worker_pool:
+        yield worker_pool
+
+
+class TestEncounterWorkerPool:
+    def test_encounters_stay_on_their_worker(self, pool, patient_profile):
+        encounter_ids = [pool.start_encounter(patient_profile, "clin-1", consent_granted=True) for _ in range(6)]
+        for encounter_id in encounter_ids:
+            pool.ingest_transcript_chunk(encounter_id, "Patient reports fever.")
+
+        load = pool.load()
+        assert sum(worker["open_encounters"] for worker in load) == 6
+        assert all(worker["alive"] for worker in load)
+
+        results = [pool.finalize_encounter(encounter_id) for encounter_id in encounter_ids]
+        assert [result["encounter_id"] for result in results] == encounter_ids
+        assert all(result["soap_note"]["symptoms"] == ["fever"] for result in results)
+        assert sum(worker["completed_calls"] for worker in pool.load()) == 18
+
+    def test_worker_errors_reach_the_caller(self, pool, patient_profile):
+        with pytest.raises(PermissionError):
+            pool.start_encounter(patient_profile, "clin-1", consent_granted=False)
+        assert sum(worker["open_encounters"] for worker in pool.load()) == 0
+
+    def test_drain_waits_for_open_encounters(self, pool, patient_profile):
+        encounter_id = pool.start_encounter(patient_profile, "clin-1", consent_granted=True)
+
+        assert pool.drain(timeout=0.1) is False
+        with pytest.raises(WorkerPoolDraining):
+            pool.start_encounter(patient_profile, "clin-1", consent_granted=True)
+
+        pool.finalize_encounter(encounter_id)
+        assert pool.drain(timeout=5) is True
+
+    def test_abandoned_encounters_release_drain(self, pool, patient_profile):
+        encounter_id = pool.start_encounter(patient_profile, "clin-1", consent_granted=True)
+
+        pool.abandon_encounter(encounter_id, reason="client_gone")
+
+        assert pool.drain(timeout=5) is True
+        with pytest.raises(WorkerPoolException, match="unknown encounter"):
+            pool.ingest_transcript_chunk(encounter_id, "Patient reports fever.")
+
+    def test_patient_views_cover_every_worker_with_a_shared_store(self, tmp_path, patient_profile):
+        factory = functools.partial(_shared_store_factory, str(tmp_path / "records.db"))
+        with EncounterWorkerPool(workers=2, orchestrator_factory=factory) as pool:
+            encounter_ids = [pool.start_encounter(patient_profile, "clin-1", consent_granted=True) for _ in range(8)]
+            assert len({pool.worker_for(encounter_id) for encounter_id in encounter_ids}) == 2
+            for encounter_id in encounter_ids:
+                pool.trigger_emergency_call(encounter_id, initiated_by="patient-123", reason=encounter_id, confirmed=True)
+                pool.finalize_encounter(encounter_id)
+
+            view = pool.get_patient_view(patient_profile.patient_id)
+
+        assert sorted(event["reason"] for event in view["emergency_events"]) == sorted(encounter_ids)
+
+    def test_unloadable_result_fails_only_its_call(self, pool, patient_profile):
+        with pytest.raises(WorkerPoolException, match="cannot unpickle"):
+            pool.submit("any", "unloadable_result").result(timeout=5)
+
+        encounter_id = pool.start_encounter(patient_profile, "clin-1", consent_granted=True)
+        assert pool.finalize_encounter(encounter_id)["encounter_id"] == encounter_id
+
+    def test_dead_worker_fails_its_calls_and_releases_drain(self, patient_profile):
+        with EncounterWorkerPool(workers=1, orchestrator_factory=_factory) as pool:
+            encounter_id = pool.start_encounter(patient_profile, "clin-1", consent_granted=True)
+
+            with pytest.raises(WorkerPoolException, match="exited with code 3"):
+                pool.submit(encounter_id, "exit_worker").result(timeout=5)
+
+            assert pool.drain(timeout=5) is True
+            assert pool.load()[0]["alive"] is False
+            with pytest.raises(WorkerPoolException):
+                pool.ingest_transcript_chunk(encounter_id, "Patient reports fever.")